@@ -5,7 +5,12 @@ import asyncio
 
 from src.green_agent import start_green_agent
 from src.white_agent import start_white_agent
-from src.launcher import launch_evaluation, launch_remote_evaluation
+from src.launcher import (
+    launch_evaluation,
+    launch_remote_evaluation,
+    launch_resume_evaluation,
+    launch_tournament_evaluation,
+)
 import os
 from pydantic_settings import BaseSettings
 
@@ -58,9 +63,34 @@ def launch():
 
 
 @app.command()
-def launch_remote(green_url: str, white_url: str):
+def launch_remote(
+    green_url: str,
+    white_url: str,
+    stream: bool = typer.Option(False, help="Stream per-case progress from the green agent."),
+):
     """Launch the complete evaluation workflow."""
-    asyncio.run(launch_remote_evaluation(green_url, white_url))
+    asyncio.run(launch_remote_evaluation(green_url, white_url, stream=stream))
+
+
+@app.command()
+def tournament(
+    green_url: str,
+    white_urls: list[str],
+    num_cases: int = typer.Option(10, help="Cases sampled once and sent to every white agent."),
+    stream: bool = typer.Option(False, help="Stream per-case progress from the green agent."),
+):
+    """Compare several white agents on the same case sample in one green run."""
+    asyncio.run(launch_tournament_evaluation(green_url, white_urls, num_cases=num_cases, stream=stream))
+
+
+@app.command()
+def resume(
+    green_url: str,
+    run_id: str,
+    stream: bool = typer.Option(False, help="Stream per-case progress from the green agent."),
+):
+    """Resume an interrupted run; only unfinished cases are dispatched again."""
+    asyncio.run(launch_resume_evaluation(green_url, run_id, stream=stream))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,277 @@
+"""End-to-end throughput benchmark for the green and white agents.
+
+Starts a stub benchmark API, a white agent with a fake LLM and a green agent, all
+in-process on free ports, then sends the green agent one run per (cases, concurrency)
+pair. Nothing leaves the machine, so the numbers are the agents' own overhead on top of
+a fixed ``--llm-latency``: A2A round trips, journaling, datamodel fetches, sanitizing,
+validation and submission.
+
+Per run it reports cases/sec, p50/p99 case round trip (from the green agent's run
+journal), peak RSS and event loop lag (both agents share one loop here). ``--out``
+writes the results as JSON; ``--baseline`` compares against an earlier file and exits
+with status 1 if cases/sec, p50 or p99 regressed by more than ``--tolerance``.
+
+Run from ``agentbeats/``:
+
+    python -m bench.e2e --cases 10 1000 10000 --concurrency 1 16 64 --out e2e.json
+    python -m bench.e2e --cases 10 1000 10000 --concurrency 1 16 64 --baseline e2e.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from bench.white_load import FakeLLMWhiteAgentExecutor, _free_port, _serve, stub_benchmark_api
+
+_COMPARED = ("cases_per_s", "p50_ms", "p99_ms", "loop_lag_max_ms")
+# Loop lag is a few milliseconds and too noisy to fail a run on; it is only printed.
+_GATED = ("cases_per_s", "p50_ms", "p99_ms")
+_HIGHER_IS_BETTER = {"cases_per_s"}
+
+
+def stub_scenarios_api(num_cases: int, num_shapes: int = 12):
+    """``stub_benchmark_api`` plus the routes the green agent calls: restart, list, results."""
+    app = stub_benchmark_api(num_shapes)
+    ids = [f"e2e-{i}-simple" for i in range(num_cases)]
+
+    async def restart(_request: Request) -> Response:
+        app.state.submitted.clear()
+        return Response(status_code=204)
+
+    async def scenarios(_request: Request) -> JSONResponse:
+        return JSONResponse({"ids": ids})
+
+    async def results(_request: Request) -> JSONResponse:
+        n = len(app.state.submitted)
+        return JSONResponse({"score": 100.0 if n else 0.0, "totalPassed": n, "totalFailed": 0})
+
+    app.add_route("/scenarios/restart", restart, methods=["POST"])
+    app.add_route("/scenarios", scenarios, methods=["GET"])
+    app.add_route("/scenarios/results/{white_agent_id}", results, methods=["GET"])
+    return app
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is KiB on Linux, bytes on macOS; it is the process-lifetime peak.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Sampler:
+    """Samples event loop lag and RSS every ``interval`` seconds while a run is going."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.lags: list[float] = []
+        self.peak_rss = _rss_bytes()
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            t0 = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - t0 - self.interval))
+            self.peak_rss = max(self.peak_rss, _rss_bytes())
+
+    def __enter__(self) -> "_Sampler":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000.0, 2)
+
+
+async def run_e2e(
+    cases: int, concurrency: int, llm_latency: float, batch_size: int = 1, verbose: bool = False
+) -> dict:
+    # Imported here so the environment below is in place before the agents read it.
+    from a2a.server.apps import A2AStarletteApplication
+    from a2a.server.request_handlers import DefaultRequestHandler
+    from a2a.server.tasks import InMemoryTaskStore
+    from a2a.types import AgentCard
+
+    from src.green_agent.agent import PptGreenAgentExecutor, load_agent_card_toml
+    from src.green_agent.journal import RunJournal
+    from src.my_util import my_a2a
+    from src.white_agent.agent import prepare_white_agent_card
+
+    api_port, white_port, green_port = _free_port(), _free_port(), _free_port()
+    api_url = f"http://127.0.0.1:{api_port}"
+    white_url = f"http://127.0.0.1:{white_port}/"
+    green_url = f"http://127.0.0.1:{green_port}/"
+    run_id = f"e2e-{cases}-{concurrency}-{int(time.time() * 1000)}"
+
+    api_app = stub_scenarios_api(cases)
+    white_executor = FakeLLMWhiteAgentExecutor(llm_latency, blocking=False, max_concurrency=concurrency * batch_size)
+    white_app = A2AStarletteApplication(
+        agent_card=prepare_white_agent_card(white_url),
+        http_handler=DefaultRequestHandler(agent_executor=white_executor, task_store=InMemoryTaskStore()),
+    ).build()
+    green_card = load_agent_card_toml("ppt_green_agent")
+    green_card["url"] = green_url
+    green_executor = PptGreenAgentExecutor()
+    green_app = A2AStarletteApplication(
+        agent_card=AgentCard(**green_card),
+        http_handler=DefaultRequestHandler(agent_executor=green_executor, task_store=InMemoryTaskStore()),
+    ).build()
+
+    servers = [
+        await _serve(api_app, api_port),
+        await _serve(white_app, white_port),
+        await _serve(green_app, green_port),
+    ]
+    task_text = f"""
+<benchmark_api_url>{api_url}</benchmark_api_url>
+<white_agent_url>{white_url}</white_agent_url>
+<white_agent_id>e2e-bench</white_agent_id>
+<num_cases>{cases}</num_cases>
+<max_concurrency>{concurrency}</max_concurrency>
+<batch_size>{batch_size}</batch_size>
+<difficulty_mix>none</difficulty_mix>
+<seed>0</seed>
+<run_id>{run_id}</run_id>
+"""
+    # The agents print a few lines per case; keep them off the terminal unless asked
+    # (and out of memory, which would show up in the RSS figure).
+    devnull = open(os.devnull, "w")
+    out = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(devnull)
+    try:
+        async with my_a2a.A2ASession(timeout=None) as session:
+            await session.get_agent_card(green_url)
+            with out, _Sampler() as sampler:
+                started = time.perf_counter()
+                await session.send_message(green_url, task_text)
+                wall = time.perf_counter() - started
+    finally:
+        await green_executor.aclose()
+        await white_executor.aclose()
+        for server, _ in servers:
+            server.should_exit = True
+        await asyncio.gather(*(task for _, task in servers), return_exceptions=True)
+        devnull.close()
+
+    results = RunJournal(run_id).load().results.values()
+    round_trips = [
+        r["timings"]["round_trip_ms"] / 1000.0
+        for r in results
+        if isinstance(r.get("timings"), dict) and "round_trip_ms" in r["timings"]
+    ]
+    return {
+        "cases": cases,
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "llm_latency_s": llm_latency,
+        "errors": sum(1 for r in results if "white_error" in r),
+        "submitted": len(api_app.state.submitted),
+        "wall_s": round(wall, 3),
+        "cases_per_s": round(cases / wall, 2) if wall > 0 else None,
+        "p50_ms": _ms(_percentile(round_trips, 0.50)),
+        "p99_ms": _ms(_percentile(round_trips, 0.99)),
+        "peak_rss_mb": round(sampler.peak_rss / 2**20, 1),
+        "loop_lag_p99_ms": _ms(_percentile(sampler.lags, 0.99)),
+        "loop_lag_max_ms": _ms(max(sampler.lags, default=None)),
+    }
+
+
+def _key(row: dict) -> tuple:
+    return (row["cases"], row["concurrency"], row.get("batch_size", 1), row["llm_latency_s"])
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Print each run next to its baseline; return descriptions of the regressions."""
+    base = {_key(r): r for r in baseline}
+    regressions = []
+    for row in results:
+        old = base.get(_key(row))
+        if old is None:
+            continue
+        parts = []
+        for metric in _COMPARED:
+            new_v, old_v = row.get(metric), old.get(metric)
+            if not isinstance(new_v, (int, float)) or not isinstance(old_v, (int, float)) or old_v <= 0:
+                continue
+            change = (new_v - old_v) / old_v
+            parts.append(f"{metric} {old_v} -> {new_v} ({change:+.0%})")
+            worse = -change if metric in _HIGHER_IS_BETTER else change
+            if metric in _GATED and worse > tolerance:
+                regressions.append(f"cases={row['cases']} concurrency={row['concurrency']}: {metric} {change:+.0%}")
+        print(f"cases={row['cases']} concurrency={row['concurrency']}: " + ", ".join(parts))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM latency in seconds.")
+    parser.add_argument("--batch-size", type=int, default=1, help="Green agent <batch_size>.")
+    parser.add_argument("--out", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare against results written earlier with --out.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="Allowed relative regression before failing (0.1 = 10%%)."
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show the agents' own output.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ppt-e2e-") as tmp:
+        # Fresh journal and catalog per invocation; keep the sampled dispatch order.
+        os.environ["PPT_RUN_JOURNAL_DIR"] = os.path.join(tmp, "runs")
+        os.environ["PPT_CATALOG_CACHE_DIR"] = os.path.join(tmp, "catalog")
+        os.environ["PPT_CATALOG_METADATA"] = "false"
+        os.environ.setdefault("PPT_LLM_PRELOAD", "false")
+
+        results = []
+        for cases in args.cases:
+            for concurrency in args.concurrency:
+                row = asyncio.run(run_e2e(cases, concurrency, args.llm_latency, args.batch_size, args.verbose))
+                print(json.dumps(row), flush=True)
+                results.append(row)
+
+    if args.out:
+        doc = {
+            "created": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", [])
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("regressions beyond tolerance:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Microbenchmark for the white agent's changeset sanitizer.
+
+Builds a synthetic deck and a changeset of ``N`` entries for each ``--sizes`` value. The
+mix is mostly valid modifications (including alias shape types, placeholders, lines and
+autoShapes) with some deletions, additions and entries that must be dropped. Reports the
+index build time and the best/median sanitize time per call and per entry, and checks
+that the input changeset is left untouched.
+
+Run from ``agentbeats/``:
+
+    python -m bench.sanitizer --sizes 10 1000 100000
+"""
+
+import argparse
+import copy
+import json
+import statistics
+import time
+
+from src.white_agent.sanitizer import sanitize_changeset
+from src.white_agent.shape_index import ShapeIndex
+
+_TYPES = ("textbox", "autoShape", "image", "line", "placeholder", "chart", "group")
+_ALIASES = ("TextBox", "text box", "auto_shape", "picture", "connector", "placeholder", "chart")
+_SHAPES_PER_SLIDE = 500
+
+
+def synthetic_datamodel(num_shapes: int) -> dict:
+    slides = []
+    for start in range(0, num_shapes, _SHAPES_PER_SLIDE):
+        shapes = []
+        for sid in range(start + 1, min(start + _SHAPES_PER_SLIDE, num_shapes) + 1):
+            shape = {
+                "id": sid,
+                "shapeType": _TYPES[sid % len(_TYPES)],
+                "name": f"Shape {sid}",
+                "pos": {"topLeft": [float(sid % 960), float(sid % 540)]},
+                "size": {"w": 120.0, "h": 40.0},
+            }
+            if shape["shapeType"] == "autoShape":
+                shape["details"] = {"autoShapeType": "RECTANGLE"}
+            shapes.append(shape)
+        slides.append({"id": len(slides) + 1, "shapes": shapes})
+    return {"slides": slides}
+
+
+def synthetic_changeset(num_entries: int, num_shapes: int) -> dict:
+    added, modified, deleted = [], [], []
+    for i in range(num_entries):
+        sid = i % num_shapes + 1
+        bucket = i % 20
+        if bucket < 14:
+            modified.append(
+                {
+                    "id": str(sid) if bucket % 3 == 0 else sid,
+                    "shapeType": _ALIASES[i % len(_ALIASES)],
+                    "pos": {"topLeft": [10.0, 20.0]},
+                    "size": {"width": 100.0, "height": 30.0} if bucket % 2 else {"w": 100.0, "h": 30.0},
+                    "xml": "<a:p><a:r><a:t>x</a:t></a:r></a:p>",
+                }
+            )
+        elif bucket < 17:
+            deleted.append({"id": sid})
+        elif bucket == 17:
+            added.append(
+                {"shapeType": "textbox", "pos": {"topLeft": [0, 0]}, "size": {"width": 50, "height": 20}}
+            )
+        elif bucket == 18:
+            modified.append({"id": num_shapes + sid, "shapeType": "textbox"})
+        else:
+            modified.append({"id": "not-an-id", "shapeType": "textbox"})
+    return {"added": added, "modified": modified, "deleted": deleted}
+
+
+def run(num_entries: int, min_time: float) -> dict:
+    num_shapes = max(num_entries, 10)
+    datamodel = synthetic_datamodel(num_shapes)
+    changeset = synthetic_changeset(num_entries, num_shapes)
+    snapshot = copy.deepcopy(changeset)
+
+    t0 = time.perf_counter()
+    index = ShapeIndex(datamodel)
+    index_ms = (time.perf_counter() - t0) * 1000.0
+
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < 3 or time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        result = sanitize_changeset(changeset, index)
+        samples.append(time.perf_counter() - t0)
+
+    best, median = min(samples), statistics.median(samples)
+    return {
+        "entries": num_entries,
+        "shapes": num_shapes,
+        "runs": len(samples),
+        "index_ms": round(index_ms, 3),
+        "best_ms": round(best * 1000.0, 3),
+        "median_ms": round(median * 1000.0, 3),
+        "us_per_entry": round(median * 1e6 / num_entries, 3),
+        "entries_per_s": round(num_entries / median),
+        "kept": sum(len(v) for v in result.changeset.values()),
+        "dropped": result.reasons(),
+        "input_unchanged": changeset == snapshot,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to keep repeating each size.")
+    args = parser.parse_args()
+    for n in args.sizes:
+        print(json.dumps(run(n, args.min_time)))
+
+
+if __name__ == "__main__":
+    main()
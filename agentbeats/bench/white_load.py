@@ -0,0 +1,185 @@
+"""Load test for a single white agent process.
+
+Starts a stub benchmark API and a white agent in-process, replaces the LLM call with a
+fixed-latency fake, and fires ``--cases`` concurrent A2A requests at the white agent.
+It runs twice: once with a blocking fake LLM (what the synchronous ``completion`` call
+did to the event loop) and once with an awaiting one, and prints the throughput of each.
+
+Run from ``agentbeats/``:
+
+    python -m bench.white_load --cases 50 --llm-latency 0.5 --max-concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import time
+
+import uvicorn
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.my_util import my_a2a
+from src.white_agent.agent import PptWhiteAgentExecutor, prepare_white_agent_card
+from src.white_agent.llm_cache import LLMResponseCache
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def stub_benchmark_api(num_shapes: int = 12) -> Starlette:
+    """The two benchmark API routes the white agent calls, backed by a synthetic slide."""
+    shapes = [
+        {
+            "id": i,
+            "shapeType": "textbox",
+            "name": f"TextBox {i}",
+            "pos": {"topLeft": [100.0 * i, 50.0]},
+            "size": {"w": 90.0, "h": 40.0},
+        }
+        for i in range(1, num_shapes + 1)
+    ]
+    submitted: list[str] = []
+
+    async def datamodel(request: Request) -> JSONResponse:
+        case_id = request.path_params["case_id"]
+        return JSONResponse(
+            {
+                "caseId": case_id,
+                "prompt": "Align all text boxes to the same top edge.",
+                "datamodel": {"id": 1, "index": 0, "shapes": shapes},
+            }
+        )
+
+    async def submit(request: Request) -> JSONResponse:
+        body = await request.json()
+        submitted.append(body.get("caseId"))
+        return JSONResponse({"ok": True})
+
+    app = Starlette(
+        routes=[
+            Route("/scenarios/datamodel/{case_id}", datamodel),
+            Route("/scenarios/submit-changeset", submit, methods=["POST"]),
+        ]
+    )
+    app.state.submitted = submitted
+    return app
+
+
+class FakeLLMWhiteAgentExecutor(PptWhiteAgentExecutor):
+    """White agent whose LLM call takes ``latency`` seconds and moves shape 1."""
+
+    def __init__(self, latency: float, blocking: bool, max_concurrency: int) -> None:
+        super().__init__(max_concurrency=max_concurrency)
+        # Cached replies would skip the fake latency and skew the comparison.
+        self._llm_cache = LLMResponseCache(mode="bypass")
+        self.latency = latency
+        self.blocking = blocking
+
+    async def _complete(self, messages: list[dict[str, str]], model: str) -> str:
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return json.dumps(
+            {"added": [], "modified": [{"id": 1, "shapeType": "textbox", "pos": {"topLeft": [100, 60]}}], "deleted": []}
+        )
+
+
+async def _serve(app, port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def run_load(cases: int, llm_latency: float, blocking: bool, max_concurrency: int) -> dict:
+    api_port, white_port = _free_port(), _free_port()
+    api_url = f"http://127.0.0.1:{api_port}"
+    white_url = f"http://127.0.0.1:{white_port}/"
+
+    executor = FakeLLMWhiteAgentExecutor(llm_latency, blocking, max_concurrency)
+    white_app = A2AStarletteApplication(
+        agent_card=prepare_white_agent_card(white_url),
+        http_handler=DefaultRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore()),
+    ).build()
+    api_server, api_task = await _serve(stub_benchmark_api(), api_port)
+    white_server, white_task = await _serve(white_app, white_port)
+
+    latencies: list[float] = []
+    errors = 0
+    try:
+        async with my_a2a.A2ASession(timeout=None) as session:
+            await session.get_agent_card(white_url)
+
+            async def _one(i: int) -> None:
+                nonlocal errors
+                text = (
+                    f"<benchmark_api_url>{api_url}</benchmark_api_url>\n"
+                    f"<case_id>load-{i}-simple</case_id>\n"
+                    f"<white_agent_id>load-test</white_agent_id>"
+                )
+                t0 = time.perf_counter()
+                try:
+                    await session.send_message(white_url, text)
+                except Exception:
+                    errors += 1
+                latencies.append(time.perf_counter() - t0)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(_one(i) for i in range(cases)))
+            wall = time.perf_counter() - started
+    finally:
+        await executor.aclose()
+        for server in (white_server, api_server):
+            server.should_exit = True
+        await asyncio.gather(white_task, api_task, return_exceptions=True)
+
+    latencies.sort()
+    return {
+        "mode": "blocking" if blocking else "async",
+        "cases": cases,
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "cases_per_s": round(cases / wall, 2) if wall > 0 else None,
+        "p50_s": round(latencies[len(latencies) // 2], 3),
+        "max_s": round(latencies[-1], 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Fake LLM latency in seconds.")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=int(os.getenv("PPT_WHITE_MAX_CONCURRENCY", "16")),
+        help="White agent concurrency limit (PPT_WHITE_MAX_CONCURRENCY).",
+    )
+    parser.add_argument("--skip-blocking", action="store_true", help="Only run the async mode.")
+    args = parser.parse_args()
+
+    results = []
+    if not args.skip_blocking:
+        results.append(asyncio.run(run_load(args.cases, args.llm_latency, True, args.max_concurrency)))
+    results.append(asyncio.run(run_load(args.cases, args.llm_latency, False, args.max_concurrency)))
+    for r in results:
+        print(json.dumps(r))
+    if len(results) == 2 and results[0]["cases_per_s"]:
+        print(f"speedup: {results[1]['cases_per_s'] / results[0]['cases_per_s']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
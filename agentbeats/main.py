@@ -1,50 +1,75 @@
 """CLI entry point for agentbeats PowerPoint benchmark demo."""
 
+from src.my_util import startup  # first, so startup timings include the imports below
+
 import typer
 import asyncio
 import os
 
-from src.green_agent import start_green_agent
-from src.white_agent import start_white_agent
-from src.launcher import launch_evaluation, launch_remote_evaluation
-from pydantic_settings import BaseSettings
+# Agent modules (a2a, uvicorn, litellm) are imported by the commands that need them,
+# so e.g. `green` never loads the white agent's dependencies.
+
+
+def _green_agent():
+    with startup.timed_import("ppt_green_agent"):
+        from src.green_agent import start_green_agent
+    return start_green_agent
 
 
-class AgentbeatsSettings(BaseSettings):
-    role: str = "unspecified"
-    host: str = "127.0.0.1"
-    agent_port: int = 9000
+def _white_agent():
+    with startup.timed_import("ppt_white_agent"):
+        from src.white_agent import start_white_agent
+    return start_white_agent
 
 
 app = typer.Typer(help="AgentBeats PowerPoint benchmark runner (A2A green/white)")
 
 
+@app.callback()
+def main(
+    startup_profile: bool = typer.Option(
+        False,
+        "--startup-profile",
+        help="Print import time and time-to-ready for each agent (also sets PPT_STARTUP_PROFILE=1).",
+    ),
+):
+    if startup_profile:
+        startup.enable()
+
+
 @app.command()
 def green():
     """Start the green agent (assessment manager)."""
     # Default to PowerPoint benchmark green agent
-    start_green_agent(agent_name="ppt_green_agent")
+    _green_agent()(agent_name="ppt_green_agent")
 
 
 @app.command()
 def white():
     """Start the white agent (target being tested)."""
     # Default to PowerPoint benchmark white agent
-    start_white_agent(agent_name="ppt_white_agent")
+    _white_agent()(agent_name="ppt_white_agent")
 
 
 @app.command()
 def run():
+    from pydantic_settings import BaseSettings
+
+    class AgentbeatsSettings(BaseSettings):
+        role: str = "unspecified"
+        host: str = "127.0.0.1"
+        agent_port: int = 9000
+
     settings = AgentbeatsSettings()
     if settings.role == "green":
         # Controller mode: start PPT green agent by default
-        start_green_agent(
+        _green_agent()(
             agent_name=os.getenv("AGENT_NAME", "ppt_green_agent"),
             host=settings.host,
             port=settings.agent_port,
         )
     elif settings.role == "white":
-        start_white_agent(
+        _white_agent()(
             agent_name=os.getenv("AGENT_NAME", "ppt_white_agent"),
             host=settings.host,
             port=settings.agent_port,
@@ -57,13 +82,63 @@ def run():
 @app.command()
 def launch():
     """Launch the complete evaluation workflow."""
-    asyncio.run(launch_evaluation())
+    from src import launcher
+
+    asyncio.run(launcher.launch_evaluation())
+
+
+@app.command()
+def launch_pool(
+    replicas: int = typer.Option(4, help="White agent replicas to start, each on a free port."),
+    num_cases: int = typer.Option(10, help="Cases to run across the replicas."),
+    concurrency: int = typer.Option(4, help="Cases in flight per replica."),
+    stream: bool = typer.Option(False, help="Stream per-case progress from the green agent."),
+):
+    """Launch a green agent and several white agent replicas, spreading cases across them."""
+    from src import launcher
+
+    asyncio.run(
+        launcher.launch_pool_evaluation(
+            replicas=replicas, num_cases=num_cases, concurrency_per_replica=concurrency, stream=stream
+        )
+    )
 
 
 @app.command()
-def launch_remote(green_url: str, white_url: str):
+def launch_remote(
+    green_url: str,
+    white_url: str,
+    stream: bool = typer.Option(False, help="Stream per-case progress from the green agent."),
+):
     """Launch the complete evaluation workflow."""
-    asyncio.run(launch_remote_evaluation(green_url, white_url))
+    from src import launcher
+
+    asyncio.run(launcher.launch_remote_evaluation(green_url, white_url, stream=stream))
+
+
+@app.command()
+def tournament(
+    green_url: str,
+    white_urls: list[str],
+    num_cases: int = typer.Option(10, help="Cases sampled once and sent to every white agent."),
+    stream: bool = typer.Option(False, help="Stream per-case progress from the green agent."),
+):
+    """Compare several white agents on the same case sample in one green run."""
+    from src import launcher
+
+    asyncio.run(launcher.launch_tournament_evaluation(green_url, white_urls, num_cases=num_cases, stream=stream))
+
+
+@app.command()
+def resume(
+    green_url: str,
+    run_id: str,
+    stream: bool = typer.Option(False, help="Stream per-case progress from the green agent."),
+):
+    """Resume an interrupted run; only unfinished cases are dispatched again."""
+    from src import launcher
+
+    asyncio.run(launcher.launch_resume_evaluation(green_url, run_id, stream=stream))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,14 @@
 """Green agent implementation - manages assessment and evaluation."""
 
+import asyncio
+import contextlib
 import json
 import os
 import httpx
 import random
-from datetime import datetime
-from typing import Any
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, TypeVar
 
 import dotenv
 import tomllib
@@ -17,13 +20,35 @@ from a2a.server.events import EventQueue
 from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCard, SendMessageSuccessResponse, Message
 from a2a.utils import new_agent_text_message, get_text_parts
-from src.my_util import parse_tags, my_a2a
+from src.my_util import parse_tags, my_a2a, startup
+from src.my_util.agentbeats_events import post_agentbeats_event, reporter
+from src.my_util.inline_payload import encode_payload
+from src.my_util.metrics import REGISTRY, LoopLagMonitor, mount_metrics
+from src.my_util.resilience import CircuitOpenError, ResiliencePolicy, request_not_sent
+from src.green_agent.catalog import ScenarioCatalog
+from src.green_agent import latency
+from src.green_agent.journal import RunJournal, RunState, new_run_id
+from src.green_agent.pool import ReplicaPool, parse_replica_urls, replica_down
+from src.green_agent.progress import ProgressStream
+from src.green_agent.sampler import DifficultyIndex, parse_mix
 
 # Note: This repo originally contained a tau-bench demo. We keep only the PowerPoint
 # benchmark implementation here; tau-bench code paths have been removed.
 
 dotenv.load_dotenv()
 
+CASE_SECONDS = REGISTRY.histogram(
+    "ppt_green_case_seconds", "Round trip of one case to a white agent, retries included.", ["outcome"]
+)
+WHITE_PHASE_SECONDS = REGISTRY.histogram(
+    "ppt_green_white_phase_seconds", "Per-phase timings reported by white agents.", ["phase"]
+)
+CASE_RETRIES = REGISTRY.counter("ppt_green_case_retries_total", "Retried attempts to send a case.")
+CASES_IN_FLIGHT = REGISTRY.gauge("ppt_green_cases_in_flight", "Cases sent to white agents and not yet answered.")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def load_agent_card_toml(agent_name: str) -> dict[str, Any]:
     current_dir = __file__.rsplit("/", 1)[0]
@@ -31,98 +56,134 @@ def load_agent_card_toml(agent_name: str) -> dict[str, Any]:
         return tomllib.load(f)
 
 
-def _ab_backend_url() -> str:
-    return os.environ.get("AGENTBEATS_BACKEND_URL", "http://localhost:9000")
+def _int_setting(tags: dict[str, str], tag: str, env: str, default: int, minimum: int = 0) -> int:
+    """Read an integer setting from a message tag, falling back to an env var."""
+    raw = tags.get(tag) or os.getenv(env, str(default))
+    try:
+        return max(minimum, int(raw))
+    except Exception:
+        return default
 
 
-def _post_agentbeats_event(
-    battle_id: str | None,
-    message: str,
-    reported_by: str,
-    detail: dict[str, Any] | None = None,
-    markdown_content: str | None = None,
-    is_result: bool = False,
-) -> None:
-    if not battle_id:
-        return
+def _float_setting(tags: dict[str, str], tag: str, env: str, default: float) -> float:
+    """Read a float setting from a message tag, falling back to an env var."""
+    raw = tags.get(tag) or os.getenv(env, str(default))
     try:
-        payload = {
-            "is_result": is_result,
-            "message": message,
-            "reported_by": reported_by,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
-        if detail:
-            payload["detail"] = detail
-        if markdown_content:
-            payload["markdown_content"] = markdown_content
-        with httpx.Client(timeout=10.0) as client:
-            client.post(f"{_ab_backend_url()}/battles/{battle_id}", json=payload)
+        return max(0.0, float(raw))
     except Exception:
-        # best-effort only
-        pass
+        return default
 
 
-def _case_difficulty(case_id: object) -> str:
-    """
-    Infer difficulty bucket from scenario id suffix.
+def _format_score(score: object) -> str:
+    return f"{score:.1f}%" if isinstance(score, (int, float)) else "unavailable"
+
+
+def _inline_encoding(raw: str | None) -> str | None:
+    """``<inline_datamodel>`` value -> payload encoding; ``None`` leaves fetching to the white agent."""
+    value = (raw or "").strip().lower()
+    if value in ("", "0", "false", "no", "off", "none"):
+        return None
+    return "json" if value == "json" else "zlib"
+
 
-    Examples:
-    - basic-shapes-test-1-simple -> simple
-    - pptc-test-37c-medium -> medium
-    - pptc-test-10d-complex -> hard
+def _prefetch_plan(dispatch_order: list[tuple[int, str]], depth: int) -> dict[str, list[str]]:
+    """For each case, the ``depth`` case ids dispatched right after it (white-agent prefetch hints)."""
+    ids = [cid for _, cid in dispatch_order]
+    return {cid: ids[i + 1 : i + 1 + depth] for i, cid in enumerate(ids)} if depth > 0 else {}
+
+
+@dataclass
+class _DispatchPlan:
+    """How one run's cases go out: dispatch order plus what is sent along with each case."""
+
+    order: list[tuple[int, str]]
+    # case_id -> encoded payload for <case_payload> (inline datamodel delivery)
+    inline: dict[str, str] = field(default_factory=dict)
+    # case_id -> upcoming case ids for <prefetch_case_ids>
+    prefetch: dict[str, list[str]] = field(default_factory=dict)
+
+    def batches(self, size: int) -> list[list[tuple[int, str]]]:
+        return [self.order[i : i + size] for i in range(0, len(self.order), size)]
+
+
+async def _run_bounded(
+    items: list[T],
+    limit: int,
+    send: Callable[[T], Awaitable[R]],
+    finish: Callable[[T, R], Awaitable[None]] | None = None,
+) -> list[R]:
     """
-    if not isinstance(case_id, str):
-        return "unknown"
-    cid = case_id.lower()
-    if cid.endswith("-simple"):
-        return "simple"
-    if cid.endswith("-medium"):
-        return "medium"
-    # The scenario list uses "-complex" for the hardest bucket.
-    if cid.endswith("-complex") or cid.endswith("-hard"):
-        return "hard"
-    return "unknown"
-
-
-def _select_cases_with_mix(ids: list[str], num_cases: int) -> list[str]:
+    Run ``send`` for every item, at most ``limit`` at a time, and return the results in
+    item order. ``finish`` runs after the item's slot has been released.
     """
-    Select cases using a target difficulty mix.
+    semaphore = asyncio.Semaphore(limit)
 
-    For a 10-case run, target is: 7 simple, 2 medium, 1 hard.
-    If a bucket doesn't have enough cases, backfill from the remaining pool.
-    """
-    if not ids or num_cases <= 0:
-        return []
+    async def _one(item: T) -> R:
+        async with semaphore:
+            result = await send(item)
+        if finish is not None:
+            await finish(item, result)
+        return result
+
+    return await asyncio.gather(*(_one(item) for item in items))
+
+
+def _take_replica_down(result: dict | list[dict]) -> bool:
+    """Remove the ``replica_down`` marker from dispatch result entries; True if any had it."""
+    entries = result if isinstance(result, list) else [result]
+    return any([e.pop("replica_down", False) for e in entries])
 
-    k = min(num_cases, len(ids))
 
-    # Default: preserve existing behavior unless the run is exactly 10 cases.
-    if k != 10:
-        return random.sample(ids, k)
+def _reached(result: dict | list[dict]) -> bool:
+    """True if the white agent replied for at least one of the dispatch result entries."""
+    entries = result if isinstance(result, list) else [result]
+    return any("white_error" not in e for e in entries)
 
-    buckets: dict[str, list[str]] = {"simple": [], "medium": [], "hard": [], "unknown": []}
-    for cid in ids:
-        buckets[_case_difficulty(cid)].append(cid)
 
-    targets: dict[str, int] = {"simple": 7, "medium": 2, "hard": 1}
-    chosen: list[str] = []
-    for key in ("simple", "medium", "hard"):
-        want = targets[key]
-        pool = buckets.get(key, [])
-        if want <= 0 or not pool:
-            continue
-        take = min(want, len(pool))
-        picked = random.sample(pool, take)
-        chosen.extend(picked)
+def _parse_white_agents(raw: str) -> list[dict[str, str]]:
+    """
+    Parse the tournament agent list into ``[{"id": ..., "url": ...}, ...]``.
 
-    # Backfill if any bucket was short (or if lots were "unknown").
-    if len(chosen) < k:
-        remaining = [cid for cid in ids if cid not in set(chosen)]
-        chosen.extend(random.sample(remaining, min(k - len(chosen), len(remaining))))
+    Accepts a JSON list of ``{"id", "url"}`` objects (or bare URL strings), or one agent
+    per line as ``id=url``, ``id url`` or just ``url``. Missing ids become ``white-<n>``;
+    duplicate ids get a numeric suffix so their benchmark results stay separate.
+    """
+    entries: list[tuple[str | None, str]] = []
+    try:
+        parsed = json.loads(raw)
+    except Exception:
+        parsed = None
+    if isinstance(parsed, list):
+        for item in parsed:
+            if isinstance(item, str):
+                entries.append((None, item))
+            elif isinstance(item, dict):
+                url = item.get("url") or item.get("white_agent_url")
+                if url:
+                    entries.append((item.get("id") or item.get("white_agent_id"), url))
+    else:
+        for line in raw.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if "=" in line and not line.startswith("http"):
+                agent_id, url = line.split("=", 1)
+            elif " " in line:
+                agent_id, url = line.split(None, 1)
+            else:
+                agent_id, url = None, line
+            entries.append((agent_id.strip() if agent_id else None, url.strip()))
 
-    # Ensure exact k (defensive in case of duplicates).
-    return chosen[:k]
+    agents: list[dict[str, str]] = []
+    seen: set[str] = set()
+    for n, (agent_id, url) in enumerate(entries, start=1):
+        base = agent_id or f"white-{n}"
+        unique, k = base, 2
+        while unique in seen:
+            unique, k = f"{base}-{k}", k + 1
+        seen.add(unique)
+        agents.append({"id": unique, "url": url})
+    return agents
 
 
 ###
@@ -136,22 +197,175 @@ class PptGreenAgentExecutor(AgentExecutor):
 
     Flow:
     - POST /scenarios/restart
-    - GET /scenarios -> choose N random
-    - For each case: send caseId to white agent via A2A (white handles fetch + submit)
+    - GET /scenarios -> choose N cases by <difficulty_mix>, reproducible via <seed>
+    - For each case: send caseId to white agent via A2A (white handles fetch + submit),
+      up to <max_concurrency> cases at a time, each bounded by <case_timeout> seconds
+      (or <batch_size> cases per message, handled concurrently by the white agent)
     - GET /scenarios/results/:whiteAgentId and report
     """
 
+    def __init__(self) -> None:
+        # Shared across runs so white-agent connections and cards are reused. The HTTP
+        # timeout is only a backstop; per-attempt timeouts come from the resilience policy.
+        self._a2a = my_a2a.A2ASession(
+            timeout=float(os.getenv("PPT_WHITE_TIMEOUT_MAX", "600")),
+            card_ttl=float(os.getenv("PPT_A2A_CARD_TTL", "300")),
+        )
+        # One resilience policy (latency window + circuit breaker) per white agent URL.
+        self._policies: dict[str, ResiliencePolicy] = {}
+        # One scenario catalog (id list + per-case metadata, cached on disk) per benchmark API.
+        self._catalogs: dict[str, ScenarioCatalog] = {}
+
+    async def aclose(self) -> None:
+        await self._a2a.aclose()
+
+    def _policy(self, white_agent_url: str) -> ResiliencePolicy:
+        key = white_agent_url.rstrip("/")
+        policy = self._policies.get(key)
+        if policy is None:
+            policy = ResiliencePolicy.from_env("PPT_WHITE")
+            self._policies[key] = policy
+        return policy
+
+    def _catalog(self, benchmark_api_url: str) -> ScenarioCatalog:
+        catalog = self._catalogs.get(benchmark_api_url)
+        if catalog is None:
+            catalog = ScenarioCatalog(
+                benchmark_api_url, ttl=float(os.getenv("PPT_CATALOG_TTL", "300"))
+            )
+            self._catalogs[benchmark_api_url] = catalog
+        return catalog
+
+    def _dispatch_order(self, benchmark_api_url: str, cases: list[tuple[int, str]]) -> list[tuple[int, str]]:
+        """
+        Order ``(idx, case_id)`` pairs for dispatch, most expensive first.
+
+        With a concurrency cap, starting the largest prompts first keeps one slow case from
+        landing at the very end of the run. Only metadata the catalog already has is used;
+        if any case lacks it, the order is left unchanged rather than fetched for.
+        """
+        if os.getenv("PPT_CATALOG_METADATA", "true").strip().lower() not in ("1", "true", "yes"):
+            return cases
+        catalog = self._catalog(benchmark_api_url)
+        costs = {cid: catalog.cost_estimate(cid) for _, cid in cases}
+        if any(cost is None for cost in costs.values()):
+            return cases
+        return sorted(cases, key=lambda item: -costs[item[1]])
+
+    async def _plan_dispatch(
+        self,
+        benchmark_api_url: str,
+        cases: list[tuple[int, str]],
+        max_concurrency: int,
+        prefetch_depth: int,
+        inline_encoding: str | None,
+        hints: bool = True,
+    ) -> _DispatchPlan:
+        """
+        Order ``(idx, case_id)`` pairs for dispatch and prepare what is sent with them.
+
+        Prefetch hints are left out for inline runs (nothing to fetch) and when ``hints``
+        is False: batches warm their own datamodels, and with a replica pool the next
+        cases may go to a different replica.
+        """
+        # Inline payloads first: fetching them records the metadata the ordering uses.
+        inline = await self._inline_payloads(benchmark_api_url, [cid for _, cid in cases], inline_encoding)
+        order = self._dispatch_order(benchmark_api_url, cases) if max_concurrency > 1 else cases
+        prefetch = _prefetch_plan(order, prefetch_depth if hints and not inline else 0)
+        return _DispatchPlan(order, inline, prefetch)
+
+    async def _sample_cases(
+        self,
+        benchmark_api_url: str,
+        battle_id: str | None,
+        progress: ProgressStream,
+        num_cases: int,
+        difficulty_mix: dict[str, float],
+        seed: int | str,
+    ) -> list[str] | None:
+        """Restart the benchmark and draw this run's cases (None after reporting a failure)."""
+        ids = await self._restart_and_list(benchmark_api_url, battle_id, progress)
+        if ids is None:
+            return None
+        return DifficultyIndex(ids).sample(num_cases, mix=difficulty_mix, seed=seed)
+
+    async def _on_replica(
+        self,
+        pool: ReplicaPool | None,
+        white_agent_url: str,
+        send: Callable[[str], Awaitable[Any]],
+        label: str,
+    ) -> Any:
+        """Run ``send(url)`` on the least busy replica, re-queuing it if the replica is down."""
+        if pool is None:
+            result = await send(white_agent_url)
+            _take_replica_down(result)
+            return result
+        requeues = 0
+        while True:
+            replica = pool.acquire()
+            if replica is None:
+                wait = pool.next_up_in()
+                print(f"Green(PPT): no white agent replica is up for {label}; retrying in {wait:.1f}s")
+                await asyncio.sleep(wait)
+                continue
+            result = await send(replica.url)
+            down = _take_replica_down(result)
+            pool.release(replica, down=down, reached=_reached(result))
+            if not down or requeues >= pool.max_requeues:
+                return result
+            requeues += 1
+            pool.requeued += 1
+            print(f"Green(PPT): replica {replica.url} is down; re-queuing {label}")
+
+    async def _inline_payloads(
+        self, benchmark_api_url: str, case_ids: list[str], encoding: str | None
+    ) -> dict[str, str]:
+        """Fetch and encode all case payloads up front; cases that fail are fetched by the white agent."""
+        if encoding is None or not case_ids:
+            return {}
+        catalog = self._catalog(benchmark_api_url)
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            payloads = await catalog.fetch_payloads(client, case_ids)
+        encoded = {cid: encode_payload(p, encoding) for cid, p in payloads.items()}
+        print(
+            f"Green(PPT): inlining {len(encoded)}/{len(case_ids)} datamodels "
+            f"({encoding}, {sum(len(t) for t in encoded.values())} chars)"
+        )
+        return encoded
+
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
         user_input = context.get_user_input()
         tags_all = parse_tags(user_input)
         battle_id = tags_all.get("battle_id") or os.environ.get("AGENTBEATS_BATTLE_ID")
 
-        white_agent_url = tags_all.get("white_agent_url") or os.getenv("WHITE_AGENT_URL")
-        if not white_agent_url:
-            msg = "Green(PPT): Missing <white_agent_url> tag and WHITE_AGENT_URL not set"
-            _post_agentbeats_event(battle_id, msg, "ppt_green_agent")
+        resume_state: RunState | None = None
+        resume_run_id = tags_all.get("resume_run_id")
+        try:
+            journal = RunJournal(resume_run_id or tags_all.get("run_id") or new_run_id())
+        except ValueError as ex:
+            msg = f"Green(PPT): {ex}"
+            post_agentbeats_event(battle_id, msg, "ppt_green_agent")
             await event_queue.enqueue_event(new_agent_text_message(msg))
             return
+        if resume_run_id:
+            if not journal.exists():
+                msg = f"Green(PPT): No run journal found for run_id={resume_run_id} at {journal.path}"
+                post_agentbeats_event(battle_id, msg, "ppt_green_agent")
+                await event_queue.enqueue_event(new_agent_text_message(msg))
+                return
+            resume_state = journal.load()
+            if not resume_state.selected:
+                # e.g. the process died before the run_started record reached the disk.
+                msg = (
+                    f"Green(PPT): Run journal {journal.path} has no case selection; "
+                    f"run_id={resume_run_id} cannot be resumed, start a new run instead"
+                )
+                post_agentbeats_event(battle_id, msg, "ppt_green_agent")
+                await event_queue.enqueue_event(new_agent_text_message(msg))
+                return
+            # The journaled run's settings are the defaults; tags in the resume message still win.
+            tags_all = {**{k: str(v) for k, v in resume_state.config.items()}, **tags_all}
 
         benchmark_api_url = tags_all.get("benchmark_api_url") or os.getenv(
             "PPT_BENCHMARK_API_URL", "http://localhost:5050"
@@ -164,161 +378,253 @@ class PptGreenAgentExecutor(AgentExecutor):
             num_cases = max(1, int(num_cases_raw))
         except Exception:
             num_cases = 10
+        difficulty_mix = parse_mix(tags_all.get("difficulty_mix") or os.getenv("PPT_DIFFICULTY_MIX"))
+        seed_raw = (tags_all.get("seed") or os.getenv("PPT_SEED") or "").strip()
+        # Without an explicit seed, draw one and report it so the selection can be reproduced.
+        seed: int | str = (
+            int(seed_raw) if seed_raw.lstrip("-").isdigit() else seed_raw or random.randrange(2**32)
+        )
+        max_concurrency = _int_setting(
+            tags_all, "max_concurrency", "PPT_MAX_CONCURRENCY", default=1, minimum=1
+        )
+        # Per-case deadline in seconds; 0 disables it (the A2A transport timeout still applies).
+        case_timeout = _float_setting(tags_all, "case_timeout", "PPT_CASE_TIMEOUT", default=0.0)
+        # Cases per A2A message; above 1 the white agent gets batch messages.
+        batch_size = _int_setting(tags_all, "batch_size", "PPT_BATCH_SIZE", default=1, minimum=1)
+        # Upcoming case ids sent with each case so the white agent can prefetch their datamodels.
+        prefetch_depth = _int_setting(tags_all, "prefetch_depth", "PPT_PREFETCH_DEPTH", default=2)
+        # Opt-in: send each case's prompt + datamodel inline so the white agent skips the fetch.
+        inline_encoding = _inline_encoding(
+            tags_all.get("inline_datamodel") or os.getenv("PPT_INLINE_DATAMODEL")
+        )
+        stream_raw = tags_all.get("stream_progress") or os.getenv("PPT_STREAM_PROGRESS", "false")
+        progress = ProgressStream(
+            context,
+            event_queue,
+            enabled=stream_raw.strip().lower() in ("1", "true", "yes"),
+            partial_score_interval=_float_setting(
+                tags_all, "partial_score_interval", "PPT_PARTIAL_SCORE_INTERVAL", default=30.0
+            ),
+        )
+
+        white_agents_raw = tags_all.get("white_agents") or os.getenv("PPT_WHITE_AGENTS")
+        if white_agents_raw and resume_state is None:
+            agents = _parse_white_agents(white_agents_raw)
+            if not agents:
+                msg = "Green(PPT): <white_agents> did not contain any white agent URLs"
+                post_agentbeats_event(battle_id, msg, "ppt_green_agent")
+                await event_queue.enqueue_event(new_agent_text_message(msg))
+                return
+            await self._execute_tournament(
+                progress=progress,
+                battle_id=battle_id,
+                agents=agents,
+                benchmark_api_url=benchmark_api_url,
+                num_cases=num_cases,
+                difficulty_mix=difficulty_mix,
+                seed=seed,
+                max_concurrency=max_concurrency,
+                case_timeout=case_timeout,
+                prefetch_depth=prefetch_depth,
+                inline_encoding=inline_encoding,
+            )
+            return
+
+        # Several replicas of one white agent: cases go to the least busy one.
+        replica_urls = parse_replica_urls(tags_all.get("white_agent_urls") or os.getenv("PPT_WHITE_AGENT_URLS") or "")
+        pool = ReplicaPool(replica_urls) if len(replica_urls) > 1 else None
+        white_agent_url = (
+            tags_all.get("white_agent_url") or (replica_urls[0] if replica_urls else None) or os.getenv("WHITE_AGENT_URL")
+        )
+        if not white_agent_url:
+            msg = "Green(PPT): Missing <white_agent_url> tag and WHITE_AGENT_URL not set"
+            post_agentbeats_event(battle_id, msg, "ppt_green_agent")
+            await event_queue.enqueue_event(new_agent_text_message(msg))
+            return
 
         print(
             f"Green(PPT): starting; benchmark_api_url={benchmark_api_url} white_agent_url={white_agent_url} "
-            f"white_agent_id={white_agent_id} num_cases={num_cases}"
+            f"white_agent_id={white_agent_id} num_cases={num_cases} run_id={journal.run_id}"
         )
-        _post_agentbeats_event(
+        post_agentbeats_event(
             battle_id=battle_id,
             message="Green(PPT): Starting evaluation",
             reported_by="ppt_green_agent",
             detail={
                 "benchmark_api_url": benchmark_api_url,
                 "white_agent_url": white_agent_url,
+                "white_agent_urls": replica_urls,
                 "white_agent_id": white_agent_id,
                 "num_cases": num_cases,
+                "max_concurrency": max_concurrency,
+                "case_timeout": case_timeout,
+                "run_id": journal.run_id,
+                "resumed": resume_state is not None,
+                "resumed_finished_run": resume_state is not None and resume_state.finished,
             },
         )
+        await progress.start("Green(PPT): Starting evaluation")
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            # 1) restart
-            try:
-                print("Green(PPT): resetting benchmark suite via POST /scenarios/restart ...")
-                await client.post(f"{benchmark_api_url}/scenarios/restart")
-                print("Green(PPT): reset complete.")
-                _post_agentbeats_event(
-                    battle_id=battle_id,
-                    message="Green(PPT): Restarted benchmark (cleared generated files)",
-                    reported_by="ppt_green_agent",
+        if resume_state is not None:
+            chosen = resume_state.selected
+            pending = resume_state.pending()
+            journal.run_resumed(pending)
+            print(
+                f"Green(PPT): resuming run_id={journal.run_id}; "
+                f"{len(chosen) - len(pending)}/{len(chosen)} cases already finished, skipping restart"
+            )
+            if resume_state.finished:
+                msg = (
+                    f"Green(PPT): run_id={journal.run_id} had already finished; "
+                    + (f"retrying {len(pending)} failed cases and " if pending else "no cases to send, ")
+                    + "re-running the evaluation"
                 )
-            except Exception as ex:
-                msg = f"Green(PPT): Failed to restart benchmark: {ex}"
-                _post_agentbeats_event(battle_id, msg, "ppt_green_agent")
-                await event_queue.enqueue_event(new_agent_text_message(msg))
-                return
-
-            # 2) list tests
-            try:
-                print("Green(PPT): fetching all test case ids via GET /scenarios ...")
-                resp = await client.get(f"{benchmark_api_url}/scenarios")
-                resp.raise_for_status()
-                ids = resp.json().get("ids", [])
-                if not isinstance(ids, list) or not ids:
-                    raise ValueError("No scenario ids returned")
-                print(f"Green(PPT): got {len(ids)} test case ids.")
-            except Exception as ex:
-                msg = f"Green(PPT): Failed to fetch scenarios: {ex}"
-                _post_agentbeats_event(battle_id, msg, "ppt_green_agent")
-                await event_queue.enqueue_event(new_agent_text_message(msg))
+                print(msg)
+                await progress.note(msg)
+                post_agentbeats_event(battle_id, msg, "ppt_green_agent")
+        else:
+            chosen = await self._sample_cases(
+                benchmark_api_url, battle_id, progress, num_cases, difficulty_mix, seed
+            )
+            if chosen is None:
                 return
-
-        chosen = _select_cases_with_mix(ids, num_cases)
-        print(f"Green(PPT): selected {len(chosen)} cases: {chosen}")
-        _post_agentbeats_event(
+            journal.run_started(
+                {
+                    "white_agent_url": white_agent_url,
+                    "benchmark_api_url": benchmark_api_url,
+                    "white_agent_id": white_agent_id,
+                    "num_cases": num_cases,
+                    "difficulty_mix": json.dumps(difficulty_mix),
+                    "seed": seed,
+                    "max_concurrency": max_concurrency,
+                    "case_timeout": case_timeout,
+                    "prefetch_depth": prefetch_depth,
+                    "inline_datamodel": inline_encoding or "off",
+                    "batch_size": batch_size,
+                    "white_agent_urls": json.dumps(replica_urls),
+                },
+                chosen,
+            )
+            pending = chosen
+        print(f"Green(PPT): selected {len(chosen)} cases (seed={seed}): {chosen}")
+        progress.total = len(chosen)
+        await progress.note(f"Green(PPT): Selected {len(chosen)} cases")
+        post_agentbeats_event(
             battle_id=battle_id,
             message="Green(PPT): Selected cases",
             reported_by="ppt_green_agent",
             detail={
                 "selected": chosen,
-                "difficulty_counts": {
-                    "simple": sum(1 for c in chosen if _case_difficulty(c) == "simple"),
-                    "medium": sum(1 for c in chosen if _case_difficulty(c) == "medium"),
-                    "hard": sum(1 for c in chosen if _case_difficulty(c) == "hard"),
-                    "unknown": sum(1 for c in chosen if _case_difficulty(c) == "unknown"),
-                },
+                "seed": seed,
+                "difficulty_mix": difficulty_mix,
+                "difficulty_counts": DifficultyIndex(chosen).counts(),
             },
         )
 
-        # 3) dispatch one-by-one to white agent (A2A)
-        context_id = None
-        results_local: list[dict] = []
-        for idx, case_id in enumerate(chosen, start=1):
-            print(
-                f"Green(PPT): sending test case {idx}/{len(chosen)} case_id={case_id} -> {white_agent_url}"
-            )
-            task_text = f"""
-You are the white agent for the PowerPoint benchmark.
-Handle exactly one case, then respond with a short status.
+        # 3) dispatch to white agent (A2A); cases are independent, so they may run concurrently
+        print(
+            f"Green(PPT): dispatching {len(pending)} cases "
+            f"(max_concurrency={max_concurrency}, case_timeout={case_timeout or 'none'}, batch_size={batch_size})"
+        )
+        # Sequential runs keep the historical behavior of reusing the first reply's context.
+        shared_context: dict[str, str | None] = {"context_id": None}
 
-<benchmark_api_url>
-{benchmark_api_url}
-</benchmark_api_url>
-<case_id>
-{case_id}
-</case_id>
-<white_agent_id>
-{white_agent_id}
-</white_agent_id>
-<battle_id>
-{battle_id or ''}
-</battle_id>
-            """.strip()
+        pending_set = set(pending)
+        results_by_case: dict[str, dict] = {
+            cid: r for cid, r in (resume_state.results.items() if resume_state else []) if cid not in pending_set
+        }
+        position = {cid: idx for idx, cid in enumerate(chosen, start=1)}
+        for cid, r in results_by_case.items():
+            await progress.case_finished(position[cid], r)
+        plan = await self._plan_dispatch(
+            benchmark_api_url,
+            [(idx, cid) for idx, cid in enumerate(chosen, start=1) if cid in pending_set],
+            max_concurrency=max_concurrency,
+            prefetch_depth=prefetch_depth,
+            inline_encoding=inline_encoding,
+            hints=batch_size == 1 and pool is None,
+        )
 
-            _post_agentbeats_event(
-                battle_id=battle_id,
-                message=f"Green(PPT): Sending case {idx}/{len(chosen)} to white",
-                reported_by="ppt_green_agent",
-                detail={"case_id": case_id},
-            )
+        async def _partial_evaluation() -> dict | None:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                resp = await client.get(f"{benchmark_api_url}/scenarios/results/{white_agent_id}")
+                resp.raise_for_status()
+                return resp.json()
 
-            try:
-                white_agent_response = await my_a2a.send_message(
-                    white_agent_url, task_text, context_id=context_id
-                )
-                res_root = white_agent_response.root
-                assert isinstance(res_root, SendMessageSuccessResponse)
-                res_msg = res_root.result
-                assert isinstance(res_msg, Message)
-                if context_id is None:
-                    context_id = res_msg.context_id
-                text_parts = get_text_parts(res_msg.parts)
-                white_text = text_parts[0] if text_parts else ""
-                print(
-                    f"Green(PPT): received submission for case_id={case_id} "
-                    f"(white_reply_preview={white_text[:120]!r})"
-                )
-                results_local.append({"case_id": case_id, "white_reply": white_text[:800]})
-                _post_agentbeats_event(
+        async def _send_case(case: tuple[int, str]) -> dict:
+            idx, case_id = case
+            journal.case_dispatched(case_id)
+            await progress.case_dispatched(idx, case_id)
+            return await self._on_replica(
+                pool,
+                white_agent_url,
+                lambda url: self._dispatch_case(
+                    idx=idx,
+                    total=len(chosen),
+                    case_id=case_id,
+                    white_agent_url=url,
+                    benchmark_api_url=benchmark_api_url,
+                    white_agent_id=white_agent_id,
                     battle_id=battle_id,
-                    message=f"Green(PPT): White replied for {case_id}",
-                    reported_by="ppt_green_agent",
-                    detail={"reply_preview": white_text[:400]},
-                )
-            except Exception as ex:
-                print(f"Green(PPT): ERROR from white for {case_id}: {ex}")
-                results_local.append({"case_id": case_id, "white_error": str(ex)})
-                _post_agentbeats_event(
+                    case_timeout=case_timeout,
+                    shared_context=shared_context if max_concurrency == 1 and pool is None else None,
+                    run_epoch=journal.run_id,
+                    prefetch=plan.prefetch.get(case_id),
+                    case_payload=plan.inline.get(case_id),
+                    payload_encoding=inline_encoding,
+                ),
+                case_id,
+            )
+
+        async def _case_finished(case: tuple[int, str], result: dict) -> None:
+            journal.case_finished(result)
+            await progress.case_finished(case[0], result)
+            await progress.maybe_partial_score(_partial_evaluation)
+
+        async def _send_batch(batch: list[tuple[int, str]]) -> list[dict]:
+            for idx, case_id in batch:
+                journal.case_dispatched(case_id)
+                await progress.case_dispatched(idx, case_id)
+            return await self._on_replica(
+                pool,
+                white_agent_url,
+                lambda url: self._dispatch_batch(
+                    batch=batch,
+                    total=len(chosen),
+                    white_agent_url=url,
+                    benchmark_api_url=benchmark_api_url,
+                    white_agent_id=white_agent_id,
                     battle_id=battle_id,
-                    message=f"Green(PPT): White failed for {case_id}",
-                    reported_by="ppt_green_agent",
-                    detail={"error": str(ex)},
-                )
+                    case_timeout=case_timeout,
+                    run_epoch=journal.run_id,
+                    payloads=plan.inline,
+                    payload_encoding=inline_encoding,
+                ),
+                f"batch {batch[0][0]}-{batch[-1][0]}",
+            )
+
+        async def _batch_finished(batch: list[tuple[int, str]], results: list[dict]) -> None:
+            for (idx, _), result in zip(batch, results):
+                journal.case_finished(result)
+                await progress.case_finished(idx, result)
+            await progress.maybe_partial_score(_partial_evaluation)
+
+        if batch_size > 1:
+            batched = await _run_bounded(plan.batches(batch_size), max_concurrency, _send_batch, _batch_finished)
+            new_results = [r for results in batched for r in results]
+        else:
+            new_results = await _run_bounded(plan.order, max_concurrency, _send_case, _case_finished)
+        results_by_case.update((r["case_id"], r) for r in new_results)
+        results_local: list[dict] = [results_by_case[cid] for cid in chosen]
 
         # 4) evaluate: fetch server-side results for this white_agent_id
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                print(f"Green(PPT): fetching evaluation via GET /scenarios/results/{white_agent_id} ...")
-                resp = await client.get(f"{benchmark_api_url}/scenarios/results/{white_agent_id}")
-                resp.raise_for_status()
-                evaluation = resp.json()
-                # Print a concise end-of-run evaluation line for terminal visibility.
-                score = evaluation.get("score") if isinstance(evaluation, dict) else None
-                total_passed = evaluation.get("totalPassed") if isinstance(evaluation, dict) else None
-                total_failed = evaluation.get("totalFailed") if isinstance(evaluation, dict) else None
-                if isinstance(score, (int, float)):
-                    print(
-                        f"Green(PPT): evaluation fetched (white_agent_id={white_agent_id}) "
-                        f"score={score:.1f}% assertions_passed={total_passed} assertions_failed={total_failed}"
-                    )
-                else:
-                    print(f"Green(PPT): evaluation fetched (white_agent_id={white_agent_id}).")
-            except Exception as ex:
-                evaluation = {"error": f"Failed to fetch results: {ex}"}
+        evaluation = await self._fetch_evaluation(benchmark_api_url, white_agent_id)
+        timings = latency.summarize(results_local)
 
         markdown = (
             "## PowerPoint Benchmark Results\n\n"
             f"- **white_agent_id**: `{white_agent_id}`\n"
+            f"- **run_id**: `{journal.run_id}`\n"
             f"- **num_cases_requested**: {num_cases}\n"
             f"- **num_cases_dispatched**: {len(chosen)}\n\n"
             "### Selected cases\n"
@@ -332,17 +638,31 @@ Handle exactly one case, then respond with a short status.
                 ]
             )
             + "\n\n"
+            "### Latency per phase\n"
+            + latency.markdown_table(timings)
+            + "\n"
             "### Evaluation\n"
             f"```json\n{json.dumps(evaluation, indent=2)}\n```\n"
         )
-        _post_agentbeats_event(
+        post_agentbeats_event(
             battle_id=battle_id,
             message="Green(PPT): Evaluation complete",
             reported_by="ppt_green_agent",
             markdown_content=markdown[:10000],
-            detail={"selected_cases": chosen},
+            detail={
+                "selected_cases": chosen,
+                "run_id": journal.run_id,
+                "timings": timings,
+                "per_case_timings": {r["case_id"]: r.get("timings") for r in results_local},
+                **({"replicas": pool.stats(), "requeued": pool.requeued} if pool else {}),
+                "event_reporter": reporter.stats(),
+            },
             is_result=True,
         )
+        # The result event must reach the backend before we report completion to the caller.
+        if not await reporter.flush():
+            print("Green(PPT): timed out flushing AgentBeats events")
+        print(f"Green(PPT): event reporter stats {reporter.stats()}")
         # Return a short summary to the caller (full JSON is posted to AgentBeats backend).
         try:
             score = evaluation.get("score") if isinstance(evaluation, dict) else None
@@ -353,7 +673,507 @@ Handle exactly one case, then respond with a short status.
         except Exception as _:
             summary = f"PowerPoint benchmark score (assertions) for `{white_agent_id}`: unavailable"
 
-        await event_queue.enqueue_event(new_agent_text_message(summary))
+        journal.run_finished(
+            {"score": evaluation.get("score") if isinstance(evaluation, dict) else None}
+        )
+        await journal.flush()
+        await progress.finish(
+            summary,
+            {"run_id": journal.run_id, "evaluation": evaluation, "white_results": results_local},
+        )
+
+    async def _execute_tournament(
+        self,
+        progress: ProgressStream,
+        battle_id: str | None,
+        agents: list[dict[str, str]],
+        benchmark_api_url: str,
+        num_cases: int,
+        difficulty_mix: dict[str, float],
+        seed: int | str,
+        max_concurrency: int,
+        case_timeout: float,
+        prefetch_depth: int = 0,
+        inline_encoding: str | None = None,
+    ) -> None:
+        """
+        Evaluate several white agents on one shared case sample.
+
+        The benchmark is restarted and sampled once; every agent then receives the same
+        cases concurrently, each agent limited to ``max_concurrency`` in-flight cases.
+        Tournament runs are not journaled, so they cannot be resumed.
+        """
+        print(
+            f"Green(PPT): starting tournament; benchmark_api_url={benchmark_api_url} "
+            f"agents={[a['id'] for a in agents]} num_cases={num_cases}"
+        )
+        post_agentbeats_event(
+            battle_id=battle_id,
+            message="Green(PPT): Starting tournament",
+            reported_by="ppt_green_agent",
+            detail={
+                "benchmark_api_url": benchmark_api_url,
+                "white_agents": agents,
+                "num_cases": num_cases,
+                "max_concurrency": max_concurrency,
+                "case_timeout": case_timeout,
+            },
+        )
+        await progress.start(f"Green(PPT): Starting tournament with {len(agents)} white agents")
+
+        chosen = await self._sample_cases(benchmark_api_url, battle_id, progress, num_cases, difficulty_mix, seed)
+        if chosen is None:
+            return
+        print(f"Green(PPT): selected {len(chosen)} cases for all agents (seed={seed}): {chosen}")
+        progress.total = len(chosen) * len(agents)
+        await progress.note(f"Green(PPT): Selected {len(chosen)} cases for {len(agents)} agents")
+        post_agentbeats_event(
+            battle_id=battle_id,
+            message="Green(PPT): Selected cases",
+            reported_by="ppt_green_agent",
+            detail={
+                "selected": chosen,
+                "seed": seed,
+                "difficulty_counts": DifficultyIndex(chosen).counts(),
+            },
+        )
+
+        plan = await self._plan_dispatch(
+            benchmark_api_url,
+            list(enumerate(chosen, start=1)),
+            max_concurrency=max_concurrency,
+            prefetch_depth=prefetch_depth,
+            inline_encoding=inline_encoding,
+        )
+        # Tournaments are not journaled; a fresh id still tells white agents the benchmark restarted.
+        run_epoch = new_run_id()
+
+        async def _run_agent(agent: dict[str, str]) -> list[dict]:
+            async def _send_case(case: tuple[int, str]) -> dict:
+                idx, case_id = case
+                await progress.case_dispatched(idx, f"{agent['id']}:{case_id}")
+                result = await self._dispatch_case(
+                    idx=idx,
+                    total=len(chosen),
+                    case_id=case_id,
+                    white_agent_url=agent["url"],
+                    benchmark_api_url=benchmark_api_url,
+                    white_agent_id=agent["id"],
+                    battle_id=battle_id,
+                    case_timeout=case_timeout,
+                    shared_context=None,
+                    run_epoch=run_epoch,
+                    prefetch=plan.prefetch.get(case_id),
+                    case_payload=plan.inline.get(case_id),
+                    payload_encoding=inline_encoding,
+                )
+                _take_replica_down(result)
+                return {"white_agent_id": agent["id"], **result}
+
+            async def _case_finished(case: tuple[int, str], result: dict) -> None:
+                await progress.case_finished(case[0], result)
+
+            results = await _run_bounded(plan.order, max_concurrency, _send_case, _case_finished)
+            by_case = {r["case_id"]: r for r in results}
+            return [by_case[cid] for cid in chosen]
+
+        per_agent = await asyncio.gather(*(_run_agent(a) for a in agents))
+        evaluations = await asyncio.gather(
+            *(self._fetch_evaluation(benchmark_api_url, a["id"]) for a in agents)
+        )
+
+        rows = []
+        for agent, results, evaluation in zip(agents, per_agent, evaluations):
+            score = evaluation.get("score") if isinstance(evaluation, dict) else None
+            rows.append(
+                {
+                    "white_agent_id": agent["id"],
+                    "white_agent_url": agent["url"],
+                    "score": score if isinstance(score, (int, float)) else None,
+                    "totalPassed": evaluation.get("totalPassed") if isinstance(evaluation, dict) else None,
+                    "totalFailed": evaluation.get("totalFailed") if isinstance(evaluation, dict) else None,
+                    "cases_replied": sum(1 for r in results if "white_error" not in r),
+                    "cases_failed": sum(1 for r in results if "white_error" in r),
+                }
+            )
+        # Highest score first; agents without a score go last.
+        rows.sort(key=lambda r: (r["score"] is None, -(r["score"] or 0.0)))
+
+        markdown = (
+            "## PowerPoint Benchmark Tournament Results\n\n"
+            f"- **white_agents**: {len(agents)}\n"
+            f"- **num_cases_requested**: {num_cases}\n"
+            f"- **num_cases_dispatched_per_agent**: {len(chosen)}\n\n"
+            "### Ranking\n"
+            "| Rank | white_agent_id | Score | Assertions passed | Assertions failed | Cases replied | Cases failed |\n"
+            "| --- | --- | --- | --- | --- | --- | --- |\n"
+            + "\n".join(
+                f"| {rank} | `{r['white_agent_id']}` | "
+                f"{_format_score(r['score'])} | "
+                f"{r['totalPassed']} | {r['totalFailed']} | {r['cases_replied']} | {r['cases_failed']} |"
+                for rank, r in enumerate(rows, start=1)
+            )
+            + "\n\n"
+            "### Selected cases\n"
+            + "\n".join([f"- `{c}`" for c in chosen])
+            + "\n\n"
+            "### White agent per-case status (preview)\n"
+            + "\n".join(
+                [
+                    f"- `{r.get('white_agent_id')}` `{r.get('case_id')}`: {('ERR ' + r.get('white_error')) if r.get('white_error') else r.get('white_reply','')[:120]}"
+                    for results in per_agent
+                    for r in results
+                ]
+            )
+            + "\n"
+        )
+        post_agentbeats_event(
+            battle_id=battle_id,
+            message="Green(PPT): Tournament complete",
+            reported_by="ppt_green_agent",
+            markdown_content=markdown[:10000],
+            detail={
+                "selected_cases": chosen,
+                "ranking": rows,
+                "timings": {a["id"]: latency.summarize(results) for a, results in zip(agents, per_agent)},
+                "event_reporter": reporter.stats(),
+            },
+            is_result=True,
+        )
+        if not await reporter.flush():
+            print("Green(PPT): timed out flushing AgentBeats events")
+
+        summary = "PowerPoint benchmark tournament (assertions): " + ", ".join(
+            f"`{r['white_agent_id']}` {_format_score(r['score'])}" for r in rows
+        )
+        print(f"Green(PPT): {summary}")
+        await progress.finish(
+            summary,
+            {
+                "ranking": rows,
+                "evaluations": {a["id"]: e for a, e in zip(agents, evaluations)},
+                "white_results": [r for results in per_agent for r in results],
+            },
+        )
+
+    async def _fetch_evaluation(self, benchmark_api_url: str, white_agent_id: str) -> dict:
+        """GET /scenarios/results/:whiteAgentId; failures are returned as ``{"error": ...}``."""
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            try:
+                print(f"Green(PPT): fetching evaluation via GET /scenarios/results/{white_agent_id} ...")
+                resp = await client.get(f"{benchmark_api_url}/scenarios/results/{white_agent_id}")
+                resp.raise_for_status()
+                evaluation = resp.json()
+                # Print a concise end-of-run evaluation line for terminal visibility.
+                score = evaluation.get("score") if isinstance(evaluation, dict) else None
+                total_passed = evaluation.get("totalPassed") if isinstance(evaluation, dict) else None
+                total_failed = evaluation.get("totalFailed") if isinstance(evaluation, dict) else None
+                if isinstance(score, (int, float)):
+                    print(
+                        f"Green(PPT): evaluation fetched (white_agent_id={white_agent_id}) "
+                        f"score={score:.1f}% assertions_passed={total_passed} assertions_failed={total_failed}"
+                    )
+                else:
+                    print(f"Green(PPT): evaluation fetched (white_agent_id={white_agent_id}).")
+            except Exception as ex:
+                evaluation = {"error": f"Failed to fetch results: {ex}"}
+        return evaluation
+
+    async def _restart_and_list(
+        self, benchmark_api_url: str, battle_id: str | None, progress: ProgressStream
+    ) -> list[str] | None:
+        """Reset the benchmark and return all scenario ids (None after reporting a failure)."""
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            # 1) restart
+            try:
+                print("Green(PPT): resetting benchmark suite via POST /scenarios/restart ...")
+                await client.post(f"{benchmark_api_url}/scenarios/restart")
+                print("Green(PPT): reset complete.")
+                post_agentbeats_event(
+                    battle_id=battle_id,
+                    message="Green(PPT): Restarted benchmark (cleared generated files)",
+                    reported_by="ppt_green_agent",
+                )
+            except Exception as ex:
+                msg = f"Green(PPT): Failed to restart benchmark: {ex}"
+                post_agentbeats_event(battle_id, msg, "ppt_green_agent")
+                await progress.fail(msg)
+                return None
+
+            # 2) list tests
+            try:
+                print("Green(PPT): fetching all test case ids via GET /scenarios (cached catalog) ...")
+                ids = await self._catalog(benchmark_api_url).list_ids(client)
+                print(f"Green(PPT): got {len(ids)} test case ids.")
+            except Exception as ex:
+                msg = f"Green(PPT): Failed to fetch scenarios: {ex}"
+                post_agentbeats_event(battle_id, msg, "ppt_green_agent")
+                await progress.fail(msg)
+                return None
+        return ids
+
+    async def _send_task(
+        self,
+        white_agent_url: str,
+        task_text: str,
+        deadline: float,
+        context_id: str | None,
+        label: str,
+        policy_key: str | None = None,
+    ) -> tuple[Message, str, int]:
+        """Send one A2A message through the agent's resilience policy; return reply, its text and attempts."""
+        policy = self._policy(policy_key or white_agent_url)
+
+        def _on_retry(attempt: int, ex: BaseException, delay: float) -> None:
+            print(f"Green(PPT): attempt {attempt} for {label} failed ({ex}); retrying in {delay:.1f}s")
+
+        send = policy.call(
+            lambda: self._a2a.send_message(white_agent_url, task_text, context_id=context_id),
+            on_retry=_on_retry,
+            # Resending after the white agent got the message would run (and submit) the
+            # case, or the whole batch, a second time.
+            retry_if=request_not_sent,
+        )
+        if deadline > 0:
+            try:
+                white_agent_response, attempts = await asyncio.wait_for(send, timeout=deadline)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"case deadline of {deadline:g}s exceeded") from None
+        else:
+            white_agent_response, attempts = await send
+        res_root = white_agent_response.root
+        assert isinstance(res_root, SendMessageSuccessResponse)
+        res_msg = res_root.result
+        assert isinstance(res_msg, Message)
+        text_parts = get_text_parts(res_msg.parts)
+        return res_msg, text_parts[0] if text_parts else "", attempts
+
+    async def _dispatch_batch(
+        self,
+        batch: list[tuple[int, str]],
+        total: int,
+        white_agent_url: str,
+        benchmark_api_url: str,
+        white_agent_id: str,
+        battle_id: str | None,
+        case_timeout: float,
+        run_epoch: str | None = None,
+        payloads: dict[str, str] | None = None,
+        payload_encoding: str | None = None,
+    ) -> list[dict]:
+        """Send several cases in one batch message; return one result entry per case, in order."""
+        case_ids = [cid for _, cid in batch]
+        label = f"batch {batch[0][0]}-{batch[-1][0]}/{total}"
+        print(f"Green(PPT): sending {label} ({len(batch)} cases) -> {white_agent_url}")
+        cases: list[dict[str, str]] = []
+        for cid in case_ids:
+            case: dict[str, str] = {"case_id": cid}
+            if payloads and cid in payloads:
+                case["case_payload"] = payloads[cid]
+                case["case_payload_encoding"] = payload_encoding or "zlib"
+            cases.append(case)
+        task_text = f"""
+You are the white agent for the PowerPoint benchmark.
+Handle every case in <cases>, then respond with one status per case.
+
+<benchmark_api_url>
+{benchmark_api_url}
+</benchmark_api_url>
+<white_agent_id>
+{white_agent_id}
+</white_agent_id>
+<battle_id>
+{battle_id or ''}
+</battle_id>
+<run_epoch>
+{run_epoch or ''}
+</run_epoch>
+<cases>
+{json.dumps(cases)}
+</cases>
+        """.strip()
+
+        post_agentbeats_event(
+            battle_id=battle_id,
+            message=f"Green(PPT): Sending {label} to white",
+            reported_by="ppt_green_agent",
+            detail={"case_ids": case_ids},
+        )
+        t0 = time.perf_counter()
+        CASES_IN_FLIGHT.inc(len(batch))
+        outcome = "error"
+        try:
+            # The white agent runs a batch concurrently, but budget for it running sequentially.
+            # Batches get their own latency window so they don't stretch single-case timeouts.
+            _, white_text, attempts = await self._send_task(
+                white_agent_url,
+                task_text,
+                case_timeout * len(batch),
+                context_id=None,
+                label=label,
+                policy_key=f"{white_agent_url}#batch",
+            )
+            round_trip_ms = (time.perf_counter() - t0) * 1000.0
+            outcome = "ok"
+        except Exception as ex:
+            print(f"Green(PPT): ERROR from white for {label}: {ex}")
+            post_agentbeats_event(
+                battle_id=battle_id,
+                message=f"Green(PPT): White failed for {label}",
+                reported_by="ppt_green_agent",
+                detail={"error": str(ex), "case_ids": case_ids},
+            )
+            elapsed = {"round_trip_ms": round((time.perf_counter() - t0) * 1000.0, 1)}
+            down = {"replica_down": True} if replica_down(ex) else {}
+            return [{"case_id": cid, "white_error": str(ex), "timings": elapsed, **down} for cid in case_ids]
+        finally:
+            CASES_IN_FLIGHT.dec(len(batch))
+            for _ in batch:
+                CASE_SECONDS.observe(time.perf_counter() - t0, outcome=outcome)
+
+        by_case = {r.get("case_id"): r for r in latency.batch_results(white_text)}
+        print(f"Green(PPT): received batch reply for {label} ({len(by_case)}/{len(batch)} cases)")
+        entries = []
+        for cid in case_ids:
+            r = by_case.get(cid)
+            if r is None:
+                entries.append({"case_id": cid, "white_error": "missing from batch reply"})
+                continue
+            white_timings = {
+                k: float(v) for k, v in (r.get("timings") or {}).items() if isinstance(v, (int, float))
+            }
+            for phase, ms in white_timings.items():
+                if phase in latency.PHASES:
+                    WHITE_PHASE_SECONDS.observe(ms / 1000.0, phase=phase)
+            entry = {
+                "case_id": cid,
+                "white_reply": str(r.get("reply", ""))[:800],
+                "timings": latency.case_timings(round_trip_ms, white_timings),
+                "batch_size": len(batch),
+            }
+            if attempts > 1:
+                entry["attempts"] = attempts
+            entries.append(entry)
+        if attempts > 1:
+            CASE_RETRIES.inc(attempts - 1)
+        return entries
+
+    async def _dispatch_case(
+        self,
+        idx: int,
+        total: int,
+        case_id: str,
+        white_agent_url: str,
+        benchmark_api_url: str,
+        white_agent_id: str,
+        battle_id: str | None,
+        case_timeout: float,
+        shared_context: dict[str, str | None] | None,
+        run_epoch: str | None = None,
+        prefetch: list[str] | None = None,
+        case_payload: str | None = None,
+        payload_encoding: str | None = None,
+    ) -> dict:
+        """Send a single case to the white agent and return its per-case result entry."""
+        print(f"Green(PPT): sending test case {idx}/{total} case_id={case_id} -> {white_agent_url}")
+        task_text = f"""
+You are the white agent for the PowerPoint benchmark.
+Handle exactly one case, then respond with a short status.
+
+<benchmark_api_url>
+{benchmark_api_url}
+</benchmark_api_url>
+<case_id>
+{case_id}
+</case_id>
+<white_agent_id>
+{white_agent_id}
+</white_agent_id>
+<battle_id>
+{battle_id or ''}
+</battle_id>
+<run_epoch>
+{run_epoch or ''}
+</run_epoch>
+<prefetch_case_ids>
+{",".join(prefetch or [])}
+</prefetch_case_ids>
+        """.strip()
+        if case_payload is not None:
+            task_text += (
+                f"\n<case_payload_encoding>{payload_encoding}</case_payload_encoding>"
+                f"\n<case_payload>\n{case_payload}\n</case_payload>"
+            )
+
+        post_agentbeats_event(
+            battle_id=battle_id,
+            message=f"Green(PPT): Sending case {idx}/{total} to white",
+            reported_by="ppt_green_agent",
+            detail={"case_id": case_id},
+        )
+
+        t0 = time.perf_counter()
+        outcome = "error"
+        CASES_IN_FLIGHT.inc()
+        try:
+            res_msg, white_text, attempts = await self._send_task(
+                white_agent_url,
+                task_text,
+                case_timeout,
+                context_id=shared_context["context_id"] if shared_context else None,
+                label=case_id,
+            )
+            round_trip_ms = (time.perf_counter() - t0) * 1000.0
+            if shared_context is not None and shared_context["context_id"] is None:
+                shared_context["context_id"] = res_msg.context_id
+            print(
+                f"Green(PPT): received submission for case_id={case_id} "
+                f"(white_reply_preview={white_text[:120]!r})"
+            )
+            post_agentbeats_event(
+                battle_id=battle_id,
+                message=f"Green(PPT): White replied for {case_id}",
+                reported_by="ppt_green_agent",
+                detail={"reply_preview": white_text[:400]},
+            )
+            white_timings = latency.reply_timings(white_text)
+            for phase, ms in white_timings.items():
+                if phase in latency.PHASES:
+                    WHITE_PHASE_SECONDS.observe(ms / 1000.0, phase=phase)
+            entry = {
+                "case_id": case_id,
+                "white_reply": white_text[:800],
+                "timings": latency.case_timings(round_trip_ms, white_timings),
+            }
+            if attempts > 1:
+                entry["attempts"] = attempts
+                CASE_RETRIES.inc(attempts - 1)
+            outcome = "ok"
+            return entry
+        except CircuitOpenError as ex:
+            # White agent is considered down; skip the case without burning a timeout.
+            print(f"Green(PPT): skipping {case_id}: {ex}")
+            outcome = "circuit_open"
+            return {"case_id": case_id, "white_error": str(ex), "replica_down": True}
+        except Exception as ex:
+            print(f"Green(PPT): ERROR from white for {case_id}: {ex}")
+            post_agentbeats_event(
+                battle_id=battle_id,
+                message=f"Green(PPT): White failed for {case_id}",
+                reported_by="ppt_green_agent",
+                detail={"error": str(ex)},
+            )
+            entry = {
+                "case_id": case_id,
+                "white_error": str(ex),
+                "timings": {"round_trip_ms": round((time.perf_counter() - t0) * 1000.0, 1)},
+            }
+            if replica_down(ex):
+                entry["replica_down"] = True
+            return entry
+        finally:
+            CASES_IN_FLIGHT.dec()
+            CASE_SECONDS.observe(time.perf_counter() - t0, outcome=outcome)
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
         raise NotImplementedError()
@@ -372,7 +1192,6 @@ def start_green_agent(
     # A2A AgentCard.url is required; default to local URL if not provided.
     agent_card_dict["url"] = os.getenv("AGENT_URL") or f"http://{host}:{port}/"
 
-    agent_executor: AgentExecutor
     # Only PowerPoint benchmark green agent supported in this repo now.
     agent_executor = PptGreenAgentExecutor()
 
@@ -386,4 +1205,19 @@ def start_green_agent(
         http_handler=request_handler,
     )
 
-    uvicorn.run(app.build(), host=host, port=port)
+    lag_monitor = LoopLagMonitor()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_app):
+        lag_monitor.start()
+        startup.report_serving(agent_name)
+        try:
+            yield
+        finally:
+            await lag_monitor.stop()
+            await agent_executor.aclose()
+            await reporter.aclose()
+
+    starlette_app = app.build(lifespan=lifespan)
+    mount_metrics(starlette_app)
+    uvicorn.run(starlette_app, host=host, port=port)
@@ -0,0 +1,159 @@
+"""Locally cached scenario catalog with per-case metadata.
+
+``GET /scenarios`` only returns ids. The catalog keeps that list on disk and revalidates
+it with ``If-None-Match`` once it is older than ``ttl``; a failed revalidation falls back
+to the cached list. Per-case metadata (difficulty, datamodel size, shape count, prompt
+length) is recorded from datamodel fetches the green agent already makes (inline
+delivery) and persisted next to the id list; the catalog never fetches just for it.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import httpx
+
+from src.green_agent.sampler import case_difficulty
+
+
+def _cache_dir() -> str:
+    return os.getenv("PPT_CATALOG_CACHE_DIR", ".ppt_cache")
+
+
+@dataclass
+class CaseMeta:
+    case_id: str
+    difficulty: str
+    datamodel_bytes: int
+    slide_count: int
+    shape_count: int
+    prompt_len: int
+
+    def cost_estimate(self) -> float:
+        """Rough prompt size in tokens (~4 bytes/token); a proxy for LLM latency and spend."""
+        return (self.datamodel_bytes + self.prompt_len) / 4.0
+
+
+def _shape_lists(datamodel: Any) -> list[list]:
+    if not isinstance(datamodel, dict):
+        return []
+    slides = datamodel.get("slides")
+    if isinstance(slides, list):
+        return [s.get("shapes") or [] for s in slides if isinstance(s, dict)]
+    if isinstance(datamodel.get("shapes"), list):
+        return [datamodel["shapes"]]
+    return []
+
+
+def case_meta_from_payload(case_id: str, payload: dict[str, Any], raw_bytes: int) -> CaseMeta:
+    datamodel = payload.get("datamodel", {})
+    shape_lists = _shape_lists(datamodel)
+    return CaseMeta(
+        case_id=case_id,
+        difficulty=case_difficulty(case_id),
+        datamodel_bytes=raw_bytes,
+        slide_count=len(shape_lists),
+        shape_count=sum(len(shapes) for shapes in shape_lists),
+        prompt_len=len(str(payload.get("prompt", ""))),
+    )
+
+
+class ScenarioCatalog:
+    def __init__(self, benchmark_api_url: str, cache_dir: str | None = None, ttl: float = 300.0) -> None:
+        self.benchmark_api_url = benchmark_api_url.rstrip("/")
+        self.ttl = ttl
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", self.benchmark_api_url).strip("_")
+        self.path = os.path.join(cache_dir or _cache_dir(), f"catalog-{slug}.json")
+        self.ids: list[str] = []
+        self.etag: str | None = None
+        self.validated_at = 0.0
+        self.meta: dict[str, CaseMeta] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return
+        self.ids = list(data.get("ids") or [])
+        self.etag = data.get("etag")
+        self.validated_at = float(data.get("validated_at") or 0.0)
+        for cid, m in (data.get("meta") or {}).items():
+            try:
+                self.meta[cid] = CaseMeta(**m)
+            except TypeError:
+                # Written by an older catalog version; it will be refetched lazily.
+                continue
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "ids": self.ids,
+            "etag": self.etag,
+            "validated_at": self.validated_at,
+            "meta": {cid: asdict(m) for cid, m in self.meta.items()},
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    async def list_ids(self, client: httpx.AsyncClient, force: bool = False) -> list[str]:
+        """Return scenario ids, revalidating the cached list when it is stale (or ``force``)."""
+        if self.ids and not force and time.time() - self.validated_at < self.ttl:
+            return self.ids
+        headers = {"If-None-Match": self.etag} if self.etag and self.ids else {}
+        try:
+            resp = await client.get(f"{self.benchmark_api_url}/scenarios", headers=headers)
+            if resp.status_code != 304:
+                resp.raise_for_status()
+                ids = resp.json().get("ids", [])
+                if not isinstance(ids, list) or not ids:
+                    raise ValueError("No scenario ids returned")
+                self.ids = ids
+                self.etag = resp.headers.get("etag")
+                known = set(ids)
+                self.meta = {cid: m for cid, m in self.meta.items() if cid in known}
+        except Exception as ex:
+            if not self.ids:
+                raise
+            print(f"Green(PPT): catalog revalidation failed ({ex}); using {len(self.ids)} cached ids")
+            return self.ids
+        self.validated_at = time.time()
+        self.save()
+        return self.ids
+
+    async def fetch_payloads(
+        self, client: httpx.AsyncClient, case_ids: list[str], concurrency: int = 8
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch full datamodel payloads (for inline delivery); records metadata on the way."""
+        semaphore = asyncio.Semaphore(concurrency)
+        payloads: dict[str, dict[str, Any]] = {}
+
+        async def _fetch(cid: str) -> None:
+            async with semaphore:
+                try:
+                    resp = await client.get(f"{self.benchmark_api_url}/scenarios/datamodel/{cid}")
+                    resp.raise_for_status()
+                    payload = resp.json()
+                except Exception as ex:
+                    print(f"Green(PPT): could not fetch datamodel for {cid}: {ex}")
+                    return
+                payloads[cid] = payload
+                if cid not in self.meta:
+                    self.meta[cid] = case_meta_from_payload(cid, payload, len(resp.content))
+
+        known = len(self.meta)
+        await asyncio.gather(*(_fetch(cid) for cid in dict.fromkeys(case_ids)))
+        if len(self.meta) != known:
+            self.save()
+        return payloads
+
+    def cost_estimate(self, case_id: str) -> float | None:
+        m = self.meta.get(case_id)
+        return m.cost_estimate() if m else None
@@ -0,0 +1,139 @@
+"""Append-only run journal for resumable green agent runs.
+
+Each run writes ``<journal_dir>/<run_id>.jsonl``: one ``run_started`` record with the
+run configuration and selected cases, ``case_dispatched``/``case_finished`` records as
+cases progress, and a ``run_finished`` record at the end. Replaying the file tells a
+restarted green agent which cases still need to be sent to the white agent.
+
+Records are written and fsynced by a background task in a worker thread, so the event
+loop never waits on the disk; records that pile up during a write go out together in
+the next one. ``flush()`` waits until everything appended so far is on disk.
+"""
+
+import asyncio
+import json
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+
+def _journal_dir() -> str:
+    return os.getenv("PPT_RUN_JOURNAL_DIR", ".ppt_runs")
+
+
+# Run ids arrive in message tags and become file names, so no path separators or dots.
+_RUN_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def new_run_id() -> str:
+    return datetime.utcnow().strftime("%Y%m%dT%H%M%SZ") + "-" + uuid.uuid4().hex[:8]
+
+
+@dataclass
+class RunState:
+    run_id: str
+    config: dict[str, Any] = field(default_factory=dict)
+    selected: list[str] = field(default_factory=list)
+    dispatched: set[str] = field(default_factory=set)
+    # case_id -> results_local entry (``white_reply`` or ``white_error``)
+    results: dict[str, dict[str, Any]] = field(default_factory=dict)
+    finished: bool = False
+
+    def pending(self, retry_failed: bool = True) -> list[str]:
+        """Selected cases without a result (or with a failed one, if ``retry_failed``), in order."""
+        out = []
+        for cid in self.selected:
+            r = self.results.get(cid)
+            if r is None or (retry_failed and "white_error" in r):
+                out.append(cid)
+        return out
+
+
+class RunJournal:
+    def __init__(self, run_id: str, directory: str | None = None) -> None:
+        if not _RUN_ID.match(run_id or ""):
+            raise ValueError(f"invalid run_id {run_id!r}: use letters, digits, '-' and '_' only")
+        self.run_id = run_id
+        self.directory = directory or _journal_dir()
+        self.path = os.path.join(self.directory, f"{run_id}.jsonl")
+        self._pending: list[str] = []
+        self._writer: asyncio.Task | None = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _append(self, event: str, **fields: Any) -> None:
+        record = {"event": event, "ts": datetime.utcnow().isoformat() + "Z", **fields}
+        self._pending.append(json.dumps(record, ensure_ascii=False) + "\n")
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(self._take())
+            return
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self._drain())
+
+    def _take(self) -> list[str]:
+        lines, self._pending = self._pending, []
+        return lines
+
+    def _write(self, lines: list[str]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _drain(self) -> None:
+        # One writer at a time keeps records in order.
+        while self._pending:
+            lines = self._take()
+            try:
+                await asyncio.to_thread(self._write, lines)
+            except Exception as ex:
+                print(f"Green(PPT): failed to write {len(lines)} run journal records to {self.path}: {ex}")
+
+    async def flush(self) -> None:
+        while self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    def run_started(self, config: dict[str, Any], selected: list[str]) -> None:
+        self._append("run_started", config=config, selected=selected)
+
+    def run_resumed(self, pending: list[str]) -> None:
+        self._append("run_resumed", pending=pending)
+
+    def case_dispatched(self, case_id: str) -> None:
+        self._append("case_dispatched", case_id=case_id)
+
+    def case_finished(self, result: dict[str, Any]) -> None:
+        self._append("case_finished", result=result)
+
+    def run_finished(self, summary: dict[str, Any]) -> None:
+        self._append("run_finished", summary=summary)
+
+    def load(self) -> RunState:
+        state = RunState(run_id=self.run_id)
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a truncated last line.
+                    continue
+                event = record.get("event")
+                if event == "run_started":
+                    state.config = record.get("config") or {}
+                    state.selected = list(record.get("selected") or [])
+                elif event == "case_dispatched":
+                    state.dispatched.add(record.get("case_id"))
+                elif event == "case_finished":
+                    result = record.get("result") or {}
+                    if result.get("case_id"):
+                        state.results[result["case_id"]] = result
+                elif event == "run_finished":
+                    state.finished = True
+        return state
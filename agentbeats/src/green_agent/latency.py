@@ -0,0 +1,81 @@
+"""Per-case phase timings and their p50/p95/max summary for the green report."""
+
+import json
+import math
+from typing import Any
+
+# Phases in report order. ``round_trip`` is measured by the green agent around the A2A call;
+# the rest come from the white agent's reply. ``transport`` is the part of the round trip
+# the white agent did not account for (A2A/HTTP overhead, queueing, retries).
+PHASES = ("round_trip", "transport", "fetch", "llm", "sanitize", "validate", "submit", "white_total")
+
+
+def _reply_kwargs(white_text: str) -> dict[str, Any]:
+    """``kwargs`` of a white reply of the form ``<json>{...}</json>``; empty if it has none."""
+    start = white_text.find("<json>")
+    end = white_text.rfind("</json>")
+    if start < 0 or end < start:
+        return {}
+    try:
+        kwargs = json.loads(white_text[start + len("<json>") : end]).get("kwargs")
+    except Exception:
+        return {}
+    return kwargs if isinstance(kwargs, dict) else {}
+
+
+def reply_timings(white_text: str) -> dict[str, float]:
+    """Extract ``kwargs.timings`` from a white reply."""
+    timings = _reply_kwargs(white_text).get("timings")
+    if not isinstance(timings, dict):
+        return {}
+    return {k: float(v) for k, v in timings.items() if isinstance(v, (int, float))}
+
+
+def batch_results(white_text: str) -> list[dict[str, Any]]:
+    """Per-case entries (``case_id``, ``outcome``, ``reply``, ``timings``) of a batch reply."""
+    results = _reply_kwargs(white_text).get("results")
+    return [r for r in results if isinstance(r, dict)] if isinstance(results, list) else []
+
+
+def case_timings(round_trip_ms: float, white: dict[str, float]) -> dict[str, float]:
+    timings = {f"{k}_ms": round(v, 1) for k, v in white.items() if k in PHASES}
+    timings["round_trip_ms"] = round(round_trip_ms, 1)
+    if "white_total" in white:
+        timings["transport_ms"] = round(max(0.0, round_trip_ms - white["white_total"]), 1)
+    return timings
+
+
+def _quantile(ordered: list[float], q: float) -> float:
+    # Nearest-rank on the sorted sample; cases per run are few, so no interpolation.
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def summarize(results: list[dict[str, Any]]) -> dict[str, dict[str, float]]:
+    """``{phase: {count, p50_ms, p95_ms, max_ms}}`` over results that carry ``timings``."""
+    samples: dict[str, list[float]] = {p: [] for p in PHASES}
+    for r in results:
+        for key, value in (r.get("timings") or {}).items():
+            phase = key[:-3] if key.endswith("_ms") else key
+            if phase in samples and isinstance(value, (int, float)):
+                samples[phase].append(float(value))
+    out: dict[str, dict[str, float]] = {}
+    for phase, values in samples.items():
+        if not values:
+            continue
+        values.sort()
+        out[phase] = {
+            "count": len(values),
+            "p50_ms": round(_quantile(values, 0.50), 1),
+            "p95_ms": round(_quantile(values, 0.95), 1),
+            "max_ms": round(values[-1], 1),
+        }
+    return out
+
+
+def markdown_table(summary: dict[str, dict[str, float]]) -> str:
+    if not summary:
+        return "_no timings reported_\n"
+    lines = ["| Phase | Cases | p50 (ms) | p95 (ms) | max (ms) |", "| --- | --- | --- | --- | --- |"]
+    for phase, s in summary.items():
+        lines.append(f"| {phase} | {s['count']} | {s['p50_ms']:.0f} | {s['p95_ms']:.0f} | {s['max_ms']:.0f} |")
+    return "\n".join(lines) + "\n"
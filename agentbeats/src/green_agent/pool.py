@@ -0,0 +1,93 @@
+"""Least-outstanding-requests dispatch over several replicas of one white agent.
+
+All replicas submit under the same ``white_agent_id``, so the benchmark scores them as
+one agent. Each case goes to the healthy replica with the fewest cases in flight, with
+ties going to the one that has handled fewer cases. A replica whose call failed because
+it is unreachable (connection refused or reset, open circuit) is marked down for
+``cooldown`` seconds and the case is re-queued on another replica. After the cooldown it
+gets a probe case again, so a restarted replica rejoins the pool. Only a reply clears
+the mark: a slow case that fails later for another reason does not revive a replica
+that was marked down meanwhile. When every replica is down, cases wait for the first
+cooldown to end; each case is re-queued at most ``max_requeues`` times.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+
+import httpx
+
+from src.my_util.resilience import CircuitOpenError
+
+
+@dataclass
+class Replica:
+    url: str
+    outstanding: int = 0
+    dispatched: int = 0
+    failures: int = 0
+    down_until: float = 0.0
+
+    def up(self, now: float) -> bool:
+        return now >= self.down_until
+
+
+def parse_replica_urls(raw: str) -> list[str]:
+    """``<white_agent_urls>``: a JSON list of URLs, or URLs separated by commas/whitespace."""
+    try:
+        parsed = json.loads(raw)
+    except ValueError:
+        parsed = None
+    urls = parsed if isinstance(parsed, list) else raw.replace(",", " ").split()
+    return list(dict.fromkeys(str(u).strip() for u in urls if str(u).strip()))
+
+
+def replica_down(ex: BaseException) -> bool:
+    """True if ``ex`` (or an exception it wraps) says the replica is unreachable, not just slow."""
+    seen: set[int] = set()
+    cur: BaseException | None = ex
+    while cur is not None and id(cur) not in seen:
+        if isinstance(cur, (CircuitOpenError, httpx.NetworkError, httpx.RemoteProtocolError)):
+            return True
+        seen.add(id(cur))
+        cur = cur.__cause__ or cur.__context__
+    return False
+
+
+class ReplicaPool:
+    def __init__(self, urls: list[str], cooldown: float = 30.0, max_requeues: int | None = None) -> None:
+        self.replicas = [Replica(url) for url in urls]
+        self.cooldown = cooldown
+        self.max_requeues = 2 * len(self.replicas) if max_requeues is None else max_requeues
+        self.requeued = 0
+
+    def acquire(self) -> Replica | None:
+        """Reserve the up replica with the fewest outstanding cases; ``None`` if all are down."""
+        now = time.monotonic()
+        up = [r for r in self.replicas if r.up(now)]
+        if not up:
+            return None
+        replica = min(up, key=lambda r: (r.outstanding, r.dispatched))
+        replica.outstanding += 1
+        replica.dispatched += 1
+        return replica
+
+    def release(self, replica: Replica, down: bool = False, reached: bool = False) -> None:
+        """``down``: the call could not reach the replica; ``reached``: the replica replied."""
+        replica.outstanding -= 1
+        if down:
+            replica.failures += 1
+            replica.down_until = time.monotonic() + self.cooldown
+        elif reached:
+            replica.down_until = 0.0
+
+    def next_up_in(self) -> float:
+        """Seconds until the first down replica's cooldown ends (0 if one is up)."""
+        now = time.monotonic()
+        return max(0.0, min(r.down_until for r in self.replicas) - now)
+
+    def stats(self) -> list[dict]:
+        return [
+            {"url": r.url, "dispatched": r.dispatched, "failures": r.failures, "outstanding": r.outstanding}
+            for r in self.replicas
+        ]
@@ -0,0 +1,129 @@
+"""Incremental A2A progress updates for a green agent run.
+
+When the caller opts in with ``<stream_progress>``, the run is reported as an A2A task:
+a ``working`` status update for every case event (dispatched, white replied, failed),
+one artifact per finished case, throttled partial-score artifacts and a final
+``completed`` status. Otherwise every method is a no-op except ``finish``/``fail``,
+which enqueue the single summary message the green agent always returned.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from a2a.server.agent_execution import RequestContext
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import DataPart, Part, TaskState
+from a2a.utils import new_agent_text_message, new_task
+
+
+class ProgressStream:
+    def __init__(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+        enabled: bool,
+        total: int = 0,
+        partial_score_interval: float = 30.0,
+    ) -> None:
+        self.context = context
+        self.event_queue = event_queue
+        self.enabled = enabled
+        self.total = total
+        self.partial_score_interval = partial_score_interval
+        self.counts = {"ok": 0, "failed": 0}
+        self._updater: TaskUpdater | None = None
+        self._last_score_at = 0.0
+        self._score_lock = asyncio.Lock()
+
+    async def start(self, text: str) -> None:
+        if not self.enabled:
+            return
+        task = self.context.current_task
+        if task is None:
+            task = new_task(self.context.message)  # type: ignore[arg-type]
+            await self.event_queue.enqueue_event(task)
+        self._updater = TaskUpdater(self.event_queue, task.id, task.context_id)
+        await self._status(text)
+
+    async def _status(self, text: str) -> None:
+        assert self._updater is not None
+        await self._updater.update_status(
+            TaskState.working,
+            new_agent_text_message(text, self._updater.context_id, self._updater.task_id),
+        )
+
+    async def note(self, text: str) -> None:
+        if self._updater is None:
+            return
+        await self._status(text)
+
+    async def case_dispatched(self, idx: int, case_id: str) -> None:
+        if self._updater is None:
+            return
+        await self._status(f"Case {idx}/{self.total} dispatched: {case_id}")
+
+    async def case_finished(self, idx: int, result: dict[str, Any]) -> None:
+        """Record a finished case (a ``results_local`` entry) and stream it as an artifact."""
+        failed = "white_error" in result
+        self.counts["failed" if failed else "ok"] += 1
+        if self._updater is None:
+            return
+        case_id = result.get("case_id")
+        verb = "failed" if failed else "white replied"
+        done = self.counts["ok"] + self.counts["failed"]
+        await self._status(
+            f"Case {idx}/{self.total} {verb}: {case_id} "
+            f"({done}/{self.total} done, {self.counts['failed']} failed)"
+        )
+        await self._updater.add_artifact(
+            [Part(root=DataPart(data={**result, "completed": done, "total": self.total}))],
+            name=f"case:{case_id}",
+        )
+
+    async def maybe_partial_score(self, fetch: Callable[[], Awaitable[dict | None]]) -> None:
+        """Stream the server-side score so far, at most once per ``partial_score_interval``.
+
+        ``/scenarios/results`` re-validates every submission, so it is throttled and only one
+        fetch runs at a time; cases that finish while a fetch is in flight skip it.
+        """
+        if self._updater is None or self._score_lock.locked():
+            return
+        if time.monotonic() - self._last_score_at < self.partial_score_interval:
+            return
+        async with self._score_lock:
+            self._last_score_at = time.monotonic()
+            try:
+                evaluation = await fetch()
+            except Exception:
+                return
+            if not isinstance(evaluation, dict) or "score" not in evaluation:
+                return
+            done = self.counts["ok"] + self.counts["failed"]
+            data = {
+                "score": evaluation.get("score"),
+                "totalPassed": evaluation.get("totalPassed"),
+                "totalFailed": evaluation.get("totalFailed"),
+                "completed": done,
+                "total": self.total,
+            }
+            await self._updater.add_artifact([Part(root=DataPart(data=data))], name="partial_score")
+
+    async def finish(self, summary: str, result: dict[str, Any] | None = None) -> None:
+        if self._updater is None:
+            await self.event_queue.enqueue_event(new_agent_text_message(summary))
+            return
+        if result is not None:
+            await self._updater.add_artifact([Part(root=DataPart(data=result))], name="evaluation")
+        await self._updater.complete(
+            new_agent_text_message(summary, self._updater.context_id, self._updater.task_id)
+        )
+
+    async def fail(self, text: str) -> None:
+        if self._updater is None:
+            await self.event_queue.enqueue_event(new_agent_text_message(text))
+            return
+        await self._updater.failed(
+            new_agent_text_message(text, self._updater.context_id, self._updater.task_id)
+        )
@@ -0,0 +1,137 @@
+"""Stratified, seedable case sampling for green agent runs."""
+
+import json
+import random
+from collections import Counter
+
+DIFFICULTIES = ("simple", "medium", "hard", "unknown")
+
+# For a 10-case run this is exactly 7 simple, 2 medium, 1 hard; other sizes scale proportionally.
+DEFAULT_MIX: dict[str, float] = {"simple": 7, "medium": 2, "hard": 1}
+
+
+def case_difficulty(case_id: object) -> str:
+    """
+    Infer difficulty bucket from scenario id suffix.
+
+    Examples:
+    - basic-shapes-test-1-simple -> simple
+    - pptc-test-37c-medium -> medium
+    - pptc-test-10d-complex -> hard
+    """
+    if not isinstance(case_id, str):
+        return "unknown"
+    cid = case_id.lower()
+    if cid.endswith("-simple"):
+        return "simple"
+    if cid.endswith("-medium"):
+        return "medium"
+    # The scenario list uses "-complex" for the hardest bucket.
+    if cid.endswith("-complex") or cid.endswith("-hard"):
+        return "hard"
+    return "unknown"
+
+
+def parse_mix(raw: str | None) -> dict[str, float]:
+    """
+    Parse a difficulty mix such as ``simple=7,medium=2,hard=1`` or ``{"simple": 0.7, ...}``.
+
+    Returns ``DEFAULT_MIX`` for an empty value and ``{}`` for ``none``/``uniform``
+    (plain random sampling). Unknown bucket names and non-positive weights are ignored.
+    """
+    if raw is None or not raw.strip():
+        return dict(DEFAULT_MIX)
+    text = raw.strip()
+    if text.lower() in ("none", "uniform", "random"):
+        return {}
+    try:
+        parsed = json.loads(text)
+    except Exception:
+        parsed = {}
+        for part in text.replace(";", ",").split(","):
+            if "=" in part:
+                key, value = part.split("=", 1)
+                parsed[key.strip()] = value.strip()
+    mix: dict[str, float] = {}
+    if isinstance(parsed, dict):
+        for key, value in parsed.items():
+            bucket = "hard" if key == "complex" else key
+            try:
+                weight = float(value)
+            except Exception:
+                continue
+            if bucket in DIFFICULTIES and weight > 0:
+                mix[bucket] = weight
+    return mix or dict(DEFAULT_MIX)
+
+
+def apportion(k: int, mix: dict[str, float]) -> dict[str, int]:
+    """Split ``k`` across buckets proportionally to ``mix`` (largest-remainder rounding)."""
+    total = sum(mix.values())
+    if k <= 0 or total <= 0:
+        return {key: 0 for key in mix}
+    exact = {key: k * weight / total for key, weight in mix.items()}
+    counts = {key: int(value) for key, value in exact.items()}
+    short = k - sum(counts.values())
+    # Ties go to the bucket listed first in the mix, so results are deterministic.
+    order = sorted(mix, key=lambda key: exact[key] - counts[key], reverse=True)
+    for key in order[:short]:
+        counts[key] += 1
+    return counts
+
+
+class DifficultyIndex:
+    """Case ids grouped by difficulty, built once in a single pass over the catalog."""
+
+    def __init__(self, ids: list[str]) -> None:
+        # dict.fromkeys de-duplicates while keeping the catalog order.
+        self.ids: list[str] = list(dict.fromkeys(ids))
+        self.buckets: dict[str, list[str]] = {d: [] for d in DIFFICULTIES}
+        self.difficulty: dict[str, str] = {}
+        for cid in self.ids:
+            d = case_difficulty(cid)
+            self.difficulty[cid] = d
+            self.buckets[d].append(cid)
+
+    def counts(self, ids: list[str] | None = None) -> dict[str, int]:
+        """Cases per difficulty, for the whole index or for a subset of its ids."""
+        if ids is None:
+            return {d: len(pool) for d, pool in self.buckets.items()}
+        c = Counter(self.difficulty.get(cid) or case_difficulty(cid) for cid in ids)
+        return {d: c.get(d, 0) for d in DIFFICULTIES}
+
+    def sample(
+        self,
+        k: int,
+        mix: dict[str, float] | None = None,
+        seed: int | None = None,
+    ) -> list[str]:
+        """
+        Select ``k`` distinct cases following ``mix`` (``DEFAULT_MIX`` if ``None``; an
+        empty mix samples uniformly).
+
+        Buckets are filled up to their proportional target; if a bucket is short, the
+        remainder is backfilled uniformly from all cases not yet chosen. Runs with the
+        same ids, mix and seed select the same cases in the same order.
+        """
+        if mix is None:
+            mix = DEFAULT_MIX
+        rng = random.Random(seed)
+        k = min(max(k, 0), len(self.ids))
+        if k == 0:
+            return []
+        if not mix:
+            return rng.sample(self.ids, k)
+
+        chosen: list[str] = []
+        for bucket, want in apportion(k, mix).items():
+            pool = self.buckets.get(bucket, [])
+            take = min(want, len(pool))
+            if take > 0:
+                chosen.extend(rng.sample(pool, take))
+
+        if len(chosen) < k:
+            taken = set(chosen)
+            remaining = [cid for cid in self.ids if cid not in taken]
+            chosen.extend(rng.sample(remaining, k - len(chosen)))
+        return chosen
@@ -1,38 +1,63 @@
 """Launcher module - initiates and coordinates the evaluation process."""
 
+import asyncio
 import multiprocessing
 import json
-from src.green_agent.agent import start_green_agent
-from src.white_agent.agent import start_white_agent
-from src.my_util import my_a2a
+import socket
+import time
+from a2a.utils import get_text_parts
+from src.my_util import my_a2a, startup
+
+
+# Agent modules are imported in the child process, so the launcher itself stays light.
+def start_green_agent(agent_name: str, host: str, port: int) -> None:
+    with startup.timed_import(agent_name):
+        from src.green_agent.agent import start_green_agent as _start
+    _start(agent_name, host, port)
+
+
+def start_white_agent(agent_name: str, host: str, port: int) -> None:
+    with startup.timed_import(agent_name):
+        from src.white_agent.agent import start_white_agent as _start
+    _start(agent_name, host, port)
+
+
+async def _wait_ready(url: str, label: str, launched_at: float, session: my_a2a.A2ASession) -> bool:
+    ready = await my_a2a.wait_agent_ready(url, session=session)
+    if ready:
+        startup.report(label, "ready after", time.monotonic() - launched_at)
+    return ready
 
 
 async def launch_evaluation():
-    # start green agent
-    print("Launching green agent (PowerPoint benchmark)...")
-    green_address = ("localhost", 9001)
-    green_url = f"http://{green_address[0]}:{green_address[1]}"
-    p_green = multiprocessing.Process(
-        target=start_green_agent, args=("ppt_green_agent", *green_address)
-    )
-    p_green.start()
-    assert await my_a2a.wait_agent_ready(green_url), "Green agent not ready in time"
-    print("Green agent is ready (PowerPoint benchmark).")
-
-    # start white agent
-    print("Launching white agent (PowerPoint benchmark)...")
-    white_address = ("localhost", 9002)
-    white_url = f"http://{white_address[0]}:{white_address[1]}"
-    p_white = multiprocessing.Process(
-        target=start_white_agent, args=("ppt_white_agent", *white_address)
-    )
-    p_white.start()
-    assert await my_a2a.wait_agent_ready(white_url), "White agent not ready in time"
-    print("White agent is ready (PowerPoint benchmark).")
-
-    # send the task description
-    print("Sending PowerPoint benchmark task to green agent...")
-    task_text = f"""
+    async with my_a2a.A2ASession() as session:
+        # start green agent
+        print("Launching green agent (PowerPoint benchmark)...")
+        green_address = ("localhost", 9001)
+        green_url = f"http://{green_address[0]}:{green_address[1]}"
+        p_green = multiprocessing.Process(
+            target=start_green_agent, args=("ppt_green_agent", *green_address)
+        )
+        green_launched = startup.mark_launch()
+        p_green.start()
+        assert await _wait_ready(green_url, "ppt_green_agent", green_launched, session), "Green agent not ready in time"
+        print("Green agent is ready (PowerPoint benchmark).")
+
+        # start white agent
+        print("Launching white agent (PowerPoint benchmark)...")
+        white_address = ("localhost", 9002)
+        white_url = f"http://{white_address[0]}:{white_address[1]}"
+        p_white = multiprocessing.Process(
+            target=start_white_agent, args=("ppt_white_agent", *white_address)
+        )
+        white_launched = startup.mark_launch()
+        p_white.start()
+        assert await _wait_ready(white_url, "ppt_white_agent", white_launched, session), "White agent not ready in time"
+        print("White agent is ready (PowerPoint benchmark).")
+
+        # send the task description
+        print("Sending PowerPoint benchmark task to green agent...")
+        task_text = f"""
 Your task is to run the PowerPoint benchmark against the agent located at:
 <white_agent_url>
 http://{white_address[0]}:{white_address[1]}/
@@ -50,22 +75,129 @@ Use this white agent id for submissions/results:
 agentbeats-white
 </white_agent_id>
     """
-    print("Task description:")
-    print(task_text)
-    print("Sending...")
-    response = await my_a2a.send_message(green_url, task_text)
-    print("Response from green agent:")
-    print(response)
+        print("Task description:")
+        print(task_text)
+        print("Sending...")
+        response = await session.send_message(green_url, task_text)
+        print("Response from green agent:")
+        print(response)
+
+        print("PowerPoint benchmark run complete. Terminating agents...")
+        p_green.terminate()
+        p_green.join()
+        p_white.terminate()
+        p_white.join()
+        print("Agents terminated.")
+
 
-    print("PowerPoint benchmark run complete. Terminating agents...")
-    p_green.terminate()
-    p_green.join()
-    p_white.terminate()
-    p_white.join()
-    print("Agents terminated.")
+def _free_ports(n: int) -> list[int]:
+    # Hold all sockets until every port is picked so the OS does not hand one out twice.
+    socks = []
+    try:
+        for _ in range(n):
+            s = socket.socket()
+            s.bind(("localhost", 0))
+            socks.append(s)
+        return [s.getsockname()[1] for s in socks]
+    finally:
+        for s in socks:
+            s.close()
 
 
-async def launch_remote_evaluation(green_url: str, white_url: str):
+async def _watch_replicas(replicas: list[tuple[str, multiprocessing.Process]]) -> None:
+    # Report crashed replicas; the green agent re-queues their cases on the others.
+    reported: set[str] = set()
+    while True:
+        for url, proc in replicas:
+            if url not in reported and not proc.is_alive():
+                reported.add(url)
+                print(f"White agent replica {url} exited (code {proc.exitcode}).")
+        await asyncio.sleep(0.5)
+
+
+async def launch_pool_evaluation(
+    replicas: int = 4, num_cases: int = 10, concurrency_per_replica: int = 4, stream: bool = False
+):
+    """Start a green agent and ``replicas`` white agents on free ports and run one evaluation.
+
+    The green agent spreads cases over the replicas (least outstanding requests first) and
+    re-queues the cases of a replica that goes down.
+    """
+    ports = _free_ports(replicas + 1)
+    green_url = f"http://localhost:{ports[0]}"
+    print(f"Launching green agent and {replicas} white agent replicas (PowerPoint benchmark)...")
+    launched = startup.mark_launch()
+    p_green = multiprocessing.Process(target=start_green_agent, args=("ppt_green_agent", "localhost", ports[0]))
+    p_green.start()
+    whites: list[tuple[str, multiprocessing.Process]] = []
+    for port in ports[1:]:
+        proc = multiprocessing.Process(target=start_white_agent, args=("ppt_white_agent", "localhost", port))
+        proc.start()
+        whites.append((f"http://localhost:{port}/", proc))
+
+    watcher = None
+    try:
+        async with my_a2a.A2ASession() as session:
+            ready = await asyncio.gather(
+                _wait_ready(green_url, "ppt_green_agent", launched, session),
+                *(_wait_ready(url, f"ppt_white_agent {url}", launched, session) for url, _ in whites),
+            )
+        assert ready[0], "Green agent not ready in time"
+        white_urls = [url for (url, _), ok in zip(whites, ready[1:]) if ok]
+        assert white_urls, "No white agent replica became ready in time"
+        print(f"Green agent and {len(white_urls)}/{replicas} white agent replicas are ready.")
+        watcher = asyncio.create_task(_watch_replicas(whites))
+
+        task_text = f"""
+Your task is to run the PowerPoint benchmark against these replicas of one white agent:
+<white_agent_urls>
+{json.dumps(white_urls)}
+</white_agent_urls>
+Use the benchmark API at:
+<benchmark_api_url>
+http://localhost:5050
+</benchmark_api_url>
+Run this many random cases:
+<num_cases>
+{num_cases}
+</num_cases>
+Keep this many cases in flight across all replicas:
+<max_concurrency>
+{len(white_urls) * concurrency_per_replica}
+</max_concurrency>
+Use this white agent id for submissions/results:
+<white_agent_id>
+agentbeats-white
+</white_agent_id>
+    """
+        await _send_green_task(green_url, task_text, stream=stream)
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        print("PowerPoint benchmark run complete. Terminating agents...")
+        for proc in [p_green, *(proc for _, proc in whites)]:
+            proc.terminate()
+        for proc in [p_green, *(proc for _, proc in whites)]:
+            proc.join()
+        print("Agents terminated.")
+
+
+def _print_stream_event(event) -> None:
+    kind = getattr(event, "kind", type(event).__name__)
+    if kind == "status-update":
+        message = event.status.message
+        text = " ".join(get_text_parts(message.parts)) if message else ""
+        print(f"[{event.status.state.value}] {text}")
+    elif kind == "artifact-update":
+        data = [p.root.data for p in event.artifact.parts if getattr(p.root, "kind", None) == "data"]
+        print(f"[artifact {event.artifact.name}] {json.dumps(data[0] if len(data) == 1 else data)[:400]}")
+    elif kind == "message":
+        print(" ".join(get_text_parts(event.parts)))
+    else:
+        print(f"[{kind}]")
+
+
+async def launch_remote_evaluation(green_url: str, white_url: str, stream: bool = False):
     task_text = f"""
 Your task is to run the PowerPoint benchmark against the agent located at:
 <white_agent_url>
@@ -84,7 +216,53 @@ Use this white agent id for submissions/results:
 agentbeats-white
 </white_agent_id>
     """
+    await _send_green_task(green_url, task_text, stream=stream)
+
+
+async def launch_tournament_evaluation(
+    green_url: str, white_urls: list[str], num_cases: int = 10, stream: bool = False
+):
+    # One shared case sample, evaluated against every white agent; ids default to white-<n>.
+    white_agents = json.dumps([{"id": f"white-{n}", "url": url} for n, url in enumerate(white_urls, start=1)])
+    task_text = f"""
+Your task is to run a PowerPoint benchmark tournament between these white agents:
+<white_agents>
+{white_agents}
+</white_agents>
+Use the benchmark API at:
+<benchmark_api_url>
+http://localhost:5050
+</benchmark_api_url>
+Run this many random cases against each agent:
+<num_cases>
+{num_cases}
+</num_cases>
+    """
+    await _send_green_task(green_url, task_text, stream=stream)
+
+
+async def launch_resume_evaluation(green_url: str, run_id: str, stream: bool = False):
+    # The green agent reloads white agent, benchmark API and case selection from its run journal.
+    task_text = f"""
+Resume the interrupted PowerPoint benchmark run:
+<resume_run_id>
+{run_id}
+</resume_run_id>
+    """
+    await _send_green_task(green_url, task_text, stream=stream)
+
+
+async def _send_green_task(green_url: str, task_text: str, stream: bool = False):
+    if stream:
+        task_text += "<stream_progress>true</stream_progress>\n"
+        print("Streaming task progress from green agent...")
+        # Cases can take minutes between updates; don't let the read timeout end the stream.
+        async with my_a2a.A2ASession(timeout=None) as session:
+            async for event in session.stream_message(green_url, task_text):
+                _print_stream_event(event)
+        return
     print("Sending task description to green agent...")
-    response = await my_a2a.send_message(green_url, task_text)
+    async with my_a2a.A2ASession() as session:
+        response = await session.send_message(green_url, task_text)
     print("Response from green agent:")
     print(response)
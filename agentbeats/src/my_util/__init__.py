@@ -1,5 +1,5 @@
 import re
-from typing import Dict
+from typing import Dict, List
 
 
 def parse_tags(str_with_tags: str) -> Dict[str, str]:
@@ -9,6 +9,12 @@ def parse_tags(str_with_tags: str) -> Dict[str, str]:
     return {tag: content.strip() for tag, content in tags}
 
 
+def parse_tag_list(str_with_tags: str, tag: str) -> List[str]:
+    """all values of a tag that may repeat (parse_tags keeps only the last one), in order"""
+
+    return [content.strip() for content in re.findall(rf"<{re.escape(tag)}>(.*?)</{re.escape(tag)}>", str_with_tags, re.DOTALL)]
+
+
 if __name__ == "__main__":
     test_str = "<tag1>Hello</tag1> some text <tag2>World</tag2>"
     print(parse_tags(test_str))
@@ -0,0 +1,319 @@
+"""Non-blocking reporter for AgentBeats battle events.
+
+Agents call ``post_agentbeats_event`` from inside async ``execute``; the event is
+queued and a background task delivers it to ``$AGENTBEATS_BACKEND_URL/battles/<id>``
+over a shared ``httpx.AsyncClient``, so a slow backend never stalls the event loop.
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import Any
+
+import httpx
+
+
+# Queued to get the worker to write and replay the spill file; not an event.
+_WAKE = object()
+
+
+def _ab_backend_url() -> str:
+    return os.environ.get("AGENTBEATS_BACKEND_URL", "http://localhost:9000")
+
+
+class AgentBeatsReporter:
+    """Bounded, batching event queue drained by a background task.
+
+    - Events are delivered in order per battle; different battles are sent concurrently.
+    - When the backend falls behind and more than ``coalesce_threshold`` progress events
+      for one battle pile up in a batch, they are folded into a single event.
+    - Progress events beyond ``max_queue`` are appended to ``spill_path`` (JSONL) when set,
+      otherwise dropped. Result events (``is_result=True``) are never dropped.
+    - Once anything is spilled, every new event goes to the spill file too until it has
+      been replayed, so spilled events are never delivered after newer ones.
+    - Spill file reads and writes happen in the worker via ``asyncio.to_thread``; a spill
+      file left by an earlier process is replayed as soon as the worker starts.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        coalesce_threshold: int = 5,
+        spill_path: str | None = None,
+        timeout: float = 10.0,
+    ) -> None:
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.coalesce_threshold = coalesce_threshold
+        self.spill_path = spill_path
+        self.timeout = timeout
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Events are waiting in the spill file (possibly left by an earlier process) or in
+        # _to_spill, on their way there.
+        self._spilling = bool(spill_path and os.path.exists(spill_path))
+        self._to_spill: list[dict[str, Any]] = []
+        self._wake_pending = False
+        self._counters = {
+            "sent": 0,
+            "failed": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "coalesced": 0,
+        }
+
+    def stats(self) -> dict[str, int]:
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return {"queue_depth": depth, **self._counters}
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._queue is None:
+            # First use, or a new event loop (e.g. a second asyncio.run in the same process).
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+            self._wake_pending = False
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    def post(
+        self,
+        battle_id: str | None,
+        message: str,
+        reported_by: str,
+        detail: dict[str, Any] | None = None,
+        markdown_content: str | None = None,
+        is_result: bool = False,
+    ) -> None:
+        if not battle_id:
+            return
+        payload: dict[str, Any] = {
+            "is_result": is_result,
+            "message": message,
+            "reported_by": reported_by,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        }
+        if detail:
+            payload["detail"] = detail
+        if markdown_content:
+            payload["markdown_content"] = markdown_content
+        self._enqueue({"battle_id": battle_id, "payload": payload})
+
+    def _enqueue(self, event: dict[str, Any]) -> None:
+        try:
+            queue = self._ensure_worker()
+        except RuntimeError:
+            # No running loop (sync caller): deliver inline, best-effort.
+            self._post_sync(event)
+            return
+        is_result = bool(event["payload"].get("is_result"))
+        if self._spilling or (queue.qsize() >= self.max_queue and not is_result):
+            if self.spill_path:
+                self._spilling = True
+                self._to_spill.append(event)
+                self._wake()
+                return
+            if not is_result:
+                self._counters["dropped"] += 1
+                return
+        queue.put_nowait(event)
+
+    def _wake(self) -> None:
+        if not self._wake_pending and self._queue is not None:
+            self._wake_pending = True
+            self._queue.put_nowait(_WAKE)
+
+    def _post_sync(self, event: dict[str, Any]) -> None:
+        try:
+            with httpx.Client(timeout=self.timeout) as client:
+                client.post(f"{_ab_backend_url()}/battles/{event['battle_id']}", json=event["payload"])
+            self._counters["sent"] += 1
+        except Exception:
+            self._counters["failed"] += 1
+
+    def _append_spill(self, events: list[dict[str, Any]]) -> bool:
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as f:  # type: ignore[arg-type]
+                f.writelines(json.dumps(e) + "\n" for e in events)
+            return True
+        except Exception:
+            return False
+
+    def _take_spill(self, room: int) -> tuple[list[str], bool] | None:
+        """Remove up to ``room`` lines from the front of the spill file.
+
+        Returns the lines and whether the file is now empty (and deleted), or ``None`` if
+        it could not be read or rewritten.
+        """
+        try:
+            with open(self.spill_path, encoding="utf-8") as f:  # type: ignore[arg-type]
+                lines = f.readlines()
+        except FileNotFoundError:
+            return [], True
+        except Exception:
+            return None
+        try:
+            if len(lines) <= room:
+                os.remove(self.spill_path)  # type: ignore[arg-type]
+            else:
+                with open(self.spill_path, "w", encoding="utf-8") as f:  # type: ignore[arg-type]
+                    f.writelines(lines[room:])
+        except Exception:
+            return None
+        return lines[:room], len(lines) <= room
+
+    async def _sync_spill(self) -> None:
+        """Write pending spilled events, then move spilled events back into the queue.
+
+        Only the worker calls this, so file access is never concurrent. While spilling,
+        new events go to the file as well, so everything still queued is older than the
+        spilled events and appending them keeps the order.
+        """
+        queue = self._queue
+        if not self.spill_path or queue is None or not self._spilling:
+            return
+        if self._to_spill:
+            events, self._to_spill = self._to_spill, []
+            if await asyncio.to_thread(self._append_spill, events):
+                self._counters["spilled"] += len(events)
+            else:
+                for e in events:
+                    if e["payload"].get("is_result"):
+                        queue.put_nowait(e)
+                    else:
+                        self._counters["dropped"] += 1
+        room = self.max_queue - queue.qsize()
+        if room <= 0:
+            return
+        taken = await asyncio.to_thread(self._take_spill, room)
+        if taken is None:
+            return
+        lines, drained = taken
+        for line in lines:
+            try:
+                queue.put_nowait(json.loads(line))
+            except Exception:
+                self._counters["dropped"] += 1
+        if drained and not self._to_spill:
+            self._spilling = False
+
+    def _coalesce(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Fold runs of progress events for one battle into a single event."""
+        progress = [e for e in events if not e["payload"].get("is_result")]
+        if len(progress) <= self.coalesce_threshold:
+            return events
+        out: list[dict[str, Any]] = []
+        run: list[dict[str, Any]] = []
+
+        def _close_run() -> None:
+            if len(run) == 1:
+                out.append(run[0])
+            elif run:
+                last = run[-1]["payload"]
+                merged = dict(last)
+                merged["message"] = f"{last['message']} (+{len(run) - 1} earlier updates)"
+                merged["detail"] = {
+                    "coalesced": [
+                        {k: e["payload"].get(k) for k in ("message", "timestamp", "detail")}
+                        for e in run
+                    ]
+                }
+                out.append({"battle_id": run[-1]["battle_id"], "payload": merged})
+                self._counters["coalesced"] += len(run) - 1
+            run.clear()
+
+        for e in events:
+            if e["payload"].get("is_result") or e["payload"].get("markdown_content"):
+                _close_run()
+                out.append(e)
+            else:
+                run.append(e)
+        _close_run()
+        return out
+
+    async def _send_battle(self, client: httpx.AsyncClient, battle_id: str, events: list[dict]) -> None:
+        for e in self._coalesce(events):
+            try:
+                await client.post(f"{_ab_backend_url()}/battles/{battle_id}", json=e["payload"])
+                self._counters["sent"] += 1
+            except Exception:
+                # best-effort only
+                self._counters["failed"] += 1
+
+    async def _run(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            await self._sync_spill()
+            while True:
+                batch = [await queue.get()]
+                while len(batch) < self.batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+                by_battle: dict[str, list[dict]] = {}
+                for e in batch:
+                    if e is _WAKE:
+                        self._wake_pending = False
+                    else:
+                        by_battle.setdefault(e["battle_id"], []).append(e)
+                try:
+                    await asyncio.gather(
+                        *(self._send_battle(client, bid, evs) for bid, evs in by_battle.items())
+                    )
+                finally:
+                    # Refill from the spill file before marking the batch done so that
+                    # flush() keeps waiting until spilled events are delivered too.
+                    await self._sync_spill()
+                    for _ in batch:
+                        queue.task_done()
+
+    async def flush(self, timeout: float | None = 30.0) -> bool:
+        """Wait until every queued event has been delivered (or failed). Returns False on timeout."""
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return True
+        if self._spilling:
+            self._wake()
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def aclose(self, timeout: float | None = 30.0) -> None:
+        await self.flush(timeout=timeout)
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._worker = None
+
+
+reporter = AgentBeatsReporter(
+    max_queue=int(os.getenv("AGENTBEATS_EVENT_QUEUE_SIZE", "1000")),
+    spill_path=os.getenv("AGENTBEATS_EVENT_SPILL_PATH") or None,
+)
+
+
+def post_agentbeats_event(
+    battle_id: str | None,
+    message: str,
+    reported_by: str,
+    detail: dict[str, Any] | None = None,
+    markdown_content: str | None = None,
+    is_result: bool = False,
+) -> None:
+    """Queue an event for the AgentBeats backend; never blocks the caller."""
+    reporter.post(
+        battle_id,
+        message,
+        reported_by,
+        detail=detail,
+        markdown_content=markdown_content,
+        is_result=is_result,
+    )
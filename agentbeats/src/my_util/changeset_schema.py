@@ -0,0 +1,516 @@
+"""Local validation of AIChangeset JSON before it is submitted.
+
+Pydantic models mirroring ``benchmark/changeset-schema.yaml``, built once at import.
+The benchmark server validates with its own Zod ``AIChangesetSchema``, which accepts a
+little more than the YAML documents, so the models are deliberately lenient where the
+white agent's output and the bundled datamodels differ from the YAML:
+
+- shape ids may be ints or strings;
+- ``modified`` also accepts ``placeholder`` (wrapping a textbox update), ``image`` and
+  ``chart`` updates;
+- auto shape ``details`` with an ``autoShapeType`` the YAML does not list are passed through;
+- line ``startPos``/``endPos`` may be a plain ``[x, y]`` pair;
+- unknown keys are kept, as Zod's default object parsing does.
+
+``validate_changeset`` validates entry by entry, applies pydantic's coercions (e.g.
+``"12"`` -> ``12.0``) and drops entries that cannot be repaired, with a reason for each.
+"""
+
+from typing import Annotated, Any, Literal, Union
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Discriminator,
+    Field,
+    Tag,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+    model_validator,
+)
+
+ShapeId = int | str
+Pair = Annotated[list[float], Field(min_length=2, max_length=2)]
+
+_POS_ANCHORS = ("topLeft", "center", "bottomRight")
+
+
+class _Model(BaseModel):
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+
+class AIPos(_Model):
+    topLeft: Pair | None = None
+    bottomRight: Pair | None = None
+    center: Pair | None = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _single_anchor(cls, data: Any) -> Any:
+        # The schema allows only one anchor; keep the first of topLeft/center/bottomRight.
+        if isinstance(data, dict) and sum(1 for k in _POS_ANCHORS if data.get(k) is not None) > 1:
+            keep = next(k for k in _POS_ANCHORS if data.get(k) is not None)
+            data = {k: v for k, v in data.items() if k not in _POS_ANCHORS or k == keep}
+        return data
+
+
+class AISize(_Model):
+    w: float
+    h: float
+
+
+class AIFillPicture(_Model):
+    type: Literal["PICTURE (6)"]
+
+
+class AIFillSolid(_Model):
+    type: Literal["SOLID (1)"]
+    foreColor: str | None
+
+
+class AIFillGradient(_Model):
+    type: Literal["GRADIENT (2)"]
+    foreColor: str | None
+    backColor: str | None
+
+
+class AIFillPattern(_Model):
+    type: Literal["PATTERN (3)"]
+    foreColor: str | None
+    backColor: str | None
+
+
+class AIFillTexture(_Model):
+    type: Literal["TEXTURE (4)"]
+    foreColor: str | None
+
+
+class AIFillGroup(_Model):
+    type: Literal["GROUP (101)"]
+
+
+AIFill = Annotated[
+    Union[AIFillPicture, AIFillSolid, AIFillGradient, AIFillPattern, AIFillTexture, AIFillGroup],
+    Field(discriminator="type"),
+]
+
+
+class AILine(_Model):
+    color: str
+    width: float
+
+
+class AIStyle(_Model):
+    fill: AIFill | None = None
+    line: AILine | None = None
+
+
+class AIRectAutoShape(_Model):
+    autoShapeType: Literal["rect"]
+
+
+class AIRoundRectAutoShape(_Model):
+    autoShapeType: Literal["roundRect"]
+    cornerRadius: float
+
+
+class AIRound2SameRectAutoShape(_Model):
+    autoShapeType: Literal["round2SameRect"]
+    topCornerRadius: float
+    bottomCornerRadius: float
+
+
+class AIRound2DiagRectAutoShape(_Model):
+    autoShapeType: Literal["round2DiagRect"]
+    topLeftCornerRadius: float
+    bottomRightCornerRadius: float
+
+
+class AIOvalAutoShape(_Model):
+    autoShapeType: Literal["ellipse"]
+
+
+class AIPlusAutoShape(_Model):
+    autoShapeType: Literal["plus"]
+
+
+class _ArrowAutoShape(_Model):
+    tailWidth: Annotated[float, Field(ge=0, le=100)]
+    headLength: Annotated[float, Field(ge=0, le=100)]
+
+
+class AIRightArrowAutoShape(_ArrowAutoShape):
+    autoShapeType: Literal["rightArrow"]
+
+
+class AILeftArrowAutoShape(_ArrowAutoShape):
+    autoShapeType: Literal["leftArrow"]
+
+
+class AIUpArrowAutoShape(_ArrowAutoShape):
+    autoShapeType: Literal["upArrow"]
+
+
+class AIDownArrowAutoShape(_ArrowAutoShape):
+    autoShapeType: Literal["downArrow"]
+
+
+class AISpeechBubbleAutoShape(_Model):
+    autoShapeType: Literal["wedgeRectCallout"]
+
+
+_AUTO_SHAPE_DETAILS: dict[str, TypeAdapter] = {
+    name: TypeAdapter(model)
+    for name, model in {
+        "rect": AIRectAutoShape,
+        "roundRect": AIRoundRectAutoShape,
+        "round2SameRect": AIRound2SameRectAutoShape,
+        "round2DiagRect": AIRound2DiagRectAutoShape,
+        "ellipse": AIOvalAutoShape,
+        "plus": AIPlusAutoShape,
+        "rightArrow": AIRightArrowAutoShape,
+        "leftArrow": AILeftArrowAutoShape,
+        "upArrow": AIUpArrowAutoShape,
+        "downArrow": AIDownArrowAutoShape,
+        "wedgeRectCallout": AISpeechBubbleAutoShape,
+    }.items()
+}
+
+
+def _validate_details(value: Any) -> Any:
+    if not isinstance(value, dict) or not isinstance(value.get("autoShapeType"), str):
+        raise ValueError("details must be an object with an autoShapeType string")
+    adapter = _AUTO_SHAPE_DETAILS.get(value["autoShapeType"])
+    if adapter is None:
+        # e.g. "OTHER" from the datamodel: not in the YAML, passed through unchanged.
+        return value
+    return adapter.dump_python(adapter.validate_python(value), exclude_unset=True)
+
+
+class AIBackground(_Model):
+    color: str
+    fill: AIFill | None = None
+
+
+class AIBorder(_Model):
+    color: str | None = None
+    width: float | None = None
+
+
+class AIFontInfoInput(_Model):
+    margin: Annotated[list[float], Field(min_length=4, max_length=4)] | None = None
+    wordWrap: bool | None = None
+    autoSize: Literal["NONE", "SHAPE_TO_FIT_TEXT", "TEXT_TO_FIT_SHAPE", "MIXED"] | None = None
+    fontSizeRef: str | None = Field(default=None, alias="_fontSizeRef")
+
+
+class AIAutoShapeText(_Model):
+    markdown: str | None = None
+    fontInfo: AIFontInfoInput | None = None
+
+
+class AILineStyle(_Model):
+    width: Annotated[float, Field(ge=0)] | None = None
+    color: str | None = None
+    dashStyle: Literal[
+        "dash", "dashDot", "dashDotDot", "dashStyleMixed", "longDash", "longDashDot", "roundDot", "solid", "squareDot"
+    ] | None = None
+    beginArrowStyle: Literal["none", "triangle", "stealth", "oval", "diamond", "open"] | None = None
+    beginArrowLength: Literal["arrowheadLengthShort", "arrowheadLengthMedium", "arrowheadLengthLong"] | None = None
+    beginArrowWidth: Literal["arrowheadWidthNarrow", "arrowheadWidthMedium", "arrowheadWidthWide"] | None = None
+    endArrowStyle: Literal["none", "triangle", "stealth", "oval", "diamond", "open"] | None = None
+    endArrowLength: Literal["arrowheadLengthShort", "arrowheadLengthMedium", "arrowheadLengthLong"] | None = None
+    endArrowWidth: Literal["arrowheadWidthNarrow", "arrowheadWidthMedium", "arrowheadWidthWide"] | None = None
+
+
+class AIConnectionPoint(_Model):
+    id: ShapeId
+    placement: Annotated[float, Field(ge=0, le=8)] | None = None
+
+
+LineEnd = Union[AIPos, Pair]
+ConnectorType = Literal["curvedConnector3", "bentConnector3", "line", "UNKNOWN"]
+
+
+# --- added -----------------------------------------------------------------------------
+
+
+class _AddedBase(_Model):
+    added_id: str = Field(alias="_id")
+    pos: AIPos
+    size: AISize
+    content: str | None = None
+    style: AIStyle | None = None
+    inheritStylesFrom: str | None = None
+
+
+class AIAddedImageShape(_AddedBase):
+    shapeType: Literal["image"]
+    url: str | None = None
+    base64: str | None = None
+    filePath: str | None = None
+    autoShapeType: str | None = None
+    cornerRadius: float | Pair | None = None
+
+
+class AIAddedAutoShape(_AddedBase):
+    shapeType: Literal["autoShape"]
+    details: Any
+    background: AIBackground | None = None
+    border: AIBorder | None = None
+    rotation: float | None = None
+    text: AIAutoShapeText | None = None
+
+    @field_validator("details")
+    @classmethod
+    def check_details(cls, value: Any) -> Any:
+        return _validate_details(value)
+
+
+class AIAddedTextboxShape(_AddedBase):
+    shapeType: Literal["textbox"]
+    markdown: str | None = None
+    fontInfo: AIFontInfoInput | None = None
+    rotation: float | None = None
+
+
+class AIAddedChartShape(_AddedBase):
+    shapeType: Literal["chart"]
+
+
+class AIAddedIconShape(_AddedBase):
+    shapeType: Literal["icon"]
+    iconName: str | None = None
+    url: str | None = None
+    filePath: str | None = None
+
+
+class AIAddedLineShape(_AddedBase):
+    shapeType: Literal["line"]
+    style: AILineStyle | None = None  # type: ignore[assignment]
+    inheritFrom: str | None = None
+    lineType: ConnectorType
+    startFrom: AIConnectionPoint | None = None
+    startPos: LineEnd | None = None
+    endFrom: AIConnectionPoint | None = None
+    endPos: LineEnd | None = None
+
+
+class AIAddedGroupShape(_AddedBase):
+    shapeType: Literal["group"]
+    items: list[ShapeId]
+
+
+AIAddedShape = Annotated[
+    Union[
+        AIAddedImageShape,
+        AIAddedAutoShape,
+        AIAddedTextboxShape,
+        AIAddedChartShape,
+        AIAddedIconShape,
+        AIAddedLineShape,
+        AIAddedGroupShape,
+    ],
+    Field(discriminator="shapeType"),
+]
+
+
+# --- modified --------------------------------------------------------------------------
+
+
+class _UpdatedBase(_Model):
+    id: ShapeId
+    inheritStylesFrom: str | None = None
+
+
+class AIUpdatedLineShape(_UpdatedBase):
+    shapeType: Literal["line"]
+    style: AILineStyle | None = None
+    lineType: ConnectorType | None = None
+    startFrom: AIConnectionPoint | None = None
+    startPos: LineEnd | None = None
+    endFrom: AIConnectionPoint | None = None
+    endPos: LineEnd | None = None
+
+
+class AIUpdatedAutoShape(_UpdatedBase):
+    shapeType: Literal["autoShape"]
+    pos: AIPos | None = None
+    size: AISize | None = None
+    rotation: float | None = None
+    details: Any = None
+    background: AIBackground | None = None
+    border: AIBorder | None = None
+    text: AIAutoShapeText | None = None
+
+    @field_validator("details")
+    @classmethod
+    def check_details(cls, value: Any) -> Any:
+        return value if value is None else _validate_details(value)
+
+
+class AIUpdatedTextboxShape(_UpdatedBase):
+    shapeType: Literal["textbox"]
+    pos: AIPos | None = None
+    size: AISize | None = None
+    rotation: float | None = None
+    markdown: str | None = None
+    fontInfo: AIFontInfoInput | None = None
+
+
+class AIUpdatedImageShape(_UpdatedBase):
+    shapeType: Literal["image"]
+    pos: AIPos | None = None
+    size: AISize | None = None
+    rotation: float | None = None
+
+
+class AIUpdatedChartShape(_UpdatedBase):
+    shapeType: Literal["chart"]
+    pos: AIPos | None = None
+    size: AISize | None = None
+
+
+class AIUpdatedPlaceholderShape(_UpdatedBase):
+    shapeType: Literal["placeholder"]
+    shape: AIUpdatedTextboxShape
+    zIndex: int | None = None
+
+
+AIUpdatedShape = Annotated[
+    Union[
+        AIUpdatedLineShape,
+        AIUpdatedAutoShape,
+        AIUpdatedTextboxShape,
+        AIUpdatedImageShape,
+        AIUpdatedChartShape,
+        AIUpdatedPlaceholderShape,
+    ],
+    Field(discriminator="shapeType"),
+]
+
+
+# --- deleted ---------------------------------------------------------------------------
+
+
+class AIDeleteGroupShape(_Model):
+    id: ShapeId
+    shapeType: Literal["group"]
+    unloadItems: bool | None = None
+
+
+class AIDeletedShape(_Model):
+    id: ShapeId
+
+
+# Union tag for deletions of anything but a group (the key the errors are reported under).
+_PLAIN_DELETE = "deletedShape"
+
+
+def _deleted_kind(value: Any) -> str:
+    shape_type = value.get("shapeType") if isinstance(value, dict) else getattr(value, "shapeType", None)
+    return "group" if shape_type == "group" else _PLAIN_DELETE
+
+
+# A smart union would let a bad group deletion pass as a plain one (extra keys are allowed),
+# so the group variant is selected explicitly.
+AIDeletedShapeSchema = Annotated[
+    Union[Annotated[AIDeleteGroupShape, Tag("group")], Annotated[AIDeletedShape, Tag(_PLAIN_DELETE)]],
+    Discriminator(_deleted_kind),
+]
+
+
+_ADAPTERS: dict[str, TypeAdapter] = {
+    "added": TypeAdapter(AIAddedShape),
+    "modified": TypeAdapter(AIUpdatedShape),
+    "deleted": TypeAdapter(AIDeletedShapeSchema),
+}
+
+
+def _short_error(ex: ValidationError) -> str:
+    first = ex.errors()[0]
+    loc = ".".join(str(p) for p in first.get("loc", ()))
+    more = f" (+{ex.error_count() - 1} more)" if ex.error_count() > 1 else ""
+    return f"{loc + ': ' if loc else ''}{first.get('msg')}{more}"
+
+
+# Keys an entry cannot do without, per section; an error in one of these drops the entry.
+_REQUIRED = {
+    "added": {"_id", "shapeType", "pos", "size", "lineType", "items", "details"},
+    "modified": {"id", "shapeType", "shape"},
+    "deleted": {"id", "shapeType"},
+}
+# Keys that only identify the shape; a repaired update with nothing else left is a no-op.
+_IDENTITY = {"id", "shapeType"}
+
+
+def _bad_fields(entry: dict, ex: ValidationError) -> set[str]:
+    """Top-level keys of ``entry`` named by the validation errors."""
+    keys: set[str] = set()
+    for err in ex.errors():
+        loc = list(err.get("loc", ()))
+        # Discriminated unions prefix the location with the tag (e.g. "textbox").
+        if loc and loc[0] in (entry.get("shapeType"), _PLAIN_DELETE) and len(loc) > 1:
+            loc = loc[1:]
+        if loc and isinstance(loc[0], str):
+            keys.add(loc[0])
+    return keys
+
+
+def _validate_entry(
+    adapter: TypeAdapter, entry: Any, required: set[str], edits: bool = False
+) -> tuple[dict | None, str | None]:
+    """Return ``(entry, note)``; drops invalid optional fields once before giving up on the entry.
+
+    With ``edits`` (``modified`` entries) a repair that leaves only ``id``/``shapeType``
+    drops the entry instead: the invalid field was the whole edit.
+    """
+    try:
+        return adapter.dump_python(adapter.validate_python(entry), by_alias=True, exclude_unset=True), None
+    except ValidationError as ex:
+        error = ex
+    if isinstance(entry, dict):
+        bad = _bad_fields(entry, error)
+        if bad and not bad & required:
+            if edits and set(entry) - bad <= _IDENTITY:
+                return None, f"nothing left to change without invalid {', '.join(sorted(bad))} ({_short_error(error)})"
+            try:
+                trimmed = {k: v for k, v in entry.items() if k not in bad}
+                parsed = adapter.validate_python(trimmed)
+                return (
+                    adapter.dump_python(parsed, by_alias=True, exclude_unset=True),
+                    f"removed invalid {', '.join(sorted(bad))} ({_short_error(error)})",
+                )
+            except ValidationError:
+                pass
+    return None, _short_error(error)
+
+
+def validate_changeset(changeset: Any) -> tuple[dict[str, list[dict]], list[str]]:
+    """
+    Validate an AIChangeset entry by entry.
+
+    Returns ``(changeset, problems)``: the changeset with every valid or repaired entry
+    (after pydantic's coercions) and one ``"<section>[<i>] id=<id>: <reason>"`` line per
+    repaired or dropped entry. Repairs remove invalid optional fields; an entry whose
+    required fields are invalid, or an update left with nothing to change, is dropped.
+    """
+    problems: list[str] = []
+    out: dict[str, list[dict]] = {"added": [], "modified": [], "deleted": []}
+    if not isinstance(changeset, dict):
+        return out, ["changeset: not a JSON object"]
+    for section, adapter in _ADAPTERS.items():
+        entries = changeset.get(section) or []
+        if not isinstance(entries, list):
+            problems.append(f"{section}: not a list")
+            continue
+        for i, entry in enumerate(entries):
+            clean, note = _validate_entry(adapter, entry, _REQUIRED[section], edits=section == "modified")
+            if note is not None:
+                sid = entry.get("id", entry.get("_id")) if isinstance(entry, dict) else None
+                action = "repaired" if clean is not None else "dropped"
+                problems.append(f"{section}[{i}] id={sid}: {action}: {note}")
+            if clean is not None:
+                out[section].append(clean)
+    return out, problems
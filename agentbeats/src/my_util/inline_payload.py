@@ -0,0 +1,38 @@
+"""Encoding for scenario payloads sent inline in an A2A message.
+
+The green agent can put a case's ``/scenarios/datamodel/:caseId`` payload into
+``<case_payload>`` with its encoding in ``<case_payload_encoding>``:
+
+- ``json``: the payload as JSON, with ``<``/``>`` escaped so XML inside the datamodel
+  cannot be mistaken for tags by ``parse_tags``.
+- ``zlib``: zlib-compressed JSON, base64-encoded (typically 5-10x smaller).
+"""
+
+import base64
+import json
+import zlib
+from typing import Any
+
+ENCODINGS = ("json", "zlib")
+
+
+def encode_payload(payload: dict[str, Any], encoding: str = "zlib") -> str:
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    if encoding == "zlib":
+        return base64.b64encode(zlib.compress(text.encode("utf-8"), 6)).decode("ascii")
+    if encoding == "json":
+        return text.replace("<", "\\u003c").replace(">", "\\u003e")
+    raise ValueError(f"unknown payload encoding: {encoding}")
+
+
+def decode_payload(text: str, encoding: str = "zlib") -> dict[str, Any]:
+    if encoding == "zlib":
+        raw = zlib.decompress(base64.b64decode("".join(text.split()))).decode("utf-8")
+    elif encoding == "json":
+        raw = text
+    else:
+        raise ValueError(f"unknown payload encoding: {encoding}")
+    payload = json.loads(raw)
+    if not isinstance(payload, dict):
+        raise ValueError("inline payload is not a JSON object")
+    return payload
@@ -1,6 +1,8 @@
 import httpx
 import asyncio
+import time
 import uuid
+from typing import Any, AsyncIterator
 
 
 from a2a.client import A2ACardResolver, A2AClient
@@ -13,55 +15,190 @@ from a2a.types import (
     Role,
     SendMessageRequest,
     SendMessageResponse,
+    SendStreamingMessageRequest,
 )
 
 
+def _build_params(message, task_id=None, context_id=None) -> MessageSendParams:
+    message_id = uuid.uuid4().hex
+    return MessageSendParams(
+        message=Message(
+            role=Role.user,
+            parts=[Part(TextPart(text=message))],
+            message_id=message_id,
+            task_id=task_id,
+            context_id=context_id,
+        )
+    )
+
+
+class A2ASession:
+    """Long-lived A2A client state shared across many messages.
+
+    Keeps one keep-alive ``httpx.AsyncClient`` pool per agent URL and caches each
+    agent's ``AgentCard`` for ``card_ttl`` seconds, so repeated sends to the same
+    agent skip both the TCP/TLS handshake and the card GET. Use it as an async
+    context manager, or call ``aclose()`` when done.
+    """
+
+    def __init__(
+        self,
+        timeout: float | None = 120.0,
+        card_ttl: float = 300.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+    ) -> None:
+        self.timeout = timeout
+        self.card_ttl = card_ttl
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._http: dict[str, httpx.AsyncClient] = {}
+        # url -> (fetched_at, card, client bound to that card)
+        self._cards: dict[str, tuple[float, AgentCard, A2AClient]] = {}
+        self._card_locks: dict[str, asyncio.Lock] = {}
+        self._closed = False
+
+    async def __aenter__(self) -> "A2ASession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return url.rstrip("/")
+
+    def _http_client(self, url: str) -> httpx.AsyncClient:
+        if self._closed:
+            raise RuntimeError("A2ASession is closed")
+        key = self._key(url)
+        client = self._http.get(key)
+        if client is None:
+            client = httpx.AsyncClient(timeout=self.timeout, limits=self._limits)
+            self._http[key] = client
+        return client
+
+    def invalidate_card(self, url: str) -> None:
+        self._cards.pop(self._key(url), None)
+
+    async def _client_for(self, url: str, refresh: bool = False) -> tuple[AgentCard, A2AClient]:
+        key = self._key(url)
+        cached = self._cards.get(key)
+        if not refresh and cached and time.monotonic() - cached[0] < self.card_ttl:
+            return cached[1], cached[2]
+        # Concurrent senders to a cold URL should trigger a single card fetch.
+        lock = self._card_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._cards.get(key)
+            if not refresh and cached and time.monotonic() - cached[0] < self.card_ttl:
+                return cached[1], cached[2]
+            http = self._http_client(url)
+            resolver = A2ACardResolver(httpx_client=http, base_url=url)
+            card: AgentCard = await resolver.get_agent_card()
+            client = A2AClient(httpx_client=http, agent_card=card)
+            self._cards[key] = (time.monotonic(), card, client)
+            return card, client
+
+    async def get_agent_card(self, url: str, refresh: bool = False) -> AgentCard | None:
+        card, _ = await self._client_for(url, refresh=refresh)
+        return card
+
+    async def send_message(
+        self, url, message, task_id=None, context_id=None
+    ) -> SendMessageResponse:
+        _, client = await self._client_for(url)
+        params = _build_params(message, task_id=task_id, context_id=context_id)
+        req = SendMessageRequest(id=uuid.uuid4().hex, params=params)
+        try:
+            return await client.send_message(request=req)
+        except Exception:
+            # The agent may have restarted with a different card; refetch next time.
+            self.invalidate_card(url)
+            raise
+
+    async def stream_message(
+        self, url, message, task_id=None, context_id=None
+    ) -> AsyncIterator[Any]:
+        """Yield the agent's events (Task, status and artifact updates, or a Message) as they arrive."""
+        _, client = await self._client_for(url)
+        params = _build_params(message, task_id=task_id, context_id=context_id)
+        req = SendStreamingMessageRequest(id=uuid.uuid4().hex, params=params)
+        try:
+            async for response in client.send_message_streaming(request=req):
+                root = response.root
+                error = getattr(root, "error", None)
+                if error is not None:
+                    raise RuntimeError(f"A2A streaming error: {error}")
+                yield root.result
+        except Exception:
+            self.invalidate_card(url)
+            raise
+
+    async def aclose(self) -> None:
+        self._closed = True
+        clients = list(self._http.values())
+        self._http.clear()
+        self._cards.clear()
+        await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+
+
 async def get_agent_card(url: str) -> AgentCard | None:
-    httpx_client = httpx.AsyncClient()
-    resolver = A2ACardResolver(httpx_client=httpx_client, base_url=url)
+    async with httpx.AsyncClient() as httpx_client:
+        resolver = A2ACardResolver(httpx_client=httpx_client, base_url=url)
 
-    card: AgentCard | None = await resolver.get_agent_card()
+        card: AgentCard | None = await resolver.get_agent_card()
 
     return card
 
 
-async def wait_agent_ready(url, timeout=10):
-    # wait until the A2A server is ready, check by getting the agent card
-    retry_cnt = 0
-    while retry_cnt < timeout:
-        retry_cnt += 1
-        try:
-            card = await get_agent_card(url)
-            if card is not None:
-                return True
-            else:
-                print(
-                    f"Agent card not available yet..., retrying {retry_cnt}/{timeout}"
+async def wait_agent_ready(
+    url,
+    timeout=10,
+    session: A2ASession | None = None,
+    initial_delay: float = 0.005,
+    max_delay: float = 0.25,
+) -> bool:
+    """Poll ``url``'s agent card until it answers; ``False`` after ``timeout`` seconds.
+
+    The delay between attempts starts at ``initial_delay`` and doubles up to
+    ``max_delay``, so an agent that comes up in 200ms is seen within a few
+    milliseconds of it. All attempts share one client: ``session`` if given,
+    otherwise a short-lived session of our own.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    own = session is None
+    if session is None:
+        session = A2ASession(timeout=timeout)
+    delay = initial_delay
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                card = await asyncio.wait_for(
+                    session.get_agent_card(url, refresh=True), timeout=max(remaining, 0.01)
                 )
-        except Exception:
-            pass
-        await asyncio.sleep(1)
-    return False
+                if card is not None:
+                    return True
+            except Exception:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+    finally:
+        if own:
+            await session.aclose()
 
 
 async def send_message(
     url, message, task_id=None, context_id=None
 ) -> SendMessageResponse:
-    card = await get_agent_card(url)
-    httpx_client = httpx.AsyncClient(timeout=120.0)
-    client = A2AClient(httpx_client=httpx_client, agent_card=card)
-
-    message_id = uuid.uuid4().hex
-    params = MessageSendParams(
-        message=Message(
-            role=Role.user,
-            parts=[Part(TextPart(text=message))],
-            message_id=message_id,
-            task_id=task_id,
-            context_id=context_id,
+    # One-off helper; callers sending more than one message should hold an A2ASession.
+    async with A2ASession() as session:
+        return await session.send_message(
+            url, message, task_id=task_id, context_id=context_id
         )
-    )
-    request_id = uuid.uuid4().hex
-    req = SendMessageRequest(id=request_id, params=params)
-    response = await client.send_message(request=req)
-    return response
@@ -0,0 +1,234 @@
+"""Timeouts, retries and circuit breaking for calls to a remote agent."""
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+from a2a.client.errors import A2AClientTimeoutError
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying; the a2a client reports network failures as 503.
+_TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an agent that has stopped responding."""
+
+
+def is_transient(ex: BaseException) -> bool:
+    """Network errors, timeouts and 5xx/429 responses; anything else is the agent's answer."""
+    if isinstance(ex, (asyncio.TimeoutError, TimeoutError, httpx.TransportError, A2AClientTimeoutError)):
+        return True
+    status = getattr(ex, "status_code", None)
+    if status is None and isinstance(ex, httpx.HTTPStatusError):
+        status = ex.response.status_code
+    return status in _TRANSIENT_STATUS
+
+
+def _causes(ex: BaseException):
+    seen: set[int] = set()
+    cur: BaseException | None = ex
+    while cur is not None and id(cur) not in seen:
+        seen.add(id(cur))
+        yield cur
+        cur = cur.__cause__ or cur.__context__
+
+
+def request_not_sent(ex: BaseException) -> bool:
+    """True if ``ex`` shows the request never reached the agent, so resending cannot duplicate work.
+
+    That is a failed connect or a 429 rejection. Timeouts, dropped connections and 5xx
+    replies may come after the agent started (or finished) the case, so they are not
+    retried: for the white agent a retry would run the LLM and submit the case again.
+    """
+    for cur in _causes(ex):
+        if isinstance(cur, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return True
+        if isinstance(cur, httpx.HTTPStatusError) and cur.response.status_code == 429:
+            return True
+    return False
+
+
+class AdaptiveTimeout:
+    """Per-attempt timeout derived from recent successful latencies.
+
+    Until ``min_samples`` calls have succeeded the ``initial`` timeout is used; after that
+    it is ``multiplier`` x the ``percentile`` latency of the last ``window`` calls, clamped
+    to ``[minimum, maximum]``.
+    """
+
+    def __init__(
+        self,
+        initial: float = 120.0,
+        minimum: float = 15.0,
+        maximum: float = 600.0,
+        percentile: float = 0.95,
+        multiplier: float = 3.0,
+        window: int = 100,
+        min_samples: int = 5,
+    ) -> None:
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def current(self) -> float:
+        if len(self._samples) < self.min_samples:
+            return self.initial
+        observed = self.quantile(self.percentile) or self.initial
+        return min(self.maximum, max(self.minimum, observed * self.multiplier))
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive transient failures.
+
+    While open, calls fail immediately. After ``reset_timeout`` seconds one probe call is
+    let through (half-open); its success closes the circuit, its failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_call(self) -> bool:
+        """Raise ``CircuitOpenError`` unless the call may go ahead; True if it is the probe."""
+        if self.state == "closed":
+            return False
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        raise CircuitOpenError(
+            f"circuit open after {self.consecutive_failures} consecutive failures; "
+            f"not calling the agent (retry in {max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)):.0f}s)"
+        )
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def abandon_probe(self) -> None:
+        """The probe was cancelled without an outcome; let the next call probe instead."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+
+class ResiliencePolicy:
+    """Adaptive timeout + jittered exponential retries + circuit breaker for one agent."""
+
+    def __init__(
+        self,
+        timeout: AdaptiveTimeout | None = None,
+        breaker: CircuitBreaker | None = None,
+        retries: int = 2,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0,
+    ) -> None:
+        self.timeout = timeout or AdaptiveTimeout()
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_env(cls, prefix: str = "PPT_WHITE") -> "ResiliencePolicy":
+        def _f(name: str, default: float) -> float:
+            try:
+                return float(os.getenv(f"{prefix}_{name}", str(default)))
+            except ValueError:
+                return default
+
+        return cls(
+            timeout=AdaptiveTimeout(
+                initial=_f("TIMEOUT_INITIAL", 120.0),
+                minimum=_f("TIMEOUT_MIN", 15.0),
+                maximum=_f("TIMEOUT_MAX", 600.0),
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=int(_f("BREAKER_THRESHOLD", 5)),
+                reset_timeout=_f("BREAKER_RESET", 60.0),
+            ),
+            retries=int(_f("RETRIES", 2)),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        # "Full jitter": spreads retries from concurrent cases instead of synchronizing them.
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * (2**attempt)))
+
+    async def _attempt(self, fn: Callable[[], Awaitable[T]], limit: float) -> T:
+        try:
+            return await asyncio.wait_for(fn(), timeout=limit)
+        except asyncio.TimeoutError as ex:
+            # Chained so request_not_sent/replica_down still see the original exception.
+            raise TimeoutError(f"no reply within adaptive timeout of {limit:.0f}s") from ex
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        on_retry: Callable[[int, BaseException, float], None] | None = None,
+        retry_if: Callable[[BaseException], bool] = is_transient,
+    ) -> tuple[T, int]:
+        """Run ``fn`` under the policy; returns ``(result, attempts)``.
+
+        Every transient failure counts against the circuit breaker, but only those for
+        which ``retry_if`` is true are retried.
+        """
+        attempt = 0
+        while True:
+            probe = self.breaker.before_call()
+            attempt += 1
+            limit = self.timeout.current()
+            t0 = time.monotonic()
+            try:
+                result = await self._attempt(fn, limit)
+            except asyncio.CancelledError:
+                # E.g. the caller's case deadline; without this the breaker would stay
+                # half-open with a probe that never finishes and reject every call.
+                if probe:
+                    self.breaker.abandon_probe()
+                raise
+            except Exception as ex:
+                if not is_transient(ex):
+                    # The agent answered; that is not a sign it is down.
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt > self.retries or self.breaker.state == "open" or not retry_if(ex):
+                    raise
+                delay = self.backoff(attempt - 1)
+                if on_retry is not None:
+                    on_retry(attempt, ex, delay)
+                await asyncio.sleep(delay)
+                continue
+            self.timeout.observe(time.monotonic() - t0)
+            self.breaker.record_success()
+            return result, attempt
@@ -0,0 +1,57 @@
+"""Startup timing for ``main.py --startup-profile``.
+
+The flag sets ``PPT_STARTUP_PROFILE=1``, which agent processes started by the launcher
+inherit. Timings are measured from ``PPT_STARTUP_T0`` (a ``time.monotonic()`` value the
+launcher sets right before starting a process; the clock is system-wide) or, failing
+that, from when this module was first imported.
+"""
+
+import contextlib
+import os
+import time
+from typing import Iterator
+
+PROFILE_ENV = "PPT_STARTUP_PROFILE"
+T0_ENV = "PPT_STARTUP_T0"
+
+_T0 = time.monotonic()
+
+
+def enable() -> None:
+    os.environ[PROFILE_ENV] = "1"
+
+
+def enabled() -> bool:
+    return os.getenv(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def started_at() -> float:
+    try:
+        return float(os.environ[T0_ENV])
+    except (KeyError, ValueError):
+        return _T0
+
+
+def mark_launch() -> float:
+    """Record now as the start time for processes launched next; returns it."""
+    t0 = time.monotonic()
+    os.environ[T0_ENV] = repr(t0)
+    return t0
+
+
+def report(agent: str, what: str, seconds: float) -> None:
+    if enabled():
+        print(f"Startup({agent}): {what} {seconds * 1000.0:.0f}ms")
+
+
+@contextlib.contextmanager
+def timed_import(agent: str) -> Iterator[None]:
+    """Report how long the imports inside the block took."""
+    t0 = time.perf_counter()
+    yield
+    report(agent, "import", time.perf_counter() - t0)
+
+
+def report_serving(agent: str) -> None:
+    """Called from an agent's lifespan startup: time from launch until the app is up."""
+    report(agent, "serving after", time.monotonic() - started_at())
@@ -1,14 +1,16 @@
 """White agent implementation - the target agent being tested."""
 
+import asyncio
+import contextlib
+import hashlib
 import json
 import os
-import uuid
+import time
 from typing import Any
 
 import uvicorn
 import dotenv
 import httpx
-from datetime import datetime
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.agent_execution import AgentExecutor, RequestContext
@@ -16,13 +18,42 @@ from a2a.server.events import EventQueue
 from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentSkill, AgentCard, AgentCapabilities
 from a2a.utils import new_agent_text_message
-from litellm import completion
-from src.my_util import parse_tags
+from src.my_util import parse_tag_list, parse_tags, startup
+from src.my_util.changeset_schema import validate_changeset
+from src.my_util.inline_payload import decode_payload
+from src.my_util.metrics import REGISTRY, TOKEN_BUCKETS, LoopLagMonitor, mount_metrics
+from src.my_util.agentbeats_events import post_agentbeats_event, reporter
+from src.white_agent.datamodel_cache import DatamodelCache
+from src.white_agent.llm_cache import LLMResponseCache, cache_key
+from src.white_agent.prompt_encoding import encode_datamodel, estimate_tokens, prompt_encoding
+from src.white_agent.hedging import first_valid, hedge_delay, hedge_models
+from src.white_agent.sanitizer import SanitizeResult, sanitize_changeset
+from src.white_agent.shape_index import ShapeIndex
+from src.white_agent.stream_parser import ChangesetStreamParser, StreamAbort
 
 RESPOND_ACTION_NAME = "respond"
 
 dotenv.load_dotenv()
 
+CASE_SECONDS = REGISTRY.histogram("ppt_white_case_seconds", "Time to handle one case.", ["outcome"])
+LLM_SECONDS = REGISTRY.histogram("ppt_white_llm_seconds", "LLM request latency.", ["model"])
+LLM_INPUT_TOKENS = REGISTRY.histogram(
+    "ppt_white_llm_input_tokens", "Prompt tokens per LLM request.", ["model"], buckets=TOKEN_BUCKETS
+)
+LLM_OUTPUT_TOKENS = REGISTRY.histogram(
+    "ppt_white_llm_output_tokens", "Completion tokens per LLM request.", ["model"], buckets=TOKEN_BUCKETS
+)
+FETCH_SECONDS = REGISTRY.histogram("ppt_white_datamodel_fetch_seconds", "Time to load a case datamodel.", ["source"])
+SUBMIT_SECONDS = REGISTRY.histogram("ppt_white_submit_seconds", "Changeset submit latency.")
+SANITIZER_DROPS = REGISTRY.counter(
+    "ppt_white_sanitizer_drops_total", "Changeset entries dropped by the sanitizer.", ["reason"]
+)
+SUBMIT_FAILURES = REGISTRY.counter("ppt_white_submit_failures_total", "Changeset submissions that failed.")
+CASES_IN_FLIGHT = REGISTRY.gauge("ppt_white_cases_in_flight", "Cases being handled right now.")
+STREAM_ABORTS = REGISTRY.counter(
+    "ppt_white_stream_aborts_total", "Streamed LLM replies abandoned as invalid.", ["reason"]
+)
+
 
 def prepare_white_agent_card(url: str, agent_name: str = "ppt_white_agent") -> AgentCard:
     if agent_name != "ppt_white_agent":
@@ -39,6 +70,8 @@ def prepare_white_agent_card(url: str, agent_name: str = "ppt_white_agent") -> A
         examples=[
             "Given <case_id>pptc-test-3a</case_id> and <benchmark_api_url>http://localhost:5050</benchmark_api_url>, "
             "fetch the datamodel, generate a valid AIChangeset JSON, and submit it.",
+            "Given several <case_id> tags (or <cases> with a JSON list), handle them concurrently "
+            "and reply with one status per case.",
         ],
     )
 
@@ -74,38 +107,6 @@ def ensure_json_envelope(content: str) -> str:
     return f"<json>{json.dumps(fallback)}</json>"
 
 
-def _ab_backend_url() -> str:
-    return os.environ.get("AGENTBEATS_BACKEND_URL", "http://localhost:9000")
-
-
-def _post_agentbeats_event(
-    battle_id: str | None,
-    message: str,
-    reported_by: str,
-    detail: dict[str, Any] | None = None,
-    markdown_content: str | None = None,
-    is_result: bool = False,
-) -> None:
-    if not battle_id:
-        return
-    try:
-        payload = {
-            "is_result": is_result,
-            "message": message,
-            "reported_by": reported_by,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
-        if detail:
-            payload["detail"] = detail
-        if markdown_content:
-            payload["markdown_content"] = markdown_content
-        with httpx.Client(timeout=10.0) as client:
-            client.post(f"{_ab_backend_url()}/battles/{battle_id}", json=payload)
-    except Exception:
-        # best-effort logging only
-        pass
-
-
 def _ppt_model() -> str:
     # Allow override; defaults to a real model that exists in most setups.
     # If you set this to a non-existent model name, LLM calls will fail.
@@ -120,7 +121,7 @@ def _ppt_system_prompt() -> str:
     # Keep it conservative to minimize schema violations.
     return """You are a PowerPoint slide editing agent.
 
-You will receive a case_id, a benchmark_api_url, and a slide datamodel JSON plus a natural-language prompt.
+You will receive a case_id, a benchmark_api_url, and a slide datamodel (JSON or a compact listing) plus a natural-language prompt.
 
 You MUST output ONLY valid JSON for an AIChangeset:
 {
@@ -146,176 +147,26 @@ Rules:
 """
 
 
-def _coerce_size_keys(obj: dict) -> None:
-    size = obj.get("size")
-    if not isinstance(size, dict):
-        return
-    # Map common mistakes -> expected keys
-    if "width" in size and "w" not in size:
-        size["w"] = size.get("width")
-    if "height" in size and "h" not in size:
-        size["h"] = size.get("height")
-    # Clean up invalid keys if present
-    size.pop("width", None)
-    size.pop("height", None)
-
-
-def _sanitize_changeset(changeset: dict, id_to_type: dict, id_to_details: dict) -> dict:
-    out = {
-        "added": changeset.get("added") or [],
-        "modified": changeset.get("modified") or [],
-        "deleted": changeset.get("deleted") or [],
-    }
-    if not isinstance(out["added"], list):
-        out["added"] = []
-    if not isinstance(out["modified"], list):
-        out["modified"] = []
-    if not isinstance(out["deleted"], list):
-        out["deleted"] = []
-
-    allowed_modified_types = {
-        "placeholder",
-        "textbox",
-        "image",
-        "chart",
-        "autoShape",
-        "line",
-    }
+def _batch_cases(user_input: str, tags: dict[str, str]) -> list[dict[str, str]] | None:
+    """Cases of a batch message, or ``None`` for a single-case message.
 
-    def _normalize_shape_type(st: object) -> str | None:
-        if not isinstance(st, str):
-            return None
-        s = st.strip()
-        if not s:
-            return None
-        lower = s.lower()
-        mapping = {
-            "textbox": "textbox",
-            "text box": "textbox",
-            "text_box": "textbox",
-            "text-box": "textbox",
-            "text": "textbox",
-            "autoshape": "autoShape",
-            "auto_shape": "autoShape",
-            "auto-shape": "autoShape",
-            "image": "image",
-            "picture": "image",
-            "img": "image",
-            "chart": "chart",
-            "line": "line",
-            "connector": "line",
-            "placeholder": "placeholder",
-            "group": "group",
-            "icon": "icon",
-        }
-        if lower in mapping:
-            return mapping[lower]
-        if s in (
-            "textbox",
-            "image",
-            "chart",
-            "icon",
-            "autoShape",
-            "line",
-            "group",
-            "placeholder",
-        ):
-            return s
-        return None
-
-    # Added shapes are high-risk for schema violations; keep only safe ones.
-    safe_added: list[dict] = []
-    for a in out["added"]:
-        if not isinstance(a, dict):
-            continue
-        st = _normalize_shape_type(a.get("shapeType"))
-        # Keep added extremely conservative: only allow image/textbox additions for now.
-        if st not in {"image", "textbox"}:
-            continue
-        a["shapeType"] = st
-        if "_id" not in a:
-            a["_id"] = f"NEW-{uuid.uuid4().hex}"
-        if not isinstance(a.get("pos"), dict) or not isinstance(a.get("size"), dict):
-            continue
-        _coerce_size_keys(a)
-        safe_added.append(a)
-    out["added"] = safe_added
-
-    safe_modified: list[dict] = []
-    for m in out["modified"]:
-        if not isinstance(m, dict):
-            continue
-        if "id" not in m:
-            continue
-        try:
-            m["id"] = int(m["id"])
-        except Exception:
-            continue
-        shape_id = m["id"]
-        # enforce known ids only
-        if shape_id not in id_to_type:
-            continue
-        # enforce valid discriminator (prefer the true type from the datamodel)
-        requested_type = _normalize_shape_type(m.get("shapeType"))
-        actual_type = _normalize_shape_type(id_to_type.get(shape_id)) or id_to_type.get(shape_id)
-        shape_type = actual_type or requested_type
-        if shape_type not in allowed_modified_types:
-            # Drop unsupported modified unions (e.g., group/icon) rather than submitting invalid changesets.
-            continue
-        m["shapeType"] = shape_type
-
-        # normalize size keys if present
-        _coerce_size_keys(m)
-
-        # Remove fields invalid for certain modified unions
-        if shape_type == "line":
-            # Line updates cannot include pos/size/details
-            m.pop("pos", None)
-            m.pop("size", None)
-            m.pop("details", None)
-
-        # for autoShape, if details exist in original, carry it to reduce union issues
-        if shape_type == "autoShape" and "details" not in m and shape_id in id_to_details:
-            m["details"] = id_to_details[shape_id]
-
-        # placeholder updates must wrap a textbox update under "shape"
-        if shape_type == "placeholder":
-            nested = m.get("shape")
-            if not isinstance(nested, dict):
-                nested = {}
-            nested["id"] = int(nested.get("id") or shape_id)
-            nested["shapeType"] = "textbox"
-            # Move textbox-like patch fields into nested shape update
-            for k in ("name", "inheritStylesFrom", "pos", "size", "style", "xml", "fontInfo"):
-                if k in m:
-                    nested[k] = m[k]
-            outer_z = m.get("zIndex")
-            m.clear()
-            m["id"] = int(shape_id)
-            m["shapeType"] = "placeholder"
-            m["shape"] = nested
-            if isinstance(outer_z, int):
-                m["zIndex"] = outer_z
-
-        safe_modified.append(m)
-    out["modified"] = safe_modified
-
-    safe_deleted: list[dict] = []
-    for d in out["deleted"]:
-        if not isinstance(d, dict):
-            continue
-        if "id" not in d:
-            continue
+    A batch is either several ``<case_id>`` tags or ``<cases>`` holding a JSON list of case
+    ids or of objects with ``case_id`` and per-case tag values (e.g. ``case_payload``).
+    """
+    if tags.get("cases"):
         try:
-            did = int(d["id"])
-        except Exception:
-            continue
-        if did not in id_to_type:
-            continue
-        safe_deleted.append({"id": did})
-    out["deleted"] = safe_deleted
-
-    return out
+            items = json.loads(tags["cases"])
+        except ValueError:
+            items = [c.strip() for c in tags["cases"].split(",")]
+        cases = []
+        for item in items if isinstance(items, list) else []:
+            if isinstance(item, dict) and item.get("case_id"):
+                cases.append({str(k): str(v) for k, v in item.items()})
+            elif isinstance(item, (str, int)) and str(item).strip():
+                cases.append({"case_id": str(item).strip()})
+        return cases
+    case_ids = [c for c in parse_tag_list(user_input, "case_id") if c]
+    return [{"case_id": c} for c in case_ids] if len(case_ids) > 1 else None
 
 
 def _summarize_changeset(changeset: dict) -> dict[str, Any]:
@@ -376,9 +227,152 @@ def _summarize_changeset(changeset: dict) -> dict[str, Any]:
 
 
 class PptWhiteAgentExecutor(AgentExecutor):
+    def __init__(self, max_concurrency: int | None = None) -> None:
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("PPT_WHITE_MAX_CONCURRENCY", "16"))
+        # Cases handled at once; the rest wait here instead of piling onto the LLM provider.
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._http: httpx.AsyncClient | None = None
+        self._llm_cache = LLMResponseCache()
+        self._datamodels = DatamodelCache()
+
+    def _client(self) -> httpx.AsyncClient:
+        # Created lazily so it binds to uvicorn's event loop.
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=120.0)
+        return self._http
+
+    async def aclose(self) -> None:
+        await self._datamodels.aclose()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _complete(self, messages: list[dict[str, str]], model: str) -> str:
+        """Return the raw LLM reply text. Load tests override this with a fake model."""
+        acompletion = await _acompletion()
+        t0 = time.perf_counter()
+        resp = await acompletion(
+            messages=messages,
+            model=model,
+            custom_llm_provider=("litellm_proxy" if os.getenv("LITELLM_PROXY_API_KEY") else "openai"),
+            temperature=0.0,
+        )
+        LLM_SECONDS.observe(time.perf_counter() - t0, model=model)
+        usage = getattr(resp, "usage", None)
+        if usage is not None:
+            LLM_INPUT_TOKENS.observe(getattr(usage, "prompt_tokens", 0) or 0, model=model)
+            LLM_OUTPUT_TOKENS.observe(getattr(usage, "completion_tokens", 0) or 0, model=model)
+        return resp.choices[0].message["content"]  # type: ignore
+
+    async def _stream(self, messages: list[dict[str, str]], model: str, parser: ChangesetStreamParser) -> None:
+        """Feed the streamed LLM reply into ``parser``; stops early when it raises ``StreamAbort``."""
+        acompletion = await _acompletion()
+        t0 = time.perf_counter()
+        stream = await acompletion(
+            messages=messages,
+            model=model,
+            custom_llm_provider=("litellm_proxy" if os.getenv("LITELLM_PROXY_API_KEY") else "openai"),
+            temperature=0.0,
+            stream=True,
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices:
+                    parser.feed(chunk.choices[0].delta.content or "")
+        finally:
+            # Closing the stream drops the connection, which stops generation on abort.
+            close = getattr(stream, "aclose", None)
+            if close is not None:
+                with contextlib.suppress(Exception):
+                    await close()
+        LLM_SECONDS.observe(time.perf_counter() - t0, model=model)
+
+    async def _complete_streaming(
+        self, messages: list[dict[str, str]], model: str, index: ShapeIndex
+    ) -> tuple[str, SanitizeResult, float]:
+        """Stream a reply, sanitizing entries as they complete; retry with a correction on abort."""
+        retries = int(os.getenv("PPT_STREAM_RETRIES", "1"))
+        max_unknown = int(os.getenv("PPT_STREAM_MAX_UNKNOWN_IDS", "3"))
+        attempt_messages = messages
+        for attempt in range(retries + 1):
+            parser = ChangesetStreamParser(index, max_unknown_ids=max_unknown)
+            try:
+                await self._stream(attempt_messages, model, parser)
+                return parser.text, parser.finish(), parser.sanitize_ms
+            except StreamAbort as ex:
+                STREAM_ABORTS.inc(reason=ex.code)
+                print(f"White(PPT): aborted {model} stream after {len(parser.text)} chars: {ex}")
+                if attempt == retries:
+                    raise
+                attempt_messages = messages + [
+                    {
+                        "role": "user",
+                        "content": f"Your previous reply was unusable ({ex}). Reply with ONLY the AIChangeset JSON object.",
+                    }
+                ]
+        raise AssertionError("unreachable")
+
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
         user_input = context.get_user_input()
         tags = parse_tags(user_input)
+        batch = _batch_cases(user_input, tags)
+        if batch is None:
+            _, text = await self._execute_case(tags)
+        else:
+            text = await self._execute_batch(tags, batch)
+        await event_queue.enqueue_event(new_agent_text_message(text, context_id=context.context_id))
+
+    async def _execute_batch(self, tags: dict[str, str], cases: list[dict[str, str]]) -> str:
+        """Run the cases of a batch message concurrently (under the process-wide limit)."""
+        print(f"White(PPT): handling batch of {len(cases)} cases")
+        benchmark_api_url = tags.get("benchmark_api_url") or os.getenv(
+            "PPT_BENCHMARK_API_URL", "http://localhost:5050"
+        )
+        # Warm datamodels for cases still waiting on the concurrency limit.
+        fetch_ids = [c["case_id"] for c in cases if not c.get("case_payload")]
+        if fetch_ids:
+            self._datamodels.prefetch(self._client(), benchmark_api_url, fetch_ids, tags.get("run_epoch") or None)
+
+        async def _one(case: dict[str, str]) -> dict[str, Any]:
+            case_tags = {k: v for k, v in tags.items() if k not in ("cases", "prefetch_case_ids")}
+            case_tags.update(case)
+            try:
+                outcome, text = await self._execute_case(case_tags)
+            except Exception as ex:
+                outcome, text = "crashed", ensure_json_envelope(f"White(PPT): case crashed: {ex}")
+            result: dict[str, Any] = {"case_id": case["case_id"], "outcome": outcome, "reply": text}
+            if outcome == "submitted":
+                with contextlib.suppress(Exception):
+                    reply = json.loads(text[len("<json>") : -len("</json>")])
+                    result["timings"] = reply["kwargs"]["timings"]
+            return result
+
+        results = await asyncio.gather(*(_one(c) for c in cases))
+        submitted = sum(1 for r in results if r["outcome"] == "submitted")
+        reply = {
+            "name": RESPOND_ACTION_NAME,
+            "kwargs": {"content": f"batch: {submitted}/{len(results)} submitted", "results": results},
+        }
+        return f"<json>{json.dumps(reply)}</json>"
+
+    async def _execute_case(self, tags: dict[str, str]) -> tuple[str, str]:
+        async with self._semaphore:
+            CASES_IN_FLIGHT.inc()
+            t0 = time.perf_counter()
+            outcome = "cancelled"
+            try:
+                outcome, text = await self._run_case(tags)
+            except Exception:
+                outcome = "crashed"
+                raise
+            finally:
+                CASES_IN_FLIGHT.dec()
+                CASE_SECONDS.observe(time.perf_counter() - t0, outcome=outcome)
+        return outcome, text
+
+    async def _run_case(self, tags: dict[str, str]) -> tuple[str, str]:
+        """Handle one case; return its outcome (``submitted`` or the phase that failed) and reply text."""
         battle_id = tags.get("battle_id") or os.environ.get("AGENTBEATS_BATTLE_ID")
 
         benchmark_api_url = tags.get("benchmark_api_url") or os.getenv(
@@ -388,108 +382,183 @@ class PptWhiteAgentExecutor(AgentExecutor):
         white_agent_id = tags.get("white_agent_id") or os.getenv(
             "PPT_WHITE_AGENT_ID", "agentbeats-white"
         )
+        # Cached datamodels from an earlier run epoch are revalidated before use.
+        run_epoch = tags.get("run_epoch") or None
+        prefetch_ids = [
+            c.strip() for c in (tags.get("prefetch_case_ids") or "").split(",") if c.strip() and c.strip() != case_id
+        ]
 
         if not case_id:
             msg = "White(PPT): Missing <case_id>."
-            await event_queue.enqueue_event(new_agent_text_message(ensure_json_envelope(msg)))
-            return
+            return "bad_request", ensure_json_envelope(msg)
 
         print(f"White(PPT): handling case_id={case_id}")
         print(f"White(PPT): received case_id={case_id} benchmark_api_url={benchmark_api_url}")
-        _post_agentbeats_event(
+        post_agentbeats_event(
             battle_id=battle_id,
             message="White(PPT): Received case",
             reported_by="ppt_white_agent",
             detail={"case_id": case_id, "benchmark_api_url": benchmark_api_url},
         )
 
+        # Wall-clock milliseconds per phase, returned to the green agent in the reply.
+        timings: dict[str, float] = {}
+        t_start = time.perf_counter()
+
+        if prefetch_ids:
+            # Warm the next cases' datamodels while this one is being generated.
+            self._datamodels.prefetch(self._client(), benchmark_api_url, prefetch_ids, run_epoch)
+
         # 1) fetch test data (prompt + datamodel)
+        t0 = time.perf_counter()
         try:
-            print(f"White(PPT): fetching datamodel via GET /scenarios/datamodel/{case_id} ...")
-            with httpx.Client(timeout=60.0) as client:
-                r = client.get(f"{benchmark_api_url}/scenarios/datamodel/{case_id}")
-                r.raise_for_status()
-                payload = r.json()
-                prompt = payload.get("prompt", "")
-                datamodel = payload.get("datamodel", {})
+            if tags.get("case_payload"):
+                # Sent inline by the green agent; no round trip to the benchmark API.
+                payload = decode_payload(tags["case_payload"], tags.get("case_payload_encoding") or "zlib")
+                content_key = hashlib.sha256(tags["case_payload"].encode("utf-8")).hexdigest()
+                print(f"White(PPT): using inline datamodel for case_id={case_id}")
+            else:
+                print(f"White(PPT): fetching datamodel via GET /scenarios/datamodel/{case_id} ...")
+                payload = await self._datamodels.get(self._client(), benchmark_api_url, case_id, run_epoch)
+                content_key = self._datamodels.content_key(benchmark_api_url, case_id)
+            prompt = payload.get("prompt", "")
+            datamodel = payload.get("datamodel", {})
+            timings["fetch"] = (time.perf_counter() - t0) * 1000.0
+            FETCH_SECONDS.observe(timings["fetch"] / 1000.0, source="inline" if tags.get("case_payload") else "api")
             print(f"White(PPT): fetched prompt len={len(str(prompt))} datamodel_keys={list(datamodel.keys()) if isinstance(datamodel, dict) else type(datamodel)}")
         except Exception as ex:
             msg = f"White(PPT): Failed to fetch case data: {ex}"
-            _post_agentbeats_event(battle_id, msg, "ppt_white_agent")
-            await event_queue.enqueue_event(new_agent_text_message(ensure_json_envelope(msg)))
-            return
+            post_agentbeats_event(battle_id, msg, "ppt_white_agent")
+            return "fetch_error", ensure_json_envelope(msg)
 
-        # Extract first-slide shapes map to help constrain ids/types
-        shapes = []
-        if isinstance(datamodel, dict) and "slides" in datamodel and datamodel.get("slides"):
-            try:
-                shapes = datamodel["slides"][0].get("shapes", []) or []
-            except Exception:
-                shapes = []
-        elif isinstance(datamodel, dict) and "shapes" in datamodel:
-            shapes = datamodel.get("shapes") or []
-
-        id_to_type: dict[int, str] = {}
-        id_to_details: dict[int, dict] = {}
-        for s in shapes:
-            if not isinstance(s, dict):
-                continue
-            sid = s.get("id")
-            try:
-                sid_int = int(sid)
-            except Exception:
-                continue
-            st = s.get("shapeType")
-            if isinstance(st, str):
-                id_to_type[sid_int] = st
-            if isinstance(s.get("details"), dict):
-                id_to_details[sid_int] = s["details"]
+        # Index shapes on every slide to constrain ids/types
+        index = ShapeIndex.for_datamodel(datamodel, content_key)
+        print(f"White(PPT): indexed {len(index)} shapes on {len(index.slide_ids)} slide(s)")
 
         # 2) ask LLM to produce changeset JSON
         model = _ppt_model()
         print(f"White(PPT): generating changeset with model={model} ...")
+        encoding = prompt_encoding()
+        dm_header, dm_text = encode_datamodel(datamodel, encoding)
+        # Estimated datamodel tokens after encoding; raw JSON is only serialized for the
+        # comparison when a non-default encoder is selected (for "full" it is dm_text).
+        encoded_tokens = estimate_tokens(dm_text)
+        prompt_tokens = {"encoded": encoded_tokens}
+        if encoding == "full":
+            print(f"White(PPT): datamodel encoding=full est_tokens {encoded_tokens}")
+        else:
+            prompt_tokens["full"] = estimate_tokens(json.dumps(datamodel, ensure_ascii=False))
+            print(
+                f"White(PPT): datamodel encoding={encoding} "
+                f"est_tokens {prompt_tokens['full']} -> {encoded_tokens}"
+            )
         user_msg = (
             "CASE_ID: "
             + str(case_id)
             + "\n\nINSTRUCTION:\n"
             + str(prompt)
-            + "\n\nDATAMODEL (JSON):\n"
-            + json.dumps(datamodel, ensure_ascii=False)
+            + "\n\n"
+            + dm_header
+            + "\n"
+            + dm_text
         )
         messages = [
             {"role": "system", "content": _ppt_system_prompt()},
             {"role": "user", "content": user_msg},
         ]
 
-        try:
-            resp = completion(
-                messages=messages,
-                model=model,
-                custom_llm_provider=("litellm_proxy" if os.getenv("LITELLM_PROXY_API_KEY") else "openai"),
-                temperature=0.0,
-            )
-            content = resp.choices[0].message["content"]  # type: ignore
+        models = hedge_models(model)
+        hedged = len(models) > 1
+        streaming = os.getenv("PPT_LLM_STREAM", "false").strip().lower() in ("1", "true", "yes", "on")
+
+        def _parse(content: str) -> tuple[SanitizeResult, float]:
             changeset = json.loads(content)
             if not isinstance(changeset, dict):
                 raise ValueError("LLM did not return a JSON object")
-            print("White(PPT): LLM returned changeset JSON.")
+            t_sanitize = time.perf_counter()
+            sanitized = sanitize_changeset(changeset, index)
+            return sanitized, (time.perf_counter() - t_sanitize) * 1000.0
+
+        async def _generate(m: str) -> tuple[str, SanitizeResult, float]:
+            if streaming:
+                return await self._complete_streaming(messages, m, index)
+            content = await self._complete(messages, m)
+            return (content, *_parse(content))
+
+        def _accept(reply: tuple[str, SanitizeResult, float]) -> tuple[str, SanitizeResult, float]:
+            sanitized = reply[1]
+            if sanitized.drops and not any(sanitized.changeset.values()):
+                # Another model may still produce something usable.
+                raise ValueError(f"sanitizer dropped every entry {sanitized.reasons()}")
+            return reply
+
+        t0 = time.perf_counter()
+        hedge: dict[str, Any] = {}
+        # A reply cached for any model in the hedge set is reused; one lookup per case.
+        keys = {m: cache_key(m, messages, temperature=0.0) for m in models}
+        hit_key, content = await self._llm_cache.alookup(list(dict.fromkeys(keys.values())))
+        if content is not None:
+            model = next(m for m, k in keys.items() if k == hit_key)
+        llm_cache = "bypass" if not self._llm_cache.reads else ("hit" if content is not None else "miss")
+        try:
+            if content is not None:
+                sanitized, sanitize_ms = _parse(content)
+            elif hedged:
+                outcome = await first_valid(models, _generate, _accept, hedge_delay())
+                model = outcome.model
+                content, sanitized, sanitize_ms = outcome.value
+                hedge = {"winner": model, "launched": outcome.launched, "errors": outcome.errors[:5]}
+                print(f"White(PPT): hedged generation won by {model} ({outcome.launched} launched)")
+            else:
+                content, sanitized, sanitize_ms = await _generate(model)
+            if llm_cache != "hit":
+                # Only replies that parsed are cached, so a bad reply is retried next run.
+                await self._llm_cache.aput(keys[model], content, {"model": model, "case_id": case_id})
+            timings["llm"] = (time.perf_counter() - t0) * 1000.0 - sanitize_ms
+            timings["sanitize"] = sanitize_ms
+            print(f"White(PPT): LLM returned changeset JSON (cache {llm_cache}).")
         except Exception as ex:
-            msg = f"White(PPT): LLM failed ({model}): {ex}"
-            _post_agentbeats_event(battle_id, msg, "ppt_white_agent")
-            await event_queue.enqueue_event(new_agent_text_message(ensure_json_envelope(msg)))
-            return
-
-        changeset = _sanitize_changeset(changeset, id_to_type, id_to_details)
+            msg = f"White(PPT): LLM failed ({', '.join(models)}): {ex}"
+            post_agentbeats_event(battle_id, msg, "ppt_white_agent")
+            return "llm_error", ensure_json_envelope(msg)
+
+        changeset = sanitized.changeset
+        if sanitized.drops:
+            print(f"White(PPT): sanitizer dropped {len(sanitized.drops)} entries {sanitized.reasons()}")
+            for reason, n in sanitized.reasons().items():
+                SANITIZER_DROPS.inc(n, reason=reason)
+
+        # Catch schema violations here rather than after the server's inject/extract cycle.
+        validation = os.getenv("PPT_CHANGESET_VALIDATION", "repair").strip().lower()
+        problems: list[str] = []
+        if validation != "off":
+            t0 = time.perf_counter()
+            validated, problems = validate_changeset(changeset)
+            timings["validate"] = (time.perf_counter() - t0) * 1000.0
+            had_entries = any(changeset[k] for k in ("added", "modified", "deleted"))
+            kept_entries = any(validated[k] for k in ("added", "modified", "deleted"))
+            for problem in problems:
+                print(f"White(PPT): changeset {problem}")
+            if problems and (validation == "reject" or (had_entries and not kept_entries)):
+                msg = (
+                    f"White(PPT): Changeset rejected by local schema validation (case_id={case_id}): "
+                    + "; ".join(problems[:5])
+                )
+                post_agentbeats_event(battle_id, msg, "ppt_white_agent")
+                return "rejected", ensure_json_envelope(msg)
+            changeset = validated
         summary = _summarize_changeset(changeset)
         print(
             "White(PPT): case summary "
             f"(case_id={case_id}): "
             f"added={summary['added']} modified={summary['modified']} deleted={summary['deleted']} "
             f"approx_fields_changed={summary['approx_fields_changed']} "
-            f"modified_ids={summary['modified_ids']} deleted_ids={summary['deleted_ids']}"
+            f"modified_ids={summary['modified_ids']} deleted_ids={summary['deleted_ids']} "
+            f"llm_cache={llm_cache} (hits={self._llm_cache.hits} misses={self._llm_cache.misses})"
         )
 
         # 3) submit changeset
+        t0 = time.perf_counter()
         try:
             print(f"White(PPT): submitting changeset via POST /scenarios/submit-changeset (case_id={case_id}) ...")
             req_body = {
@@ -497,42 +566,102 @@ class PptWhiteAgentExecutor(AgentExecutor):
                 "whiteAgentId": white_agent_id,
                 "changeset": json.dumps(changeset),
             }
-            with httpx.Client(timeout=120.0) as client:
-                r = client.post(f"{benchmark_api_url}/scenarios/submit-changeset", json=req_body)
-                # Important: do NOT fall back to submitting an empty changeset.
-                # If the benchmark server rejects the changeset (or detects it didn't apply),
-                # we want that to surface as a hard failure so we don't accidentally record
-                # an "ok" run with no changes applied.
-                r.raise_for_status()
-                status = "submitted"
-                detail = {}
+            r = await self._client().post(
+                f"{benchmark_api_url}/scenarios/submit-changeset", json=req_body
+            )
+            # Important: do NOT fall back to submitting an empty changeset.
+            # If the benchmark server rejects the changeset (or detects it didn't apply),
+            # we want that to surface as a hard failure so we don't accidentally record
+            # an "ok" run with no changes applied.
+            r.raise_for_status()
+            status = "submitted"
+            detail = {}
+            timings["submit"] = (time.perf_counter() - t0) * 1000.0
+            SUBMIT_SECONDS.observe(timings["submit"] / 1000.0)
             print(f"White(PPT): submission status={status} case_id={case_id}")
         except Exception as ex:
+            SUBMIT_FAILURES.inc()
             msg = f"White(PPT): Failed to submit changeset (case_id={case_id}): {ex}"
-            _post_agentbeats_event(battle_id, msg, "ppt_white_agent")
-            await event_queue.enqueue_event(new_agent_text_message(ensure_json_envelope(msg)))
-            return
+            post_agentbeats_event(battle_id, msg, "ppt_white_agent")
+            return "submit_error", ensure_json_envelope(msg)
+
+        timings["white_total"] = (time.perf_counter() - t_start) * 1000.0
+        timings = {k: round(v, 1) for k, v in timings.items()}
 
-        _post_agentbeats_event(
+        post_agentbeats_event(
             battle_id=battle_id,
             message="White(PPT): Submitted case",
             reported_by="ppt_white_agent",
-            detail={"case_id": case_id, "status": status, **detail},
+            detail={
+                "case_id": case_id,
+                "status": status,
+                "timings": timings,
+                "prompt_encoding": encoding,
+                "datamodel_tokens_est": prompt_tokens,
+                "llm_cache": llm_cache,
+                "sanitize_drops": [str(d) for d in sanitized.drops[:20]],
+                "model": model,
+                **({"hedge": hedge} if hedge else {}),
+                "validation_problems": problems[:20],
+                **detail,
+            },
         )
 
         reply = {
             "name": RESPOND_ACTION_NAME,
-            "kwargs": {"content": f"ok: {case_id} ({status})"},
+            "kwargs": {"content": f"ok: {case_id} ({status})", "timings": timings},
         }
-        await event_queue.enqueue_event(
-            new_agent_text_message(f"<json>{json.dumps(reply)}</json>", context_id=context.context_id)
-        )
+        return status, f"<json>{json.dumps(reply)}</json>"
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
         # No long-running tasks to cancel in this simple executor.
         raise NotImplementedError()
 
 
+_litellm_acompletion = None
+_litellm_loading: asyncio.Future | None = None
+
+
+def _import_acompletion():
+    from litellm import acompletion
+
+    return acompletion
+
+
+def _preload_litellm() -> asyncio.Future:
+    """Start importing litellm in a worker thread; importing it takes seconds.
+
+    The import never runs on the event loop: a case that needs litellm while the thread
+    is still importing awaits the same future instead of blocking on the import lock.
+    """
+    global _litellm_loading
+    loop = asyncio.get_running_loop()
+    fut = _litellm_loading
+    if fut is None or (not fut.done() and fut.get_loop() is not loop):
+        fut = _litellm_loading = loop.run_in_executor(None, _import_acompletion)
+        fut.add_done_callback(_litellm_loaded)
+    return fut
+
+
+def _litellm_loaded(fut: asyncio.Future) -> None:
+    global _litellm_acompletion, _litellm_loading
+    if fut.cancelled():
+        _litellm_loading = None
+    elif fut.exception() is not None:
+        print(f"White(PPT): importing litellm failed: {fut.exception()}")
+        # The next LLM call tries again (and reports the error to its case).
+        _litellm_loading = None
+    else:
+        _litellm_acompletion = fut.result()
+
+
+async def _acompletion():
+    """``litellm.acompletion``, once the background import has finished."""
+    if _litellm_acompletion is None:
+        return await asyncio.shield(_preload_litellm())
+    return _litellm_acompletion
+
+
 def start_white_agent(
     agent_name: str = "ppt_white_agent", host: str = "localhost", port: int = 9002
 ) -> None:
@@ -542,12 +671,34 @@ def start_white_agent(
         os.getenv("AGENT_URL") or f"http://{host}:{port}/",
         agent_name=agent_name,
     )
+    agent_executor = PptWhiteAgentExecutor()
     request_handler = DefaultRequestHandler(
-        agent_executor=PptWhiteAgentExecutor(),
+        agent_executor=agent_executor,
         task_store=InMemoryTaskStore(),
     )
     app = A2AStarletteApplication(
         agent_card=card,
         http_handler=request_handler,
     )
-    uvicorn.run(app.build(), host=host, port=port)
+
+    lag_monitor = LoopLagMonitor()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_app):
+        lag_monitor.start()
+        startup.report_serving(agent_name)
+        if os.getenv("PPT_LLM_PRELOAD", "true").lower() != "false":
+            # Import litellm off the event loop once the agent is serving, so the first
+            # case does not pay for it and readiness does not wait for it.
+            _preload_litellm()
+        try:
+            yield
+        finally:
+            await lag_monitor.stop()
+            await agent_executor.aclose()
+            # Deliver any queued AgentBeats events before the process exits.
+            await reporter.aclose()
+
+    starlette_app = app.build(lifespan=lifespan)
+    mount_metrics(starlette_app)
+    uvicorn.run(starlette_app, host=host, port=port)
@@ -0,0 +1,143 @@
+"""In-memory cache of ``/scenarios/datamodel/:caseId`` payloads for the white agent.
+
+Scenario datamodels do not change while the benchmark server runs, so parsed payloads are
+kept per (benchmark API, case id). An entry is served without a request while it is
+younger than ``ttl`` and belongs to the current run epoch (the green agent's run id, sent
+as ``<run_epoch>``); otherwise it is revalidated with ``If-None-Match`` and a ``304`` keeps
+the cached payload. Concurrent requests for the same case share one fetch, which is what
+lets ``prefetch`` warm upcoming cases while the current one is in the LLM. The fetch runs
+in its own task, so a cancelled caller (a client disconnect, a cancelled prefetch) does
+not cancel it for the other cases waiting on it.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+
+@dataclass
+class _Entry:
+    payload: dict[str, Any]
+    etag: str | None
+    # SHA-256 of the response body; lets callers cache work derived from the payload.
+    digest: str
+    fetched_at: float
+    epoch: str | None
+
+
+class DatamodelCache:
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None) -> None:
+        self.ttl = ttl if ttl is not None else float(os.getenv("PPT_DATAMODEL_CACHE_TTL", "300"))
+        self.max_entries = max_entries or int(os.getenv("PPT_DATAMODEL_CACHE_SIZE", "256"))
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        # Keeps prefetch tasks referenced until they finish.
+        self._background: set[asyncio.Task] = set()
+        self.hits = 0
+        self.revalidated = 0
+        self.fetched = 0
+
+    def _fresh(self, entry: _Entry, epoch: str | None) -> bool:
+        if epoch is not None and entry.epoch != epoch:
+            return False
+        return time.monotonic() - entry.fetched_at < self.ttl
+
+    async def get(
+        self, client: httpx.AsyncClient, benchmark_api_url: str, case_id: str, epoch: str | None = None
+    ) -> dict[str, Any]:
+        """Return the datamodel payload (``prompt`` + ``datamodel``) for ``case_id``.
+
+        The payload is shared between callers; treat it as read-only.
+        """
+        key = (benchmark_api_url.rstrip("/"), case_id)
+        entry = self._entries.get(key)
+        if entry is not None and self._fresh(entry, epoch):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.payload
+        while True:
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(self._fetch(client, key, entry, epoch))
+                self._inflight[key] = task
+                task.add_done_callback(lambda t, key=key: self._fetch_done(key, t))
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if task.cancelled() and not (current is not None and current.cancelling()):
+                    # The shared fetch was cancelled (aclose), not this caller: fetch again.
+                    continue
+                raise
+
+    def content_key(self, benchmark_api_url: str, case_id: str) -> str | None:
+        """SHA-256 of the cached response body for ``case_id``, if it is cached."""
+        entry = self._entries.get((benchmark_api_url.rstrip("/"), case_id))
+        return entry.digest if entry is not None else None
+
+    def _fetch_done(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every waiter was cancelled.
+            task.exception()
+
+    async def _fetch(
+        self, client: httpx.AsyncClient, key: tuple[str, str], entry: _Entry | None, epoch: str | None
+    ) -> dict[str, Any]:
+        api_url, case_id = key
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        r = await client.get(f"{api_url}/scenarios/datamodel/{case_id}", headers=headers, timeout=60.0)
+        if r.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            entry.fetched_at = time.monotonic()
+            entry.epoch = epoch
+            self._entries.move_to_end(key)
+            return entry.payload
+        r.raise_for_status()
+        payload = r.json()
+        if not isinstance(payload, dict):
+            raise ValueError("datamodel response is not a JSON object")
+        self.fetched += 1
+        digest = hashlib.sha256(r.content).hexdigest()
+        self._entries[key] = _Entry(payload, r.headers.get("etag"), digest, time.monotonic(), epoch)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return payload
+
+    def prefetch(
+        self, client: httpx.AsyncClient, benchmark_api_url: str, case_ids: list[str], epoch: str | None = None
+    ) -> None:
+        """Start background fetches for ``case_ids``; failures are ignored (the case will refetch)."""
+
+        async def _one(case_id: str) -> None:
+            try:
+                await self.get(client, benchmark_api_url, case_id, epoch)
+            except Exception as ex:
+                print(f"White(PPT): prefetch of {case_id} failed: {ex}")
+
+        for case_id in case_ids:
+            task = asyncio.create_task(_one(case_id))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def aclose(self) -> None:
+        tasks = [*self._background, *self._inflight.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "fetched": self.fetched,
+        }
@@ -0,0 +1,94 @@
+"""Hedged LLM requests: first valid reply wins.
+
+With ``PPT_HEDGE_MODELS`` set (comma-separated LiteLLM model names; ``same`` repeats the
+primary ``PPT_MODEL``), the white agent sends the request to the primary model and, each
+time ``PPT_HEDGE_DELAY_MS`` passes without a valid reply, to the next backup. A failed or
+invalid reply launches the next backup straight away. The first reply that ``accept``
+takes (for the white agent: parses and survives sanitization) wins and the requests
+still in flight are cancelled.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+class HedgeError(Exception):
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("; ".join(errors) or "no model produced a valid reply")
+        self.errors = errors
+
+
+@dataclass
+class HedgeOutcome:
+    reply: Any
+    value: Any
+    model: str
+    launched: int
+    errors: list[str] = field(default_factory=list)
+
+
+def hedge_models(primary: str) -> list[str]:
+    """Models to try in order, primary first; a single entry means hedging is off."""
+    backups = [m.strip() for m in os.getenv("PPT_HEDGE_MODELS", "").split(",") if m.strip()]
+    return [primary] + [primary if m.lower() == "same" else m for m in backups]
+
+
+def hedge_delay() -> float:
+    """Seconds to wait for a valid reply before launching the next backup."""
+    try:
+        return max(0.0, float(os.getenv("PPT_HEDGE_DELAY_MS", "5000")) / 1000.0)
+    except ValueError:
+        return 5.0
+
+
+async def first_valid(
+    models: list[str],
+    call: Callable[[str], Awaitable[Any]],
+    accept: Callable[[Any], Any],
+    delay: float,
+) -> HedgeOutcome:
+    """Race ``call(model)`` over ``models`` with staggered starts; raise ``HedgeError`` if all fail.
+
+    ``accept`` turns what ``call`` returned into a value or raises to reject it.
+    """
+    loop = asyncio.get_running_loop()
+    waiting = list(models)
+    running: dict[asyncio.Task, str] = {}
+    errors: list[str] = []
+    launched = 0
+    next_launch = 0.0
+
+    def _launch() -> None:
+        nonlocal launched, next_launch
+        model = waiting.pop(0)
+        running[asyncio.create_task(call(model))] = model
+        launched += 1
+        next_launch = loop.time() + delay
+
+    _launch()
+    try:
+        while running:
+            timeout = max(0.0, next_launch - loop.time()) if waiting else None
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                _launch()
+                continue
+            for task in done:
+                model = running.pop(task)
+                try:
+                    reply = task.result()
+                    value = accept(reply)
+                except Exception as ex:
+                    errors.append(f"{model}: {ex}")
+                    continue
+                return HedgeOutcome(reply, value, model, launched, errors)
+            if waiting:
+                # Something failed; don't wait out the delay for its replacement.
+                _launch()
+        raise HedgeError(errors)
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
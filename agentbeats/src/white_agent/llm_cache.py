@@ -0,0 +1,178 @@
+"""Content-addressed on-disk cache for LLM replies.
+
+Entries are keyed by a SHA-256 of (model, temperature, messages) and stored as one JSON
+file each under ``PPT_LLM_CACHE_DIR`` (default ``.ppt_cache/llm``). The directory is kept
+under ``PPT_LLM_CACHE_MAX_MB`` (default ``256``) by evicting least recently used entries;
+a read refreshes the entry's mtime, so recency survives restarts.
+
+``PPT_LLM_CACHE`` selects the mode:
+- ``bypass`` (default): neither read nor write, so every case measures the model.
+- ``read-through``: serve hits, store misses. Replays earlier replies; opt in for
+  development or re-scoring runs only.
+- ``write-only``: always call the LLM, but store replies (e.g. to warm a cache).
+
+The agent uses ``alookup``/``aput``, which do the file I/O (and the one-off directory
+scan that builds the LRU index) in a worker thread; the index is guarded by a lock.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+MODES = ("read-through", "write-only", "bypass")
+
+
+def cache_key(model: str, messages: list[dict[str, str]], temperature: float = 0.0) -> str:
+    blob = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        directory: str | None = None,
+        mode: str | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.directory = directory or os.getenv("PPT_LLM_CACHE_DIR", os.path.join(".ppt_cache", "llm"))
+        mode = (mode or os.getenv("PPT_LLM_CACHE", "bypass")).strip().lower()
+        self.mode = mode if mode in MODES else "bypass"
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("PPT_LLM_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> size in bytes, least recently used first. Built lazily from the directory.
+        self._index: OrderedDict[str, int] | None = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reads(self) -> bool:
+        return self.mode == "read-through"
+
+    @property
+    def writes(self) -> bool:
+        return self.mode in ("read-through", "write-only")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        # Callers hold self._lock.
+        if self._index is not None:
+            return self._index
+        entries: list[tuple[float, str, int]] = []
+        if os.path.isdir(self.directory):
+            for root, _dirs, files in os.walk(self.directory):
+                for name in files:
+                    if not name.endswith(".json"):
+                        continue
+                    try:
+                        st = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, name[: -len(".json")], st.st_size))
+        entries.sort()
+        self._index = OrderedDict((key, size) for _mtime, key, size in entries)
+        self._total = sum(self._index.values())
+        return self._index
+
+    def _read(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                content = json.load(f)["content"]
+            now = time.time()
+            os.utime(path, (now, now))
+        except Exception:
+            with self._lock:
+                index = self._load_index()
+                if key in index:
+                    self._total -= index.pop(key)
+            return None
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index.move_to_end(key)
+        return content
+
+    def lookup(self, keys: list[str]) -> tuple[str | None, str | None]:
+        """First cached ``(key, reply)`` among ``keys``, or ``(None, None)``.
+
+        Counts one hit or miss per lookup (in read-through mode), however many keys it tried.
+        """
+        if not self.reads:
+            return None, None
+        for key in keys:
+            content = self._read(key)
+            if content is not None:
+                with self._lock:
+                    self.hits += 1
+                return key, content
+        with self._lock:
+            self.misses += 1
+        return None, None
+
+    def get(self, key: str) -> str | None:
+        """Return the cached reply text, or ``None``. Counts a hit or miss in read-through mode."""
+        return self.lookup([key])[1]
+
+    async def alookup(self, keys: list[str]) -> tuple[str | None, str | None]:
+        return await asyncio.to_thread(self.lookup, keys)
+
+    def put(self, key: str, content: str, meta: dict[str, Any] | None = None) -> None:
+        if not self.writes:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps({"content": content, "stored_at": time.time(), **(meta or {})}, ensure_ascii=False)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as ex:
+            print(f"White(PPT): could not write LLM cache entry: {ex}")
+            return
+        size = len(data.encode("utf-8"))
+        with self._lock:
+            index = self._load_index()
+            self._total += size - index.pop(key, 0)
+            index[key] = size
+            self._evict()
+
+    async def aput(self, key: str, content: str, meta: dict[str, Any] | None = None) -> None:
+        await asyncio.to_thread(self.put, key, content, meta)
+
+    def _evict(self) -> None:
+        # Callers hold self._lock.
+        index = self._load_index()
+        while self._total > self.max_bytes and len(index) > 1:
+            key, size = index.popitem(last=False)
+            self._total -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self._total,
+        }
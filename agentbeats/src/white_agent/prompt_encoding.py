@@ -0,0 +1,163 @@
+"""Datamodel encoders for the white agent's LLM prompt.
+
+``full`` is the raw datamodel JSON. ``compact`` keeps every slide's shapes (a single
+slide stays ``{"slideId", "shapes"}``, a deck becomes ``{"slides": [...]}``), drops fields
+the changeset cannot use or that are derivable (``bottomRight``/``center``, image sources, text margins, XML declarations),
+rounds coordinates and writes JSON without whitespace. ``tabular`` lists the same shapes
+as one pipe-separated row each under a ``slideId=`` line per slide, with non-geometric
+fields in a trailing JSON column.
+
+Select with ``PPT_PROMPT_ENCODING`` (``full`` | ``compact`` | ``tabular``, default ``full``,
+so benchmark runs see the datamodel as served unless they opt in).
+"""
+
+import json
+import os
+import re
+from typing import Any
+
+from src.white_agent.shape_index import datamodel_slides
+
+ENCODINGS = ("full", "compact", "tabular")
+
+# Auto-generated names ("Google Shape;1179;p16") carry no meaning for the model.
+_GENERATED_NAME = re.compile(r"^Google Shape;\d+;p\d+$")
+_XML_DECL = re.compile(r"^<\?xml[^>]*\?>\s*")
+# Only line-break indentation between tags is formatting; a run of spaces can be the
+# content of an element, e.g. the word separator in <span size="14.0"> </span>.
+_BETWEEN_TAGS = re.compile(r">[ \t]*[\r\n]\s*<")
+
+# Fields that are rebuilt from others or cannot be changed through a changeset.
+_DROP_KEYS = {"pos", "size", "source", "zIndex", "name", "id", "shapeType", "xml", "items", "shape"}
+
+
+def prompt_encoding() -> str:
+    enc = os.getenv("PPT_PROMPT_ENCODING", "full").strip().lower()
+    return enc if enc in ENCODINGS else "full"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough to compare encodings."""
+    return (len(text) + 3) // 4
+
+
+def _q(value: Any, precision: int) -> Any:
+    if isinstance(value, float):
+        r = round(value, precision)
+        return int(r) if r == int(r) else r
+    if isinstance(value, list):
+        return [_q(v, precision) for v in value]
+    if isinstance(value, dict):
+        return {k: _q(v, precision) for k, v in value.items()}
+    return value
+
+
+def _minify_xml(xml: str) -> str:
+    return _BETWEEN_TAGS.sub("><", _XML_DECL.sub("", xml)).strip()
+
+
+def _compact_text(value: Any) -> Any:
+    """Minify XML and drop text margins inside ``text``/``fontInfo`` fields."""
+    if not isinstance(value, dict):
+        return value
+    out = {}
+    for key, v in value.items():
+        if key == "xml" and isinstance(v, str):
+            out[key] = _minify_xml(v)
+        elif key == "fontInfo":
+            out[key] = _compact_text(v)
+        elif key != "margin":
+            out[key] = v
+    return out
+
+
+def _prune(value: Any) -> Any:
+    """Drop ``None``/empty containers recursively."""
+    if isinstance(value, dict):
+        out = {k: _prune(v) for k, v in value.items()}
+        return {k: v for k, v in out.items() if v not in (None, {}, [], "")}
+    if isinstance(value, list):
+        return [_prune(v) for v in value]
+    return value
+
+
+def compact_shape(shape: dict, precision: int = 1) -> dict:
+    out: dict[str, Any] = {"id": shape.get("id"), "type": shape.get("shapeType")}
+    name = shape.get("name")
+    if isinstance(name, str) and name and not _GENERATED_NAME.match(name):
+        out["name"] = name
+    pos = shape.get("pos")
+    if isinstance(pos, dict) and pos.get("topLeft") is not None:
+        out["xy"] = _q(pos["topLeft"], precision)
+    size = shape.get("size")
+    if isinstance(size, dict):
+        out["wh"] = [_q(size.get("w"), precision), _q(size.get("h"), precision)]
+    if shape.get("zIndex"):
+        out["z"] = shape["zIndex"]
+    if isinstance(shape.get("items"), list):
+        out["items"] = [int(i) if str(i).isdigit() else i for i in shape["items"]]
+    if isinstance(shape.get("xml"), str) and shape["xml"].strip():
+        out["xml"] = _minify_xml(shape["xml"])
+    for key, value in shape.items():
+        if key in _DROP_KEYS or key in out:
+            continue
+        if key == "rawText" and "xml" in out:
+            # The text is already inside the XML.
+            continue
+        if key in ("text", "fontInfo"):
+            value = _compact_text(value)
+        out[key] = _q(value, precision)
+    if isinstance(shape.get("shape"), dict):
+        out["shape"] = compact_shape(shape["shape"], precision)
+    return _prune(out)
+
+
+def encode_compact(datamodel: Any, precision: int = 1) -> str:
+    slides = [
+        {"slideId": slide_id, "shapes": [compact_shape(s, precision) for s in shapes if isinstance(s, dict)]}
+        for slide_id, shapes in datamodel_slides(datamodel)
+    ]
+    body: Any = slides[0] if len(slides) == 1 else {"slides": slides}
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_tabular(datamodel: Any, precision: int = 1) -> str:
+    lines = ["id|type|x|y|w|h|name|extra"]
+    for slide_id, shapes in datamodel_slides(datamodel):
+        lines.append(f"slideId={slide_id}")
+        for shape in shapes:
+            if not isinstance(shape, dict):
+                continue
+            c = compact_shape(shape, precision)
+            x, y = (c.pop("xy", None) or ["", ""])[:2]
+            w, h = (c.pop("wh", None) or ["", ""])[:2]
+            sid, stype, name = c.pop("id", ""), c.pop("type", ""), c.pop("name", "")
+            extra = json.dumps(c, ensure_ascii=False, separators=(",", ":")) if c else ""
+            lines.append(f"{sid}|{stype}|{x}|{y}|{w}|{h}|{str(name).replace('|', '/')}|{extra}")
+    return "\n".join(lines)
+
+
+_HEADERS = {
+    "full": "DATAMODEL (JSON):",
+    "compact": (
+        "DATAMODEL (compact JSON of the slide(s) to edit; xy = pos.topLeft, wh = size.w/size.h, "
+        "z = zIndex, type = shapeType; omitted fields are unchanged):"
+    ),
+    "tabular": (
+        "DATAMODEL (one shape per row; x,y = pos.topLeft, w,h = size.w/size.h; "
+        "extra holds other fields as JSON, z = zIndex):"
+    ),
+}
+
+
+def encode_datamodel(datamodel: Any, encoding: str | None = None) -> tuple[str, str]:
+    """Return ``(header, text)`` for the user message."""
+    encoding = encoding or prompt_encoding()
+    if encoding == "compact":
+        text = encode_compact(datamodel)
+    elif encoding == "tabular":
+        text = encode_tabular(datamodel)
+    else:
+        encoding = "full"
+        text = json.dumps(datamodel, ensure_ascii=False)
+    return _HEADERS[encoding], text
@@ -0,0 +1,212 @@
+"""Changeset sanitizer for LLM output, run before local validation and submission.
+
+Keeps only entries the benchmark schema can accept against this datamodel:
+
+- ``added``: image/textbox shapes with ``pos`` and ``size``; a ``_id`` is generated when missing.
+- ``modified``: ids present in the ``ShapeIndex`` whose true type is a modifiable union.
+  The type comes from the datamodel, lines lose ``pos``/``size``/``details``, autoShapes
+  get their original ``details`` and placeholders get their textbox fields nested
+  under ``shape``.
+- ``deleted``: known ids, reduced to ``{"id": ...}``.
+
+``width``/``height`` size keys become ``w``/``h``. The caller's changeset is never
+modified: kept entries are copies. Every dropped entry is reported as a ``Drop`` with a
+machine-readable reason.
+"""
+
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from src.white_agent.shape_index import ShapeIndex
+
+# Drop reasons.
+NOT_A_LIST = "not_a_list"
+NOT_AN_OBJECT = "not_an_object"
+MISSING_ID = "missing_id"
+BAD_ID = "bad_id"
+UNKNOWN_ID = "unknown_id"
+UNSUPPORTED_TYPE = "unsupported_type"
+MISSING_GEOMETRY = "missing_geometry"
+
+SECTIONS = ("added", "modified", "deleted")
+
+# Lower-cased spellings the LLM uses -> schema discriminator.
+SHAPE_TYPE_ALIASES: dict[str, str] = {
+    "textbox": "textbox",
+    "text box": "textbox",
+    "text_box": "textbox",
+    "text-box": "textbox",
+    "text": "textbox",
+    "autoshape": "autoShape",
+    "auto_shape": "autoShape",
+    "auto-shape": "autoShape",
+    "image": "image",
+    "picture": "image",
+    "img": "image",
+    "chart": "chart",
+    "line": "line",
+    "connector": "line",
+    "placeholder": "placeholder",
+    "group": "group",
+    "icon": "icon",
+}
+
+_ADDED_TYPES = frozenset({"image", "textbox"})
+_MODIFIED_TYPES = frozenset({"placeholder", "textbox", "image", "chart", "autoShape", "line"})
+_LINE_FORBIDDEN = ("pos", "size", "details")
+# Textbox-like patch fields a placeholder update carries under "shape".
+_PLACEHOLDER_FIELDS = ("name", "inheritStylesFrom", "pos", "size", "style", "xml", "fontInfo")
+
+
+@dataclass(slots=True)
+class Drop:
+    section: str
+    position: int | None
+    reason: str
+    shape_id: Any = None
+
+    def __str__(self) -> str:
+        where = self.section if self.position is None else f"{self.section}[{self.position}]"
+        if self.shape_id is not None:
+            where += f" id={self.shape_id}"
+        return f"{where}: {self.reason}"
+
+
+@dataclass
+class SanitizeResult:
+    changeset: dict[str, list[dict]]
+    drops: list[Drop] = field(default_factory=list)
+
+    def reasons(self) -> dict[str, int]:
+        return dict(Counter(d.reason for d in self.drops))
+
+
+def normalize_shape_type(value: Any) -> str | None:
+    if not isinstance(value, str):
+        return None
+    return SHAPE_TYPE_ALIASES.get(value.strip().lower())
+
+
+def _as_int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _with_wh(entry: dict) -> None:
+    """Replace a ``width``/``height`` size on the (copied) entry with a ``w``/``h`` one."""
+    size = entry.get("size")
+    if not isinstance(size, dict) or ("width" not in size and "height" not in size):
+        return
+    fixed = {k: v for k, v in size.items() if k not in ("width", "height")}
+    if "width" in size and "w" not in size:
+        fixed["w"] = size["width"]
+    if "height" in size and "h" not in size:
+        fixed["h"] = size["height"]
+    entry["size"] = fixed
+
+
+def _clean_added(entry: dict, index: ShapeIndex) -> dict | str:
+    shape_type = normalize_shape_type(entry.get("shapeType"))
+    # Keep added extremely conservative: only allow image/textbox additions for now.
+    if shape_type not in _ADDED_TYPES:
+        return UNSUPPORTED_TYPE
+    if not isinstance(entry.get("pos"), dict) or not isinstance(entry.get("size"), dict):
+        return MISSING_GEOMETRY
+    out = dict(entry)
+    out["shapeType"] = shape_type
+    if "_id" not in out:
+        out["_id"] = f"NEW-{uuid.uuid4().hex}"
+    _with_wh(out)
+    return out
+
+
+def _clean_modified(entry: dict, index: ShapeIndex) -> dict | str:
+    if "id" not in entry:
+        return MISSING_ID
+    shape_id = _as_int(entry["id"])
+    if shape_id is None:
+        return BAD_ID
+    ref = index.resolve(shape_id, entry.get("slideId"))
+    if ref is None:
+        return UNKNOWN_ID
+    # Prefer the true type from the datamodel over what the LLM wrote.
+    shape_type = (
+        normalize_shape_type(ref.shape_type) or ref.shape_type or normalize_shape_type(entry.get("shapeType"))
+    )
+    if shape_type not in _MODIFIED_TYPES:
+        # group/icon updates are not in the schema's modified union.
+        return UNSUPPORTED_TYPE
+
+    if shape_type == "placeholder":
+        nested = dict(entry["shape"]) if isinstance(entry.get("shape"), dict) else {}
+        nested["id"] = _as_int(nested.get("id")) or shape_id
+        nested["shapeType"] = "textbox"
+        for k in _PLACEHOLDER_FIELDS:
+            if k in entry:
+                nested[k] = entry[k]
+        _with_wh(nested)
+        out: dict[str, Any] = {"id": shape_id, "shapeType": "placeholder", "shape": nested}
+        if isinstance(entry.get("zIndex"), int):
+            out["zIndex"] = entry["zIndex"]
+        return out
+
+    out = dict(entry)
+    out["id"] = shape_id
+    out["shapeType"] = shape_type
+    if shape_type == "line":
+        for k in _LINE_FORBIDDEN:
+            out.pop(k, None)
+    else:
+        _with_wh(out)
+        # Carrying the original details avoids autoShape union mismatches.
+        if shape_type == "autoShape" and "details" not in out and ref.details is not None:
+            out["details"] = dict(ref.details)
+    return out
+
+
+def _clean_deleted(entry: dict, index: ShapeIndex) -> dict | str:
+    if "id" not in entry:
+        return MISSING_ID
+    shape_id = _as_int(entry["id"])
+    if shape_id is None:
+        return BAD_ID
+    if index.resolve(shape_id, entry.get("slideId")) is None:
+        return UNKNOWN_ID
+    return {"id": shape_id}
+
+
+_CLEANERS: dict[str, Callable[[dict, ShapeIndex], dict | str]] = {
+    "added": _clean_added,
+    "modified": _clean_modified,
+    "deleted": _clean_deleted,
+}
+
+
+def clean_entry(section: str, entry: Any, index: ShapeIndex) -> dict | str:
+    """Sanitized copy of one ``section`` entry, or the reason it is dropped."""
+    if not isinstance(entry, dict):
+        return NOT_AN_OBJECT
+    return _CLEANERS[section](entry, index)
+
+
+def sanitize_changeset(changeset: dict, index: ShapeIndex) -> SanitizeResult:
+    result = SanitizeResult({})
+    drops = result.drops
+    for section in SECTIONS:
+        entries = changeset.get(section) or []
+        kept: list[dict] = []
+        result.changeset[section] = kept
+        if not isinstance(entries, list):
+            drops.append(Drop(section, None, NOT_A_LIST))
+            continue
+        for position, entry in enumerate(entries):
+            out = clean_entry(section, entry, index)
+            if isinstance(out, str):
+                drops.append(Drop(section, position, out, entry.get("id") if isinstance(entry, dict) else None))
+            else:
+                kept.append(out)
+    return result
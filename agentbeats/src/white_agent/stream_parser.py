@@ -0,0 +1,180 @@
+"""Incremental parser for a changeset streamed from the LLM.
+
+``ChangesetStreamParser.feed`` scans each chunk as it arrives. It tracks JSON nesting
+only as far as needed to find the ``added``/``modified``/``deleted`` arrays and cut out
+each entry object as soon as its closing brace arrives. Completed entries are sanitized
+right away (``clean_entry``), so by the end of the stream the changeset is already
+sanitized. ``StreamAbort`` is raised as soon as the reply is clearly unusable:
+
+- ``not_json``: the first non-blank character is not ``{`` (prose, markdown fences).
+- ``bad_section``: a section value is not an array.
+- ``unknown_ids``: ``max_unknown_ids`` entries referenced ids missing from the
+  datamodel before any entry was kept.
+- ``invalid_json``: an entry, or the whole reply once finished, does not parse.
+- ``trailing_data`` / ``truncated``: text after the top-level object, or the stream
+  ended inside it.
+"""
+
+import json
+import time
+from typing import Any
+
+from src.white_agent.sanitizer import (
+    NOT_AN_OBJECT,
+    SECTIONS,
+    UNKNOWN_ID,
+    Drop,
+    SanitizeResult,
+    clean_entry,
+)
+from src.white_agent.shape_index import ShapeIndex
+
+
+class StreamAbort(Exception):
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class ChangesetStreamParser:
+    def __init__(self, index: ShapeIndex, max_unknown_ids: int = 3) -> None:
+        self.index = index
+        self.max_unknown_ids = max_unknown_ids
+        self.kept: dict[str, list[dict]] = {s: [] for s in SECTIONS}
+        self.drops: list[Drop] = []
+        self.sanitize_ms = 0.0
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._closed = False
+        # Top-level object: key being read, last key, waiting for a value after ':'.
+        self._want_key = False
+        self._key_start: int | None = None
+        self._key: Any = None
+        self._expect_value = False
+        # Section array being scanned and the entry object being collected in it.
+        self._section: str | None = None
+        self._position = 0
+        self._element_open = False
+        self._entry_start: int | None = None
+        self._unknown = 0
+
+    @property
+    def text(self) -> str:
+        return self._buf
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._buf += chunk
+        buf = self._buf
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(buf[self._key_start : i + 1])
+                        self._key_start = None
+                continue
+            if ch in " \t\r\n":
+                continue
+            if self._closed:
+                raise StreamAbort("trailing_data", "text after the changeset object")
+            if not self._started:
+                if ch != "{":
+                    raise StreamAbort("not_json", f"reply starts with {buf[i:i + 20]!r}, not a JSON object")
+                self._started, self._depth, self._want_key = True, 1, True
+                continue
+
+            if self._depth == 1:
+                if self._expect_value:
+                    self._expect_value = False
+                    if self._key in SECTIONS:
+                        if ch != "[":
+                            raise StreamAbort("bad_section", f"{self._key!r} is not a list")
+                        self._open_section(self._key)
+                        continue
+                elif ch == '"' and self._want_key:
+                    self._want_key = False
+                    self._key_start = i
+                    self._in_string = True
+                    continue
+                elif ch == ":":
+                    self._expect_value = True
+                    continue
+                elif ch == ",":
+                    self._want_key = True
+                    continue
+            elif self._depth == 2 and self._section is not None:
+                if ch == ",":
+                    self._element_open = False
+                    continue
+                if ch != "]" and not self._element_open:
+                    self._element_open = True
+                    if ch == "{":
+                        self._entry_start = i
+                    else:
+                        self.drops.append(Drop(self._section, self._position, NOT_AN_OBJECT))
+                        self._position += 1
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._closed = True
+                elif self._depth == 1:
+                    self._section = None
+                elif self._depth == 2 and self._entry_start is not None:
+                    self._entry_done(buf[self._entry_start : i + 1])
+                    self._entry_start = None
+        self._pos = len(buf)
+
+    def _open_section(self, section: str) -> None:
+        # A repeated key replaces the earlier array, as json.loads would.
+        self.kept[section] = []
+        self.drops = [d for d in self.drops if d.section != section]
+        self._section = section
+        self._position = 0
+        self._element_open = False
+        self._depth = 2
+
+    def _entry_done(self, text: str) -> None:
+        section = self._section
+        assert section is not None
+        try:
+            entry = json.loads(text)
+        except ValueError as ex:
+            raise StreamAbort("invalid_json", f"{section}[{self._position}] does not parse: {ex}") from None
+        t0 = time.perf_counter()
+        out = clean_entry(section, entry, self.index)
+        self.sanitize_ms += (time.perf_counter() - t0) * 1000.0
+        if isinstance(out, str):
+            self.drops.append(Drop(section, self._position, out, entry.get("id")))
+            if out == UNKNOWN_ID:
+                self._unknown += 1
+                if self._unknown >= self.max_unknown_ids and not any(self.kept.values()):
+                    raise StreamAbort("unknown_ids", f"{self._unknown} entries reference ids not in the datamodel")
+        else:
+            self.kept[section].append(out)
+        self._position += 1
+
+    def finish(self) -> SanitizeResult:
+        """Check the complete reply and return the entries sanitized while streaming."""
+        if not self._closed:
+            raise StreamAbort("truncated", "stream ended inside the changeset object")
+        try:
+            json.loads(self._buf)
+        except ValueError as ex:
+            raise StreamAbort("invalid_json", f"reply does not parse: {ex}") from None
+        return SanitizeResult(self.kept, self.drops)